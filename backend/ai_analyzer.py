@@ -1,12 +1,144 @@
 # 파일명: backend/ai_analyzer.py
-from .langchain_chain import log_analysis_chain
-from .db_manager import db_manager
-from typing import Dict, Optional
+import asyncio
+import time
+from datetime import datetime
+from .langchain_chain import get_log_analysis_chain, CONFIG_ERROR_MESSAGE
+from .db_manager import get_db_manager
+from .analysis_cache import get_analysis_cache
+from .similarity import get_similarity_index
+from .llm_metrics import get_llm_metrics
+from .lazy import LazySingleton
+from .fingerprint import message_fingerprint, normalize_message
+from .incident import build_incidents, format_incident_summary
+from .config import LLM_MAX_CONCURRENCY, SIMILARITY_MIN, INCIDENT_PROMPT_TOKEN_BUDGET, INCIDENT_MIN_COOCCURRENCE, INCIDENT_MAX_LOGS, APP_PACKAGE_PREFIXES
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
 
 class AIAnalyzer:
     def __init__(self):
-        self.chain = log_analysis_chain
-        self.db = db_manager
+        self.db = get_db_manager()
+        self.cache = get_analysis_cache()
+        self.similarity = get_similarity_index()
+        self.metrics = get_llm_metrics()
+        
+        # 기존 캐시 항목을 유사도 인덱스에 한 번 색인
+        if self.similarity.count() == 0:
+            self.similarity.add_many(
+                entry for entry in self.cache.entries() if not entry[0].startswith('incident:')
+            )
+    
+    @property
+    def chain(self):
+        """LLM 체인 (LangChain 로드와 클라이언트 생성은 첫 분석 요청 시)"""
+        return get_log_analysis_chain()
+    
+    def get_fingerprint(self, log_data: dict) -> str:
+        """로그 데이터의 에러 지문 (DB에 저장된 값 우선)"""
+        return log_data.get('fingerprint') or message_fingerprint(
+            log_data.get('level', 'UNKNOWN'), log_data.get('message', '')
+        )
+    
+    def _record_call(self, kind: str, fingerprint: Optional[str], stats: dict):
+        """분석 호출 계측 기록 (계측 실패가 분석을 방해하지 않도록 예외 무시)"""
+        if stats.get('error') == 'ConfigError':
+            return
+        try:
+            self.metrics.record(kind, stats, fingerprint)
+        except Exception as e:
+            print(f"LLM 계측 기록 오류: {e}")
+    
+    def _get_cached(self, kind: str, fingerprint: str) -> Optional[str]:
+        """캐시 조회 (적중 시 계측 기록)"""
+        start_time = time.perf_counter()
+        cached = self.cache.get(fingerprint)
+        if cached is not None:
+            self._record_call(kind, fingerprint, {
+                'cache_hit': True, 'total_ms': (time.perf_counter() - start_time) * 1000
+            })
+        return cached
+    
+    def _analyze_with_cache(self, log_data: dict) -> str:
+        """지문 캐시 확인 후 필요한 경우에만 LLM 호출"""
+        fingerprint = self.get_fingerprint(log_data)
+        
+        cached = self._get_cached('analyze', fingerprint)
+        if cached is not None:
+            return cached
+        
+        if not self.chain.is_available():
+            return CONFIG_ERROR_MESSAGE
+        
+        stats = {}
+        try:
+            analysis_result = self.chain.run_analysis(log_data, stats)
+        except Exception as e:
+            # 오류 안내 메시지는 캐시하지 않음
+            stats['error'] = type(e).__name__
+            return self.chain.format_error(e)
+        finally:
+            self._record_call('analyze', fingerprint, stats)
+        
+        self._store_analysis(fingerprint, analysis_result, log_data)
+        return analysis_result
+    
+    def precompute_analysis(self, log_data: dict) -> Optional[str]:
+        """캐시에 없는 경우 분석해서 캐시에 저장 (백그라운드 사전 분석용)
+        
+        반환: 실패한 경우 오류 클래스명, 성공/이미 캐시된 경우 None
+        """
+        fingerprint = self.get_fingerprint(log_data)
+        if self.cache.contains(fingerprint):
+            return None
+        
+        # 설정이 없으면 LLM 호출 없이 실패 (호출 기록/예산에 남기지 않음)
+        if not self.chain.is_available():
+            return 'ConfigError'
+        
+        stats = {}
+        try:
+            analysis_result = self.chain.run_analysis(log_data, stats)
+        except Exception as e:
+            stats['error'] = type(e).__name__
+            return stats['error']
+        finally:
+            self._record_call('prefetch', fingerprint, stats)
+        
+        self._store_analysis(fingerprint, analysis_result, log_data)
+        return None
+    
+    def _store_analysis(self, fingerprint: str, analysis: str, log_data: dict):
+        """분석 결과를 캐시에 저장하고 유사도 인덱스에 색인"""
+        level = log_data.get('level')
+        normalized = normalize_message(log_data.get('message', ''))
+        self.cache.put(fingerprint, analysis, level=level, normalized_message=normalized)
+        self.similarity.add(fingerprint, level, normalized)
+    
+    def find_similar_analyses(self, log_data: dict, k: int = 3,
+                              min_similarity: float = SIMILARITY_MIN) -> List[Dict]:
+        """과거에 분석된 유사 에러와 저장된 분석 결과 (LLM 호출 없음)
+        
+        반환: [{'fingerprint', 'level', 'normalized_message', 'similarity', 'analysis'}]
+        """
+        fingerprint = self.get_fingerprint(log_data)
+        candidates = self.similarity.query(
+            log_data.get('level'), normalize_message(log_data.get('message', '')),
+            k=k * 3, min_similarity=min_similarity, exclude=fingerprint
+        )
+        analyses = self.cache.get_many([candidate['fingerprint'] for candidate in candidates])
+        
+        results = []
+        for candidate in candidates:
+            if candidate['fingerprint'] in analyses:
+                results.append({**candidate, 'analysis': analyses[candidate['fingerprint']]})
+                if len(results) == k:
+                    break
+        return results
+    
+    def get_reuse_candidates(self, log_id: int, k: int = 3) -> List[Dict]:
+        """동일 지문 캐시가 없는 로그의 재사용 가능한 유사 분석 후보 (캐시가 있으면 빈 목록)"""
+        log_data = self.db.get_log_by_id(log_id)
+        if not log_data or self.cache.contains(self.get_fingerprint(log_data)):
+            return []
+        return self.find_similar_analyses(log_data, k)
     
     def analyze_error_log(self, log_id: int) -> Optional[str]:
         """에러 로그 AI 분석"""
@@ -16,14 +148,14 @@ class AIAnalyzer:
             if not log_data:
                 return "해당 로그를 찾을 수 없습니다."
             
-            # LangChain을 통한 분석
-            analysis_result = self.chain.analyze_log(log_data)
+            # 캐시 확인 후 LangChain을 통한 분석
+            analysis_result = self._analyze_with_cache(log_data)
             return analysis_result
-            
+        
         except Exception as e:
             return f"분석 중 오류가 발생했습니다: {str(e)}"
     
-    def analyze_log_message(self, log_message: str, log_level: str = "ERROR", 
+    def analyze_log_message(self, log_message: str, log_level: str = "ERROR",
                            response_time: int = 0) -> str:
         """로그 메시지 직접 분석"""
         try:
@@ -34,11 +166,211 @@ class AIAnalyzer:
                 'timestamp': 'N/A'
             }
             
-            analysis_result = self.chain.analyze_log(log_data)
+            analysis_result = self._analyze_with_cache(log_data)
             return analysis_result
-            
+        
         except Exception as e:
             return f"분석 중 오류가 발생했습니다: {str(e)}"
+    
+    def _stream_with_cache(self, log_data: dict, stats: Optional[dict] = None) -> Iterator[str]:
+        """지문 캐시 확인 후 스트리밍 분석 (완료된 결과는 캐시에 저장)"""
+        stats = stats if stats is not None else {}
+        fingerprint = self.get_fingerprint(log_data)
+        
+        start_time = time.perf_counter()
+        cached = self.cache.get(fingerprint)
+        if cached is not None:
+            stats['cache_hit'] = True
+            stats['ttft_ms'] = stats['total_ms'] = (time.perf_counter() - start_time) * 1000
+            yield cached
+            self._record_call('stream', fingerprint, stats)
+            return
+        
+        stats['cache_hit'] = False
+        chunks = []
+        try:
+            for chunk in self.chain.stream_analyze_log(log_data, stats):
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            self._record_call('stream', fingerprint, stats)
+        
+        # 오류 없이 끝난 경우에만 캐시
+        if 'error' not in stats and chunks:
+            self._store_analysis(fingerprint, ''.join(chunks), log_data)
+    
+    def stream_error_log(self, log_id: int, stats: Optional[dict] = None) -> Iterator[str]:
+        """에러 로그 AI 분석 스트리밍 (토큰 단위 generator)
+        
+        stats dict를 전달하면 첫 토큰 시간(ttft_ms), 전체 시간(total_ms),
+        캐시 적중 여부(cache_hit)가 기록됩니다.
+        """
+        try:
+            log_data = self.db.get_log_by_id(log_id)
+        except Exception as e:
+            yield f"분석 중 오류가 발생했습니다: {str(e)}"
+            return
+        
+        if not log_data:
+            yield "해당 로그를 찾을 수 없습니다."
+            return
+        
+        yield from self._stream_with_cache(log_data, stats)
+    
+    def stream_log_message(self, log_message: str, log_level: str = "ERROR",
+                           response_time: int = 0, stats: Optional[dict] = None) -> Iterator[str]:
+        """로그 메시지 직접 분석 스트리밍"""
+        log_data = {
+            'level': log_level,
+            'message': log_message,
+            'response_time': response_time,
+            'timestamp': 'N/A'
+        }
+        yield from self._stream_with_cache(log_data, stats)
+    
+    async def analyze_logs_batch_async(self, logs: List[Dict], max_concurrency: int = LLM_MAX_CONCURRENCY,
+                                       on_result: Optional[Callable[[Dict], None]] = None) -> Dict[str, Dict]:
+        """여러 로그를 에러 지문 단위로 동시 분석 (지문당 LLM 1회)
+        
+        동시 실행 수는 max_concurrency로, 요청 속도는 체인의 토큰 버킷으로 제한되며
+        429/5xx는 지수 백오프로 재시도됩니다. 결과는 완료되는 즉시 캐시에 저장되고
+        on_result 콜백으로 전달됩니다.
+        
+        반환: {지문: {'fingerprint', 'log_id', 'analysis', 'cached', 'error', 'retries'}}
+        """
+        # 지문별 대표 로그 1개만 분석
+        representatives = {}
+        for log_data in logs:
+            representatives.setdefault(self.get_fingerprint(log_data), log_data)
+        
+        results = {}
+        pending = []
+        for fingerprint, log_data in representatives.items():
+            cached = self._get_cached('batch', fingerprint)
+            if cached is not None:
+                results[fingerprint] = {
+                    'fingerprint': fingerprint, 'log_id': log_data.get('id'),
+                    'analysis': cached, 'cached': True, 'error': None, 'retries': 0
+                }
+                if on_result:
+                    on_result(results[fingerprint])
+            else:
+                pending.append((fingerprint, log_data))
+        
+        if pending and not self.chain.is_available():
+            for fingerprint, log_data in pending:
+                results[fingerprint] = {
+                    'fingerprint': fingerprint, 'log_id': log_data.get('id'),
+                    'analysis': CONFIG_ERROR_MESSAGE, 'cached': False,
+                    'error': 'ConfigError', 'retries': 0
+                }
+            return results
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze_one(fingerprint: str, log_data: Dict) -> Dict:
+            stats = {}
+            async with semaphore:
+                try:
+                    analysis = await self.chain.arun_analysis(log_data, stats)
+                    error = None
+                except Exception as e:
+                    analysis = self.chain.format_error(e)
+                    error = stats['error'] = type(e).__name__
+            
+            self._record_call('batch', fingerprint, stats)
+            if error is None:
+                self._store_analysis(fingerprint, analysis, log_data)
+            return {
+                'fingerprint': fingerprint, 'log_id': log_data.get('id'),
+                'analysis': analysis, 'cached': False,
+                'error': error, 'retries': stats.get('retries', 0)
+            }
+        
+        tasks = [asyncio.create_task(analyze_one(fp, log_data)) for fp, log_data in pending]
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            results[result['fingerprint']] = result
+            if on_result:
+                on_result(result)
+        
+        return results
+    
+    def analyze_batch(self, log_ids: Sequence[int], max_concurrency: int = LLM_MAX_CONCURRENCY,
+                      on_result: Optional[Callable[[Dict], None]] = None) -> Dict[str, Dict]:
+        """로그 ID 목록 일괄 분석 (동일 지문은 한 번만 분석)"""
+        logs = self.db.get_logs_by_ids(list(log_ids))
+        return asyncio.run(self.analyze_logs_batch_async(logs, max_concurrency, on_result))
+    
+    def analyze_signatures(self, fingerprints: Sequence[str], max_concurrency: int = LLM_MAX_CONCURRENCY,
+                           on_result: Optional[Callable[[Dict], None]] = None) -> Dict[str, Dict]:
+        """에러 지문 목록 일괄 분석 (지문별 최근 로그를 대표로 사용)"""
+        logs = self.db.get_latest_logs_by_fingerprints(list(fingerprints))
+        return asyncio.run(self.analyze_logs_batch_async(logs, max_concurrency, on_result))
+    
+    def analyze_top_signatures(self, start: datetime, end: datetime = None, limit: int = 50,
+                               max_concurrency: int = LLM_MAX_CONCURRENCY,
+                               on_result: Optional[Callable[[Dict], None]] = None) -> Dict[str, Dict]:
+        """기간 내 발생 건수 상위 에러 지문 일괄 분석"""
+        signatures = self.db.get_top_signatures(start, end, limit)
+        return self.analyze_signatures([row['fingerprint'] for row in signatures], max_concurrency, on_result)
+    
+    def find_incidents(self, start: datetime, end: datetime = None) -> List[Dict]:
+        """기간 내 에러를 지문 + 동시 발생 기준으로 묶은 인시던트 목록 (심각도/건수 순)
+        
+        구간 내 로그가 INCIDENT_MAX_LOGS건을 넘으면 최신 로그만 사용하고, 각 인시던트에
+        truncated=True와 실제 집계 시작 시각 sampled_since를 표시합니다 (건수는 그 이후 기준).
+        """
+        logs = self.db.get_logs_in_window(start, end, INCIDENT_MAX_LOGS + 1)
+        truncated = len(logs) > INCIDENT_MAX_LOGS
+        if truncated:
+            logs = logs[1:]
+        incidents = build_incidents(logs, min_cooccurrence=INCIDENT_MIN_COOCCURRENCE)
+        for incident in incidents:
+            incident['truncated'] = truncated
+            incident['sampled_since'] = logs[0]['timestamp'] if truncated else None
+        return incidents
+    
+    def analyze_incident(self, incident: Dict) -> Dict:
+        """인시던트 단위 AI 분석 (연관 에러 묶음당 LLM 1회, 시그니처 구성이 같으면 캐시 재사용)
+        
+        반환: {'analysis', 'cached', 'error'}
+        """
+        cache_key = f"incident:{incident['incident_id']}"
+        cached = self._get_cached('incident', cache_key)
+        if cached is not None:
+            return {'analysis': cached, 'cached': True, 'error': None}
+        
+        if not self.chain.is_available():
+            return {'analysis': CONFIG_ERROR_MESSAGE, 'cached': False, 'error': 'ConfigError'}
+        
+        summary = format_incident_summary(incident, INCIDENT_PROMPT_TOKEN_BUDGET, APP_PACKAGE_PREFIXES)
+        stats = {}
+        try:
+            analysis = self.chain.run_incident_analysis(summary, stats)
+        except Exception as e:
+            stats['error'] = type(e).__name__
+            return {'analysis': self.chain.format_error(e), 'cached': False, 'error': stats['error']}
+        finally:
+            self._record_call('incident', cache_key, stats)
+        
+        self.cache.put(cache_key, analysis, level=incident['level'],
+                       normalized_message=f"incident of {len(incident['signatures'])} signatures")
+        return {'analysis': analysis, 'cached': False, 'error': None}
+    
+    def get_llm_summary(self, window_seconds: int = 3600) -> Dict:
+        """최근 구간 AI 분석 호출 요약 (지연 p50/p95, 시간당 토큰, 캐시 적중률)"""
+        return self.metrics.summary(window_seconds)
+    
+    def get_cache_stats(self) -> Dict:
+        """분석 캐시 적중률 통계"""
+        return self.cache.stats()
+
+# 전역 인스턴스 (첫 사용 시 생성, LLM 체인은 별도 지연 생성)
+get_ai_analyzer = LazySingleton(AIAnalyzer)
 
-# 전역 인스턴스
-ai_analyzer = AIAnalyzer()
\ No newline at end of file
+def __getattr__(name):
+    # 기존 `from .ai_analyzer import ai_analyzer` 호환 (첫 접근 시 생성)
+    if name == 'ai_analyzer':
+        return get_ai_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
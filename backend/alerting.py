@@ -0,0 +1,443 @@
+# 파일명: backend/alerting.py
+"""수집 시점 스트리밍 알림 엔진
+
+DatabaseSink가 새로 저장한 이벤트를 규칙별 슬라이딩 윈도우에 누적하고(규칙/그룹당 고정 크기
+상태), 배치 저장 직후와 batch_interval마다 규칙을 평가합니다.
+
+규칙 종류
+- rate: 윈도우 내 이벤트 수가 threshold 초과 (level/fingerprint 필터, group_by='signature'면 지문별)
+- percentile: 윈도우 내 응답시간 분위수가 threshold(ms) 초과 (min_count건 이상일 때만)
+- new_signature: 처음 보는 에러 지문 (블룸 필터, 기존 DB 지문으로 초기화)
+
+같은 (규칙, 그룹) 알림은 발생(firing) 시 한 번, 계속되면 repeat_interval마다, 조건이 풀리면
+해제(resolved)로 한 번 보내며, 전송은 sink(stdout/file/webhook)별로 모아서 일괄 처리합니다.
+"""
+import json
+import threading
+import time
+import urllib.request
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from .config import (
+    ALERT_BATCH_INTERVAL, ALERT_BATCH_SIZE, ALERT_FILE, ALERT_REPEAT_INTERVAL, ALERT_RULES_FILE,
+    ALERT_SINKS, ALERT_WEBHOOK_URL,
+)
+from .event_log import EventLogger
+from .fingerprint import message_fingerprint
+from .lazy import LazySingleton
+from .metrics import ALERTS_DROPPED, ALERTS_SENT, ALERT_SINK_ERRORS
+from .rate_limit import backoff_delay
+from .sketches import BloomFilter, LogBucketHistogram
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+logger = EventLogger('alerting')
+
+# 규칙 파일(ALERT_RULES_FILE)이 없을 때 사용하는 기본 규칙
+DEFAULT_RULES = [
+    {'name': 'fatal_spike', 'type': 'rate', 'level': 'FATAL', 'window': 60, 'threshold': 5,
+     'severity': 'critical'},
+    {'name': 'error_burst', 'type': 'rate', 'window': 300, 'threshold': 300, 'severity': 'warning'},
+    {'name': 'signature_burst', 'type': 'rate', 'group_by': 'signature', 'window': 300, 'threshold': 100,
+     'severity': 'warning'},
+    {'name': 'slow_response_p95', 'type': 'percentile', 'quantile': 0.95, 'window': 300, 'threshold': 5000,
+     'min_count': 20, 'severity': 'warning'},
+    {'name': 'new_signature', 'type': 'new_signature', 'severity': 'info'},
+]
+
+# 슬라이딩 윈도우 슬롯 수 (윈도우 / 슬롯 = 만료 단위)
+WINDOW_SLOTS = 12
+
+# 전송 대기 알림 최대 개수 (넘으면 오래된 것부터 버림)
+MAX_OUTBOX = 10000
+
+
+class SlidingCounter:
+    """슬롯 링 버퍼 슬라이딩 윈도우 개수 (메모리 O(slots), 만료 단위는 window / slots)"""
+
+    def __init__(self, window: float, slots: int = WINDOW_SLOTS):
+        self.slot_seconds = window / slots
+        self.counts = [0] * slots
+        self.slot_ids = [-1] * slots
+
+    def add(self, now: float, count: int = 1):
+        slot_id = int(now // self.slot_seconds)
+        index = slot_id % len(self.counts)
+        if self.slot_ids[index] != slot_id:
+            self.slot_ids[index], self.counts[index] = slot_id, 0
+        self.counts[index] += count
+
+    def value(self, now: float) -> int:
+        oldest = int(now // self.slot_seconds) - len(self.counts) + 1
+        return sum(count for slot_id, count in zip(self.slot_ids, self.counts) if slot_id >= oldest)
+
+
+class SlidingHistogram:
+    """슬롯별 로그 구간 히스토그램 (평가 시 윈도우 안 슬롯만 병합해 분위수 계산)"""
+
+    def __init__(self, window: float, slots: int = WINDOW_SLOTS, relative_accuracy: float = 0.02):
+        self.slot_seconds = window / slots
+        self.relative_accuracy = relative_accuracy
+        self.histograms = [LogBucketHistogram(relative_accuracy) for _ in range(slots)]
+        self.slot_ids = [-1] * slots
+
+    def add(self, now: float, value: float):
+        slot_id = int(now // self.slot_seconds)
+        index = slot_id % len(self.histograms)
+        if self.slot_ids[index] != slot_id:
+            self.slot_ids[index] = slot_id
+            self.histograms[index] = LogBucketHistogram(self.relative_accuracy)
+        self.histograms[index].add(value)
+
+    def quantile(self, now: float, q: float) -> Tuple[float, int]:
+        """(분위수, 표본 수)"""
+        oldest = int(now // self.slot_seconds) - len(self.histograms) + 1
+        merged = LogBucketHistogram(self.relative_accuracy)
+        for slot_id, histogram in zip(self.slot_ids, self.histograms):
+            if slot_id >= oldest:
+                merged.merge(histogram)
+        total = merged.total
+        return (merged.quantiles([q])[q] if total else 0.0), total
+
+
+class RateRule:
+    """윈도우 내 이벤트 수 임계값 규칙"""
+
+    def __init__(self, name: str, window: float, threshold: float, level: str = None, fingerprint: str = None,
+                 group_by: str = None, severity: str = 'warning', max_groups: int = 1000, **_):
+        if group_by not in (None, 'level', 'signature'):
+            raise ValueError(f"{name}: group_by는 level 또는 signature만 지원합니다")
+        self.name, self.window, self.threshold = name, window, threshold
+        self.level, self.fingerprint, self.group_by = level, fingerprint, group_by
+        self.severity, self.max_groups = severity, max_groups
+        # 그룹 키 -> [카운터, 최근 메시지] (지문별 그룹은 최근 사용 순으로 max_groups개만 유지)
+        self.groups: 'OrderedDict[str, list]' = OrderedDict()
+
+    def _key(self, event: Dict) -> str:
+        if self.group_by == 'signature':
+            return event['fingerprint']
+        if self.group_by == 'level':
+            return event['level']
+        return '*'
+
+    def observe(self, now: float, event: Dict):
+        if self.level and event['level'] != self.level:
+            return
+        if self.fingerprint and event['fingerprint'] != self.fingerprint:
+            return
+        key = self._key(event)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = [SlidingCounter(self.window), None]
+            if len(self.groups) > self.max_groups:
+                self.groups.popitem(last=False)
+        else:
+            self.groups.move_to_end(key)
+        group[0].add(now)
+        group[1] = event['message']
+
+    def evaluate(self, now: float) -> List[Tuple[str, float, Optional[str]]]:
+        firing = []
+        for key, (counter, sample) in list(self.groups.items()):
+            value = counter.value(now)
+            if value == 0 and self.group_by:
+                del self.groups[key]
+            elif value > self.threshold:
+                firing.append((key, value, sample))
+        return firing
+
+    def describe(self, key: str, value: float) -> str:
+        target = self.level or ('지문 ' + key[:12] if self.group_by == 'signature' else key if self.group_by else '전체')
+        return f"{target} {self.window:.0f}초 동안 {value:.0f}건 (기준 {self.threshold:g}건 초과)"
+
+
+class PercentileRule:
+    """윈도우 내 응답시간 분위수 임계값 규칙"""
+
+    def __init__(self, name: str, window: float, threshold: float, quantile: float = 0.95, level: str = None,
+                 min_count: int = 10, severity: str = 'warning', **_):
+        self.name, self.window, self.threshold = name, window, threshold
+        self.quantile, self.level, self.min_count, self.severity = quantile, level, min_count, severity
+        self.group_by = None
+        self.histogram = SlidingHistogram(window)
+
+    def observe(self, now: float, event: Dict):
+        if self.level and event['level'] != self.level:
+            return
+        if event.get('response_time'):
+            self.histogram.add(now, event['response_time'])
+
+    def evaluate(self, now: float) -> List[Tuple[str, float, Optional[str]]]:
+        value, count = self.histogram.quantile(now, self.quantile)
+        if count >= self.min_count and value > self.threshold:
+            return [(self.level or '*', value, None)]
+        return []
+
+    def describe(self, key: str, value: float) -> str:
+        return (f"{self.level or '전체'} 응답시간 p{self.quantile * 100:g} {value:.0f}ms "
+                f"({self.window:.0f}초, 기준 {self.threshold:g}ms 초과)")
+
+
+class NewSignatureRule:
+    """처음 보는 에러 지문 규칙 (블룸 필터, 지문당 한 번)"""
+
+    def __init__(self, name: str, level: str = None, capacity: int = 100_000, error_rate: float = 0.001,
+                 severity: str = 'info', **_):
+        self.name, self.level, self.severity = name, level, severity
+        self.group_by = 'signature'
+        self.seen = BloomFilter(capacity, error_rate)
+
+    def seed(self, fingerprints: Iterable[str]):
+        for fingerprint in fingerprints:
+            self.seen.add(fingerprint)
+
+    def observe(self, now: float, event: Dict) -> bool:
+        if self.level and event['level'] != self.level:
+            return False
+        return self.seen.add(event['fingerprint'])
+
+    def describe(self, key: str, value: float) -> str:
+        return f"새로운 에러 지문 {key[:12]}"
+
+
+RULE_TYPES = {'rate': RateRule, 'percentile': PercentileRule, 'new_signature': NewSignatureRule}
+
+
+def build_rules(specs: List[Dict]) -> List:
+    """규칙 정의(dict 목록)로 규칙 객체 생성 (알 수 없는 type이면 ValueError)"""
+    rules = []
+    for spec in specs:
+        rule_type = RULE_TYPES.get(spec.get('type'))
+        if rule_type is None:
+            raise ValueError(f"알 수 없는 알림 규칙 종류: {spec.get('type')} ({spec.get('name')})")
+        rules.append(rule_type(**spec))
+    return rules
+
+
+def load_rules(path: str = None) -> List:
+    """규칙 파일(JSON 배열) 로드, 경로가 없으면 기본 규칙"""
+    path = path if path is not None else ALERT_RULES_FILE
+    if not path:
+        return build_rules(DEFAULT_RULES)
+    with open(path, 'r', encoding='utf-8') as f:
+        return build_rules(json.load(f))
+
+
+class StdoutSink:
+    """구조화 로그(stdout)로 알림 출력"""
+
+    name = 'stdout'
+
+    def send(self, alerts: List[Dict]):
+        for alert in alerts:
+            logger.log('alert', 'warning' if alert['status'] == 'firing' else 'info', limit=False,
+                       rule=alert['rule'], status=alert['status'], severity=alert['severity'],
+                       key=alert['key'], value=alert['value'], message=alert['message'])
+
+
+class FileSink:
+    """JSON 줄 파일에 알림 추가"""
+
+    name = 'file'
+
+    def __init__(self, path: str = None):
+        self.path = path or ALERT_FILE
+
+    def send(self, alerts: List[Dict]):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, ensure_ascii=False) + '\n')
+
+
+class WebhookSink:
+    """로컬 webhook으로 알림 묶음 POST ({"alerts": [...]}, 실패 시 지수 백오프 재시도)"""
+
+    name = 'webhook'
+
+    def __init__(self, url: str = None, timeout: float = 5, max_retries: int = 2):
+        self.url = url or ALERT_WEBHOOK_URL
+        if not self.url:
+            raise ValueError("webhook 알림에는 ALERT_WEBHOOK_URL이 필요합니다")
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+    def send(self, alerts: List[Dict]):
+        body = json.dumps({'alerts': alerts}, ensure_ascii=False).encode('utf-8')
+        for attempt in range(self.max_retries + 1):
+            request = urllib.request.Request(self.url, data=body, method='POST',
+                                             headers={'Content-Type': 'application/json'})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+                return
+            except OSError as e:
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(backoff_delay(attempt, 0.5, 5.0, e))
+
+
+SINK_TYPES = {'stdout': StdoutSink, 'file': FileSink, 'webhook': WebhookSink}
+
+
+def build_sinks(spec: str = None) -> List:
+    """'stdout,file,webhook' 형식으로 sink 생성"""
+    names = [name.strip() for name in (spec if spec is not None else ALERT_SINKS).split(',') if name.strip()]
+    unknown = [name for name in names if name not in SINK_TYPES]
+    if unknown:
+        raise ValueError(f"알 수 없는 알림 전송 대상: {', '.join(unknown)}")
+    return [SINK_TYPES[name]() for name in names]
+
+
+class AlertEngine:
+    """규칙 평가 + 중복 제거 + 일괄 전송
+
+    observe()는 수집 스레드에서 배치마다 호출되며 규칙 상태만 갱신하고, 전송은 별도 스레드가
+    batch_interval마다(또는 대기 알림이 batch_size개가 되면) 처리합니다. start() 전에는 아무것도 하지 않습니다.
+    """
+
+    def __init__(self, rules: List = None, sinks: List = None, batch_interval: float = ALERT_BATCH_INTERVAL,
+                 batch_size: int = ALERT_BATCH_SIZE, repeat_interval: float = ALERT_REPEAT_INTERVAL):
+        self.rules = rules
+        self.sinks = sinks
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.repeat_interval = repeat_interval
+        self.running = False
+        self.dispatch_thread = None
+        # (규칙, 그룹 키) -> {'since', 'last_sent'} (발생 중인 알림)
+        self.firing: Dict[Tuple[str, str], Dict] = {}
+        self.outbox = deque()
+        self.stats_counts = {'firing': 0, 'resolved': 0, 'sent': 0, 'dropped': 0, 'errors': 0}
+        self._condition = threading.Condition()
+
+    def start(self, known_fingerprints: Iterable[str] = ()):
+        """규칙/전송 대상 준비 후 전송 스레드 시작 (known_fingerprints는 이미 본 지문)"""
+        if self.running:
+            return
+        if self.rules is None:
+            self.rules = load_rules()
+        if self.sinks is None:
+            self.sinks = build_sinks()
+        for rule in self.rules:
+            if isinstance(rule, NewSignatureRule):
+                rule.seed(known_fingerprints)
+        self.running = True
+        self.dispatch_thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self.dispatch_thread.start()
+        logger.log('alerting_started', limit=False, rules=len(self.rules),
+                   sinks=','.join(sink.name for sink in self.sinks))
+
+    def stop(self):
+        """전송 스레드 중지 (남은 알림 전송)"""
+        with self._condition:
+            if not self.running:
+                return
+            self.running = False
+            self._condition.notify_all()
+        if self.dispatch_thread:
+            self.dispatch_thread.join(timeout=10)
+        self.flush()
+
+    def observe(self, events: List[Dict], now: float = None):
+        """새로 저장된 이벤트 반영 후 규칙 평가 (events: level, message, response_time)"""
+        if not self.running or not events:
+            return
+        now = now or time.time()
+        with self._condition:
+            for event in events:
+                event = {**event, 'fingerprint': event.get('fingerprint')
+                         or message_fingerprint(event['level'], event['message'])}
+                for rule in self.rules:
+                    if rule.observe(now, event) and isinstance(rule, NewSignatureRule):
+                        self._emit(rule, event['fingerprint'], 'firing', 1, event['message'], now)
+            self._evaluate(now)
+
+    def evaluate(self, now: float = None):
+        """모든 규칙 평가 (이벤트가 없어도 윈도우가 지나면 해제 알림)"""
+        with self._condition:
+            self._evaluate(now or time.time())
+
+    def _evaluate(self, now: float):
+        for rule in self.rules:
+            if isinstance(rule, NewSignatureRule):
+                continue
+            active = set()
+            for key, value, sample in rule.evaluate(now):
+                active.add(key)
+                state = self.firing.get((rule.name, key))
+                if state is None:
+                    self.firing[(rule.name, key)] = {'since': now, 'last_sent': now}
+                    self._emit(rule, key, 'firing', value, sample, now)
+                elif now - state['last_sent'] >= self.repeat_interval:
+                    state['last_sent'] = now
+                    self._emit(rule, key, 'firing', value, sample, now)
+            for rule_name, key in [firing_key for firing_key in self.firing if firing_key[0] == rule.name]:
+                if key not in active:
+                    self.firing.pop((rule_name, key))
+                    self._emit(rule, key, 'resolved', 0, None, now)
+
+    def _emit(self, rule, key: str, status: str, value: float, sample: Optional[str], now: float):
+        alert = {
+            'rule': rule.name,
+            'status': status,
+            'severity': rule.severity,
+            'key': key,
+            'value': round(float(value), 1),
+            'message': rule.describe(key, value) if status == 'firing' else f"{rule.name} 해제 ({key[:12]})",
+            'sample': sample.split('\n', 1)[0][:200] if sample else None,
+            'at': datetime.fromtimestamp(now, KST).strftime('%Y-%m-%d %H:%M:%S'),
+            'epoch': now,
+        }
+        self.stats_counts[status] += 1
+        if len(self.outbox) >= MAX_OUTBOX:
+            self.outbox.popleft()
+            self.stats_counts['dropped'] += 1
+            ALERTS_DROPPED.inc()
+        self.outbox.append(alert)
+        if len(self.outbox) >= self.batch_size:
+            self._condition.notify_all()
+
+    def flush(self):
+        """대기 중인 알림을 batch_size개씩 모든 sink로 전송"""
+        while True:
+            with self._condition:
+                batch = [self.outbox.popleft() for _ in range(min(self.batch_size, len(self.outbox)))]
+            if not batch:
+                return
+            for sink in self.sinks:
+                try:
+                    sink.send(batch)
+                    ALERTS_SENT.inc(len(batch), sink=sink.name)
+                except Exception as e:
+                    self.stats_counts['errors'] += 1
+                    ALERT_SINK_ERRORS.inc(sink=sink.name)
+                    logger.error('alert_sink_error', sink=sink.name, alerts=len(batch),
+                                 error=f"{type(e).__name__}: {e}")
+            self.stats_counts['sent'] += len(batch)
+
+    def _dispatch_loop(self):
+        while True:
+            with self._condition:
+                if self.running and len(self.outbox) < self.batch_size:
+                    self._condition.wait(self.batch_interval)
+                if not self.running:
+                    return
+            self.evaluate()
+            self.flush()
+
+    def stats(self) -> Dict:
+        """알림 상태 (발생 중 목록, 누적 개수)"""
+        with self._condition:
+            return {
+                'running': self.running,
+                'rules': len(self.rules or []),
+                **self.stats_counts,
+                'active': [{'rule': rule_name, 'key': key} for rule_name, key in self.firing],
+                'queued': len(self.outbox),
+            }
+
+
+# 전역 인스턴스 (첫 사용 시 생성)
+get_alert_engine = LazySingleton(AlertEngine)
@@ -0,0 +1,159 @@
+# 파일명: backend/analysis_cache.py
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from .config import DB_PATH, ANALYSIS_CACHE_TTL, ANALYSIS_CACHE_MAX_ENTRIES
+from .lazy import LazySingleton
+
+class AnalysisCache:
+    """에러 지문 기반 AI 분석 결과 캐시 (SQLite, TTL + 최대 개수 제한)"""
+
+    def __init__(self, db_path: str = None, ttl_seconds: int = ANALYSIS_CACHE_TTL,
+                 max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES):
+        self.db_path = db_path or DB_PATH
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.init_database()
+
+    def init_database(self):
+        """캐시 테이블 생성"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    fingerprint TEXT PRIMARY KEY,
+                    level TEXT,
+                    normalized_message TEXT,
+                    analysis TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_accessed
+                ON analysis_cache (last_accessed)
+            ''')
+            conn.commit()
+
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        """캐시된 분석 결과 조회 (만료된 항목은 삭제 후 None)"""
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT analysis, created_at FROM analysis_cache WHERE fingerprint = ?
+            ''', (fingerprint,))
+            row = cursor.fetchone()
+
+            if row is None:
+                self._record(False)
+                return None
+
+            analysis, created_at = row
+            if now - created_at > self.ttl_seconds:
+                cursor.execute('DELETE FROM analysis_cache WHERE fingerprint = ?', (fingerprint,))
+                conn.commit()
+                self._record(False)
+                return None
+
+            cursor.execute('''
+                UPDATE analysis_cache
+                SET last_accessed = ?, hit_count = hit_count + 1
+                WHERE fingerprint = ?
+            ''', (now, fingerprint))
+            conn.commit()
+
+        self._record(True)
+        return analysis
+
+    def contains(self, fingerprint: str) -> bool:
+        """유효한 캐시 항목 존재 여부 (적중률 통계에 반영하지 않음)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT 1 FROM analysis_cache WHERE fingerprint = ? AND created_at >= ?
+            ''', (fingerprint, time.time() - self.ttl_seconds))
+            return cursor.fetchone() is not None
+
+    def get_many(self, fingerprints: Sequence[str]) -> Dict[str, str]:
+        """여러 지문의 유효한 분석 결과 조회 (적중률 통계에 반영하지 않음)"""
+        if not fingerprints:
+            return {}
+        placeholders = ','.join('?' * len(fingerprints))
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT fingerprint, analysis FROM analysis_cache
+                WHERE fingerprint IN ({placeholders}) AND created_at >= ?
+            ''', list(fingerprints) + [time.time() - self.ttl_seconds])
+            return dict(cursor.fetchall())
+
+    def entries(self) -> List[Tuple[str, str, str]]:
+        """저장된 항목의 (지문, 레벨, 정규화 메시지) 목록"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT fingerprint, level, normalized_message FROM analysis_cache')
+            return cursor.fetchall()
+
+    def put(self, fingerprint: str, analysis: str, level: str = None,
+            normalized_message: str = None):
+        """분석 결과 저장 후 최대 개수 초과분을 오래 사용되지 않은 순으로 제거"""
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO analysis_cache
+                    (fingerprint, level, normalized_message, analysis, created_at, last_accessed, hit_count)
+                VALUES (?, ?, ?, ?, ?, ?, 0)
+            ''', (fingerprint, level, normalized_message, analysis, now, now))
+
+            # 만료 항목 및 초과 항목 정리
+            cursor.execute('DELETE FROM analysis_cache WHERE created_at < ?', (now - self.ttl_seconds,))
+            cursor.execute('''
+                DELETE FROM analysis_cache
+                WHERE fingerprint IN (
+                    SELECT fingerprint FROM analysis_cache
+                    ORDER BY last_accessed DESC
+                    LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+            conn.commit()
+
+    def stats(self) -> Dict:
+        """캐시 적중률 통계 (현재 프로세스 기준) 및 저장 항목 수"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*), COALESCE(SUM(hit_count), 0) FROM analysis_cache')
+            entries, stored_hits = cursor.fetchone()
+
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / total if total else 0.0,
+            'entries': entries,
+            'stored_hits': stored_hits,
+        }
+
+# 전역 인스턴스 (첫 사용 시 테이블 생성)
+get_analysis_cache = LazySingleton(AnalysisCache)
+
+def __getattr__(name):
+    # 기존 `from .analysis_cache import analysis_cache` 호환 (첫 접근 시 생성)
+    if name == 'analysis_cache':
+        return get_analysis_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
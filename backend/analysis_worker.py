@@ -0,0 +1,187 @@
+# 파일명: backend/analysis_worker.py
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+from .ai_analyzer import get_ai_analyzer
+from .fingerprint import message_fingerprint
+from .config import ANALYSIS_WORKER_HOURLY_BUDGET, ANALYSIS_WORKER_MAX_TRACKED, ANALYSIS_WORKER_QUEUE_SIZE
+from .lazy import LazySingleton
+
+# 레벨별 우선순위 (낮을수록 먼저 분석)
+LEVEL_PRIORITY = {
+    'FATAL': 0,
+    'OutOfMemoryError': 0,
+    'ERROR': 1,
+    'SQLException': 1,
+    'TimeoutException': 2,
+    'Exception': 2,
+}
+DEFAULT_LEVEL_PRIORITY = 3
+
+class AnalysisWorker:
+    """백그라운드 사전 분석 워커
+
+    수집 파이프라인에서 신규 에러 지문이나 FATAL 로그가 관측되면 우선순위 큐에 넣고,
+    레벨(FATAL 우선)과 발생 빈도 순으로 분석해 캐시에 저장합니다.
+    시간당 LLM 호출 수는 hourly_budget으로 제한되고, 지문별 빈도는 최근 관측된
+    max_tracked개만 기억합니다 (밀려난 지문이 다시 오면 분석 캐시로 중복 분석을 막음).
+    """
+
+    def __init__(self, hourly_budget: int = ANALYSIS_WORKER_HOURLY_BUDGET,
+                 max_queue_size: int = ANALYSIS_WORKER_QUEUE_SIZE,
+                 max_tracked: int = ANALYSIS_WORKER_MAX_TRACKED):
+        self.analyzer = get_ai_analyzer()
+        self.hourly_budget = hourly_budget
+        self.max_queue_size = max_queue_size
+        self.max_tracked = max_tracked
+        self.running = False
+        self.worker_thread = None
+
+        # 힙 항목: [레벨 우선순위, -발생 빈도, 순번, 지문, 로그 ID] (무효화된 항목은 지문이 None)
+        self._heap = []
+        self._entries: Dict[str, list] = {}
+        self._counter = itertools.count()
+        self._counts: 'OrderedDict[str, int]' = OrderedDict()
+        self._call_times = deque()
+        self._condition = threading.Condition()
+
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def start(self):
+        """워커 스레드 시작 (LLM 설정이 없으면 시작하지 않음)"""
+        if not self.analyzer.chain.is_available():
+            print("LLM 설정이 없어 백그라운드 분석 워커를 시작하지 않습니다")
+            return
+        if not self.running:
+            self.running = True
+            self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
+            self.worker_thread.start()
+            print(f"백그라운드 분석 워커 시작 (시간당 {self.hourly_budget}회)")
+
+    def stop(self):
+        """워커 스레드 중지"""
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        if self.worker_thread:
+            self.worker_thread.join(timeout=1)
+        print("백그라운드 분석 워커 중지")
+
+    def observe(self, log_id: int, level: str, message: str, fingerprint: str = None):
+        """수집된 에러 로그 관측 (신규 지문 또는 FATAL이면 분석 대기열에 추가, 지문을 주면 재계산하지 않음)"""
+        if not self.running:
+            return
+        fingerprint = fingerprint or message_fingerprint(level, message)
+        level_priority = LEVEL_PRIORITY.get(level, DEFAULT_LEVEL_PRIORITY)
+
+        with self._condition:
+            count = self._counts.pop(fingerprint, 0) + 1
+            self._counts[fingerprint] = count
+            if len(self._counts) > self.max_tracked:
+                # 가장 오래 관측되지 않은 지문부터 제거 (대기 중인 지문은 빈도를 유지)
+                for stale in list(itertools.islice(self._counts, len(self._counts) - self.max_tracked)):
+                    if stale not in self._entries:
+                        del self._counts[stale]
+
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                # 대기 중인 지문은 빈도/레벨을 반영해 우선순위 갱신 (기존 항목은 무효화)
+                level_priority = min(level_priority, entry[0])
+                entry[3] = None
+            elif count > 1 and level_priority > 0:
+                return
+            elif len(self._entries) >= self.max_queue_size:
+                self.dropped += 1
+                return
+
+        # 캐시 조회는 잠금 밖에서 (이미 분석된 지문은 건너뜀)
+        if entry is None and self.analyzer.cache.contains(fingerprint):
+            return
+
+        with self._condition:
+            if fingerprint in self._entries and self._entries[fingerprint] is not entry:
+                return
+            new_entry = [level_priority, -self._counts.get(fingerprint, count), next(self._counter), fingerprint, log_id]
+            self._entries[fingerprint] = new_entry
+            heapq.heappush(self._heap, new_entry)
+            self._condition.notify()
+
+    def _pop(self) -> Optional[list]:
+        """유효한 최우선 항목 꺼내기 (잠금 보유 상태에서 호출)"""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if entry[3] is not None:
+                del self._entries[entry[3]]
+                return entry
+        return None
+
+    def _budget_wait(self) -> float:
+        """시간당 예산 소진 시 다음 호출까지 대기 시간(초)"""
+        now = time.monotonic()
+        while self._call_times and now - self._call_times[0] >= 3600:
+            self._call_times.popleft()
+        if len(self._call_times) < self.hourly_budget:
+            return 0.0
+        return 3600 - (now - self._call_times[0])
+
+    def _worker_loop(self):
+        """우선순위 순서로 분석 실행"""
+        while True:
+            with self._condition:
+                while self.running and (not self._entries or self._budget_wait() > 0):
+                    timeout = self._budget_wait() if self._entries else None
+                    self._condition.wait(timeout)
+                if not self.running:
+                    return
+                entry = self._pop()
+                if entry is None:
+                    continue
+                self._call_times.append(time.monotonic())
+
+            _, _, _, fingerprint, log_id = entry
+
+            try:
+                log_data = self.analyzer.db.get_log_by_id(log_id)
+                error = self.analyzer.precompute_analysis(log_data) if log_data else 'NotFound'
+            except Exception as e:
+                error = type(e).__name__
+
+            with self._condition:
+                if error is None:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            print(f"🔎 사전 분석 {'완료' if error is None else f'실패({error})'}: {fingerprint}")
+
+    def queue_depth(self) -> int:
+        """분석 대기 중인 지문 수"""
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """워커 상태 (대기 수, 완료/실패/버림 수, 최근 1시간 사용량)"""
+        with self._condition:
+            self._budget_wait()
+            return {
+                'running': self.running,
+                'queued': len(self._entries),
+                'completed': self.completed,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'tracked': len(self._counts),
+                'budget_used': len(self._call_times),
+                'budget': self.hourly_budget,
+            }
+
+# 전역 인스턴스 (첫 사용 시 생성)
+get_analysis_worker = LazySingleton(AnalysisWorker)
+
+def __getattr__(name):
+    # 기존 `from .analysis_worker import analysis_worker` 호환 (첫 접근 시 생성)
+    if name == 'analysis_worker':
+        return get_analysis_worker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,186 @@
+# 파일명: backend/anomaly.py
+"""지문별 1분 집계 기반 이상 탐지 (NumPy 벡터화)
+
+최근 history_minutes분의 signature_rollups_1m을 [지문, 분] 행렬로 만들어 모든 지문을 한 번에
+계산합니다. 시간 축만 순회하고 지문 축은 벡터 연산이므로 지문 수천 개도 한 번의 갱신 주기 안에 끝납니다.
+
+- EWMA 기준선: 직전까지의 지수 가중 평균/분산으로 현재 값을 점수화 (분모에 포아송 잡음 포함)
+- 계절 기준선: season_days일 전 같은 분(±smoothing분 평균), 일/주 단위 트래픽 패턴 반영
+- 판정: 개수 >= min_count 이고 두 기준선 모두에서 z >= z_threshold
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .config import (
+    ANOMALY_EWMA_ALPHA, ANOMALY_HISTORY_MINUTES, ANOMALY_INTERVAL, ANOMALY_MIN_COUNT, ANOMALY_REPORT_MINUTES,
+    ANOMALY_SEASON_DAYS, ANOMALY_Z_THRESHOLD,
+)
+from .db_manager import get_db_manager, to_wall_epoch
+from .event_log import EventLogger
+from .lazy import LazySingleton
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+logger = EventLogger('anomaly')
+
+
+def build_matrix(columns: Dict[str, np.ndarray], start_ts: int, minutes: int,
+                 fingerprints: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """(bucket_ts, fingerprint, error_count) 컬럼을 [지문, 분] 개수 행렬로 변환
+
+    fingerprints를 주면 그 순서(정렬된 배열)대로 행을 만들고 목록에 없는 지문은 버립니다.
+    """
+    if fingerprints is None:
+        fingerprints, rows = np.unique(columns['fingerprint'].astype(str), return_inverse=True)
+        keep = np.ones(len(rows), dtype=bool)
+    else:
+        names = columns['fingerprint'].astype(str)
+        rows = np.searchsorted(fingerprints, names)
+        rows = np.minimum(rows, max(0, len(fingerprints) - 1))
+        keep = (fingerprints[rows] == names) if len(fingerprints) else np.zeros(len(names), dtype=bool)
+    positions = (columns['bucket_ts'] - start_ts) // 60
+    keep &= (positions >= 0) & (positions < minutes)
+
+    matrix = np.zeros((len(fingerprints), minutes), dtype=np.float64)
+    np.add.at(matrix, (rows[keep], positions[keep]), columns['error_count'][keep])
+    return fingerprints, matrix
+
+
+def ewma_baseline(matrix: np.ndarray, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+    """시점별 직전까지의 EWMA 평균/분산 ([지문, 분], 첫 분은 관측값으로 초기화)"""
+    expected = np.empty_like(matrix)
+    variance = np.empty_like(matrix)
+    if matrix.shape[1] == 0:
+        return expected, variance
+    mean = matrix[:, 0].copy()
+    var = np.zeros(matrix.shape[0])
+    for t in range(matrix.shape[1]):
+        expected[:, t] = mean
+        variance[:, t] = var
+        diff = matrix[:, t] - mean
+        mean += alpha * diff
+        var = (1 - alpha) * (var + alpha * diff * diff)
+    return expected, variance
+
+
+def seasonal_baseline(season_matrix: np.ndarray, smoothing: int = 2) -> np.ndarray:
+    """지난 주기 같은 분 기준선 (앞뒤 smoothing분 이동 평균, 가장자리는 있는 구간만 평균)"""
+    if smoothing <= 0 or season_matrix.shape[1] == 0:
+        return season_matrix
+    width = 2 * smoothing + 1
+    padded = np.pad(season_matrix, ((0, 0), (smoothing, smoothing)))
+    cumulative = np.cumsum(np.pad(padded, ((0, 0), (1, 0))), axis=1)
+    sums = cumulative[:, width:] - cumulative[:, :-width]
+    # 분마다 창 안에 실제로 있는 칸 수 (행렬 폭이 창보다 좁아도 같은 누적합 방식)
+    ones = np.cumsum(np.pad(np.ones(season_matrix.shape[1]), (smoothing + 1, smoothing)))
+    counts = ones[width:] - ones[:-width]
+    return sums / counts
+
+
+def score_anomalies(matrix: np.ndarray, season_matrix: np.ndarray, alpha: float = ANOMALY_EWMA_ALPHA,
+                    z_threshold: float = ANOMALY_Z_THRESHOLD, min_count: float = ANOMALY_MIN_COUNT,
+                    smoothing: int = 2) -> Dict[str, np.ndarray]:
+    """[지문, 분] 행렬 전체의 EWMA/계절 점수와 이상 여부 (모두 같은 모양의 배열)"""
+    expected, variance = ewma_baseline(matrix, alpha)
+    z_score = (matrix - expected) / np.sqrt(variance + expected + 1)
+    seasonal = seasonal_baseline(season_matrix, smoothing)
+    seasonal_z = (matrix - seasonal) / np.sqrt(seasonal + 1)
+    flags = (matrix >= min_count) & (z_score >= z_threshold) & (seasonal_z >= z_threshold)
+    return {'expected': expected, 'z_score': z_score, 'seasonal': seasonal, 'seasonal_z': seasonal_z,
+            'flags': flags}
+
+
+class AnomalyDetector:
+    """지문별 이상 탐지 작업 (수집 데몬이 interval마다 실행, 결과는 signature_anomalies에 저장)"""
+
+    def __init__(self, db=None, interval: float = ANOMALY_INTERVAL, history_minutes: int = ANOMALY_HISTORY_MINUTES,
+                 report_minutes: int = ANOMALY_REPORT_MINUTES, season_days: float = ANOMALY_SEASON_DAYS,
+                 alpha: float = ANOMALY_EWMA_ALPHA, z_threshold: float = ANOMALY_Z_THRESHOLD,
+                 min_count: float = ANOMALY_MIN_COUNT):
+        self.db = db or get_db_manager()
+        self.interval = interval
+        self.history_minutes = history_minutes
+        self.report_minutes = min(report_minutes, history_minutes)
+        self.season_seconds = int(season_days * 86400)
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.min_count = min_count
+        self.running = False
+        self.thread = None
+        self.last_run = {}
+        self._stop = threading.Event()
+
+    def detect(self, now: datetime = None) -> pd.DataFrame:
+        """완료된 최근 분들을 점수화하고 보고 구간의 이상 결과를 저장 후 반환"""
+        started = time.perf_counter()
+        now = now or datetime.now(KST)
+        # 진행 중인 현재 분은 제외 (개수가 덜 쌓여 있음)
+        end_ts = to_wall_epoch(now) // 60 * 60
+        start_ts = end_ts - self.history_minutes * 60
+        report_start_ts = end_ts - self.report_minutes * 60
+
+        fingerprints, matrix = build_matrix(self.db.get_signature_rollups(start_ts, end_ts),
+                                            start_ts, self.history_minutes)
+        season_start_ts = start_ts - self.season_seconds
+        _, season_matrix = build_matrix(
+            self.db.get_signature_rollups(season_start_ts, season_start_ts + self.history_minutes * 60),
+            season_start_ts, self.history_minutes, fingerprints
+        )
+        scores = score_anomalies(matrix, season_matrix, self.alpha, self.z_threshold, self.min_count)
+
+        # 보고 구간의 이상 셀만 저장
+        first_column = self.history_minutes - self.report_minutes
+        rows, columns = np.nonzero(scores['flags'][:, first_column:])
+        columns += first_column
+        records = [
+            (start_ts + int(column) * 60, str(fingerprints[row]), int(matrix[row, column]),
+             round(float(scores['expected'][row, column]), 2), round(float(scores['z_score'][row, column]), 2),
+             round(float(scores['seasonal'][row, column]), 2), round(float(scores['seasonal_z'][row, column]), 2))
+            for row, column in zip(rows, columns)
+        ]
+        self.db.replace_anomalies(report_start_ts, end_ts, records)
+
+        self.last_run = {
+            'at': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'signatures': len(fingerprints),
+            'anomalies': len(records),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+        return pd.DataFrame(records, columns=['bucket_ts', 'fingerprint', 'error_count', 'expected',
+                                              'z_score', 'seasonal', 'seasonal_z'])
+
+    def start(self):
+        """interval마다 detect() 실행하는 스레드 시작"""
+        if not self.running:
+            self.running = True
+            self._stop.clear()
+            self.thread = threading.Thread(target=self._loop, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self._stop.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _loop(self):
+        while self.running:
+            try:
+                self.detect()
+                if self.last_run['anomalies']:
+                    logger.info('anomalies_detected', **self.last_run)
+            except Exception as e:
+                logger.error('anomaly_detection_error', error=f"{type(e).__name__}: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def stats(self) -> Dict:
+        return {'running': self.running, 'interval': self.interval, **self.last_run}
+
+
+# 전역 인스턴스 (첫 사용 시 생성)
+get_anomaly_detector = LazySingleton(AnomalyDetector)
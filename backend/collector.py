@@ -0,0 +1,159 @@
+# 파일명: backend/collector.py
+"""중앙 수집기 (원격 에이전트 프레임 수신 → DatabaseSink 일괄 저장)
+
+POST /ingest: zlib 압축 JSON 프레임(backend/shipping.py) 1개를 받아, 이벤트와 체크포인트의 source 앞에
+호스트 이름을 붙이고(host:원본 source) host 컬럼을 채워 DatabaseSink.write로 한 트랜잭션에 저장한 뒤
+{"ack": frame_id}로 응답합니다. 같은 프레임이 다시 와도 (source, offset) 멱등성 키로 중복 저장되지 않습니다.
+SQLite 쓰기는 한 번에 하나이므로 요청 스레드들은 잠금으로 저장을 직렬화합니다.
+"""
+import hmac
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from .config import COLLECTOR_HOST, COLLECTOR_MAX_FRAME_BYTES, COLLECTOR_PORT, COLLECTOR_TOKEN
+from .event_log import EventLogger
+from .metrics import COLLECTOR_BYTES, COLLECTOR_EVENTS, COLLECTOR_FRAMES
+from .shipping import decode_frame
+
+logger = EventLogger('collector')
+
+
+def host_source(host: str, source: str) -> str:
+    """원격 호스트의 source 키 (호스트끼리 같은 경로/inode여도 구분)"""
+    return f"{host}:{source}"
+
+
+class _CollectorHandler(BaseHTTPRequestHandler):
+    collector: 'CollectorServer' = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.split('?')[0].rstrip('/') in ('', '/healthz'):
+            self._respond(200, {'status': 'ok'})
+        else:
+            self._respond(404, {'error': 'not found'})
+
+    def do_POST(self):
+        collector = self.collector
+        if self.path.split('?')[0].rstrip('/') != '/ingest':
+            self._respond(404, {'error': 'not found'})
+            return
+        if collector.token and not hmac.compare_digest(self.headers.get('Authorization', ''),
+                                                       f"Bearer {collector.token}"):
+            COLLECTOR_FRAMES.inc(result='unauthorized')
+            self._respond(401, {'error': 'unauthorized'})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0 or length > collector.max_frame_bytes:
+            COLLECTOR_FRAMES.inc(result='rejected')
+            self._respond(413 if length else 411, {'error': f"Content-Length 0 < n <= {collector.max_frame_bytes}"})
+            return
+        body = self.rfile.read(length)
+        COLLECTOR_BYTES.inc(len(body))
+        try:
+            frame = decode_frame(body, collector.max_frame_bytes)
+        except ValueError as e:
+            COLLECTOR_FRAMES.inc(result='rejected')
+            logger.warning('frame_rejected', client=self.client_address[0], error=str(e))
+            self._respond(400, {'error': str(e)})
+            return
+        try:
+            inserted = collector.ingest(frame)
+        except Exception as e:
+            # 저장 실패는 에이전트가 재시도 (프레임은 스풀에 남아 있음)
+            COLLECTOR_FRAMES.inc(result='error')
+            logger.error('frame_store_error', host=frame['host'], frame_id=frame['frame_id'],
+                         error=f"{type(e).__name__}: {e}")
+            self._respond(503, {'error': 'store failed'})
+            return
+        COLLECTOR_FRAMES.inc(result='ok')
+        self._respond(200, {'ack': frame['frame_id'], 'received': len(frame['events']), 'inserted': inserted})
+
+
+class CollectorServer:
+    """백그라운드 스레드 프레임 수신 HTTP 서버 (port=0이면 임의 포트)
+
+    sink는 LogMonitor와 같은 인터페이스(write)이며, 수집 데몬은 로컬 LogMonitor의 DatabaseSink를
+    그대로 넘겨 원격 이벤트도 사전 분석/알림/상위 지문 추적에 전달되게 합니다.
+    """
+
+    def __init__(self, host: str = COLLECTOR_HOST, port: int = COLLECTOR_PORT, sink=None,
+                 token: str = COLLECTOR_TOKEN, max_frame_bytes: int = COLLECTOR_MAX_FRAME_BYTES):
+        if sink is None:
+            from .log_monitor import DatabaseSink
+            sink = DatabaseSink()
+        self.sink = sink
+        self.token = token
+        self.max_frame_bytes = max_frame_bytes
+        handler = type('BoundCollectorHandler', (_CollectorHandler,), {'collector': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+        self.stats = {'frames': 0, 'events': 0, 'inserted': 0, 'duplicates': 0}
+        # 원격 원본 파일별 워터마크 (LogMonitor.watermarks와 같은 형식, source는 host:경로)
+        self.watermarks: Dict[str, Dict] = {}
+        self.hosts: Dict[str, Dict] = {}
+        self._write_lock = threading.Lock()
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/ingest"
+
+    def ingest(self, frame: Dict) -> int:
+        """프레임 1개 저장 (새로 저장된 이벤트 수 반환)"""
+        host = frame['host']
+        events = [
+            {**event, 'host': host, 'source': host_source(host, event['source'])}
+            for event in frame['events']
+        ]
+        checkpoint = frame.get('checkpoint')
+        if checkpoint is not None:
+            checkpoint = {**checkpoint, 'source': host_source(host, checkpoint['source'])}
+        with self._write_lock:
+            inserted = self.sink.write(events, checkpoint)
+
+        now = time.time()
+        self.stats['frames'] += 1
+        self.stats['events'] += len(events)
+        self.stats['inserted'] += inserted
+        self.stats['duplicates'] += len(events) - inserted
+        if events:
+            COLLECTOR_EVENTS.inc(len(events), host=host)
+        host_stats = self.hosts.setdefault(host, {'frames': 0, 'events': 0, 'last_seen': None})
+        host_stats['frames'] += 1
+        host_stats['events'] += len(events)
+        host_stats['last_seen'] = now
+        if checkpoint is not None:
+            watermark = self.watermarks.setdefault(checkpoint['source'], {'source': checkpoint['source'],
+                                                                          'host': host})
+            watermark.update(offset=checkpoint['offset'], file_size=checkpoint.get('file_size'))
+            if checkpoint.get('event_time') is not None:
+                watermark.update(event_time=checkpoint['event_time'], queryable_at=now)
+        return inserted
+
+    def start(self) -> 'CollectorServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.log('collector_listening', limit=False, address=self.address)
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def summary(self) -> Dict:
+        """health 파일용 상태 (호스트별 프레임/이벤트 수와 마지막 수신 시각)"""
+        return {'address': self.address, **self.stats, 'hosts': {host: dict(stats) for host, stats in self.hosts.items()}}
@@ -1,5 +1,6 @@
 # 파일명: backend/config.py
 import os
+import socket
 from dotenv import load_dotenv
 
 # .env 파일 로드
@@ -17,6 +18,107 @@ DB_PATH = os.getenv("DB_PATH", "./logs.db")
 # 로그 파일 설정
 LOG_FILE = os.getenv("LOG_FILE") or os.getenv("LLOG_FILE", "./tomcat.log")  # LLOG_FILE 오타 지원
 
+# AI 분석 캐시 설정 (에러 지문 기준)
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", str(7 * 24 * 3600)))  # 초
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+
+# LLM 호출 제한 및 재시도 설정
+LLM_RATE_LIMIT_RPS = float(os.getenv("LLM_RATE_LIMIT_RPS", "5"))  # 초당 요청 수
+LLM_RATE_LIMIT_BURST = float(os.getenv("LLM_RATE_LIMIT_BURST", "10"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))  # 초
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "20"))  # 초
+
+# AI 분석 호출 계측 보존 기간
+LLM_METRICS_RETENTION = int(os.getenv("LLM_METRICS_RETENTION", str(7 * 24 * 3600)))  # 초
+
+# 프롬프트 토큰 예산 (시스템/템플릿 포함 전체 프롬프트 기준) 및 애플리케이션 패키지
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "2000"))
+APP_PACKAGE_PREFIXES = [
+    prefix.strip() for prefix in os.getenv("APP_PACKAGE_PREFIXES", "com.example.").split(",") if prefix.strip()
+]
+
+# 유사 에러 검색 (MinHash/LSH, num_perm은 bands의 배수)
+SIMILARITY_NUM_PERM = int(os.getenv("SIMILARITY_NUM_PERM", "64"))
+SIMILARITY_BANDS = int(os.getenv("SIMILARITY_BANDS", "16"))
+SIMILARITY_MIN = float(os.getenv("SIMILARITY_MIN", "0.5"))
+
+# 인시던트 분석 (시간 구간 내 연관 에러를 한 번에 분석)
+INCIDENT_PROMPT_TOKEN_BUDGET = int(os.getenv("INCIDENT_PROMPT_TOKEN_BUDGET", "4000"))
+INCIDENT_MIN_COOCCURRENCE = float(os.getenv("INCIDENT_MIN_COOCCURRENCE", "0.3"))
+INCIDENT_MAX_LOGS = int(os.getenv("INCIDENT_MAX_LOGS", "5000"))  # 인시던트 계산에 쓰는 구간 내 최신 로그 수
+
+# 백그라운드 사전 분석 워커 (신규 지문/FATAL 발생 시 미리 분석해 캐시)
+ANALYSIS_WORKER_ENABLED = os.getenv("ANALYSIS_WORKER_ENABLED", "true").lower() == "true"
+ANALYSIS_WORKER_HOURLY_BUDGET = int(os.getenv("ANALYSIS_WORKER_HOURLY_BUDGET", "30"))  # 시간당 LLM 호출 수
+ANALYSIS_WORKER_QUEUE_SIZE = int(os.getenv("ANALYSIS_WORKER_QUEUE_SIZE", "200"))
+ANALYSIS_WORKER_MAX_TRACKED = int(os.getenv("ANALYSIS_WORKER_MAX_TRACKED", "10000"))  # 빈도를 기억할 최대 지문 수 (LRU)
+
+# 로그 수집 (한 트랜잭션에 저장할 최대 이벤트 수, 여러 줄 이벤트 마무리 대기 시간)
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+INGEST_FLUSH_INTERVAL = float(os.getenv("INGEST_FLUSH_INTERVAL", "0.5"))  # 초
+
+# 수집 데몬 상태 파일 (python main.py ingest가 주기적으로 갱신, 대시보드가 읽음)
+INGEST_HEALTH_FILE = os.getenv("INGEST_HEALTH_FILE", "./ingest_health.json")
+INGEST_HEALTH_INTERVAL = float(os.getenv("INGEST_HEALTH_INTERVAL", "5"))  # 초
+
+# 수집 지연 경고 기준 (최신 이벤트가 조회 가능해지기까지의 시간, 아직 읽지 않은 파일 바이트)
+INGEST_LAG_ALERT_SECONDS = float(os.getenv("INGEST_LAG_ALERT_SECONDS", "30"))
+INGEST_LAG_ALERT_BYTES = int(os.getenv("INGEST_LAG_ALERT_BYTES", str(10 * 1024 * 1024)))
+# 줄 시각이 읽은 시각보다 이만큼 넘게 과거면 재생(과거 파일)으로 보고 읽은 시각을 이벤트 시각으로 사용
+INGEST_REPLAY_SKEW_SECONDS = float(os.getenv("INGEST_REPLAY_SKEW_SECONDS", "3600"))
+
+# 수집 시점 알림 (규칙 파일이 없으면 기본 규칙, 전송 대상: stdout/file/webhook 쉼표 구분)
+ALERT_ENABLED = os.getenv("ALERT_ENABLED", "true").lower() == "true"
+ALERT_RULES_FILE = os.getenv("ALERT_RULES_FILE", "")
+ALERT_SINKS = os.getenv("ALERT_SINKS", "stdout")
+ALERT_FILE = os.getenv("ALERT_FILE", "./alerts.jsonl")
+ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL", "")
+ALERT_BATCH_INTERVAL = float(os.getenv("ALERT_BATCH_INTERVAL", "5"))  # 초 (규칙 재평가 및 일괄 전송 주기)
+ALERT_BATCH_SIZE = int(os.getenv("ALERT_BATCH_SIZE", "50"))
+ALERT_REPEAT_INTERVAL = float(os.getenv("ALERT_REPEAT_INTERVAL", "1800"))  # 초 (계속 발생 중인 알림 재전송 주기)
+
+# 지문별 이상 탐지 (1분 집계, EWMA + 지난 주기 같은 분 기준선, 수집 데몬에서 주기 실행)
+ANOMALY_ENABLED = os.getenv("ANOMALY_ENABLED", "true").lower() == "true"
+ANOMALY_INTERVAL = float(os.getenv("ANOMALY_INTERVAL", "60"))  # 초
+ANOMALY_HISTORY_MINUTES = int(os.getenv("ANOMALY_HISTORY_MINUTES", "360"))  # EWMA 학습 구간
+ANOMALY_REPORT_MINUTES = int(os.getenv("ANOMALY_REPORT_MINUTES", "60"))  # 결과 저장 구간
+ANOMALY_SEASON_DAYS = float(os.getenv("ANOMALY_SEASON_DAYS", "7"))  # 계절 기준선 주기 (일)
+ANOMALY_EWMA_ALPHA = float(os.getenv("ANOMALY_EWMA_ALPHA", "0.1"))
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "4"))
+ANOMALY_MIN_COUNT = int(os.getenv("ANOMALY_MIN_COUNT", "5"))  # 분당 최소 발생 수
+
+# 실시간 상위 에러 지문 (Space-Saving + Count-Min, 5분/1시간/24시간 윈도우, 수집 데몬이 주기적으로 DB에 게시)
+HEAVY_HITTERS_ENABLED = os.getenv("HEAVY_HITTERS_ENABLED", "true").lower() == "true"
+HEAVY_HITTERS_INTERVAL = float(os.getenv("HEAVY_HITTERS_INTERVAL", "10"))  # 초 (스냅샷 게시 주기)
+HEAVY_HITTERS_TOP_K = int(os.getenv("HEAVY_HITTERS_TOP_K", "10"))
+HEAVY_HITTERS_CAPACITY = int(os.getenv("HEAVY_HITTERS_CAPACITY", "200"))  # 슬롯별 Space-Saving 카운터 수
+HEAVY_HITTERS_CMS_WIDTH = int(os.getenv("HEAVY_HITTERS_CMS_WIDTH", "1024"))
+HEAVY_HITTERS_CMS_DEPTH = int(os.getenv("HEAVY_HITTERS_CMS_DEPTH", "4"))
+
+# 다중 호스트 수집 (에이전트: 로컬 tail → zlib 압축 프레임 HTTP 전송 + 디스크 스풀, 수집기: 프레임 수신 후 DB 저장)
+AGENT_HOST_NAME = os.getenv("AGENT_HOST_NAME") or socket.gethostname()
+AGENT_SPOOL_DIR = os.getenv("AGENT_SPOOL_DIR", "./agent_spool")
+AGENT_SPOOL_MAX_BYTES = int(os.getenv("AGENT_SPOOL_MAX_BYTES", str(512 * 1024 * 1024)))  # 넘으면 tail 일시 정지
+AGENT_SEND_TIMEOUT = float(os.getenv("AGENT_SEND_TIMEOUT", "10"))  # 초
+COLLECTOR_URL = os.getenv("COLLECTOR_URL", "http://127.0.0.1:9200/ingest")
+COLLECTOR_HOST = os.getenv("COLLECTOR_HOST", "127.0.0.1")
+COLLECTOR_PORT = int(os.getenv("COLLECTOR_PORT", "9200"))
+COLLECTOR_TOKEN = os.getenv("COLLECTOR_TOKEN", "")  # 공유 토큰 (비우면 인증 안 함)
+COLLECTOR_MAX_FRAME_BYTES = int(os.getenv("COLLECTOR_MAX_FRAME_BYTES", str(32 * 1024 * 1024)))  # 압축 해제 후 최대 크기
+
+# 수집 메트릭 (/metrics, Prometheus 텍스트 형식, 포트 0이면 끔) 및 구조화 로그 속도 제한
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+EVENT_LOG_RATE = float(os.getenv("EVENT_LOG_RATE", "5"))  # 이벤트 종류별 초당 출력 줄 수
+EVENT_LOG_BURST = float(os.getenv("EVENT_LOG_BURST", "20"))
+
+# 대시보드 렌더링 프로파일 (URL ?profile=1로도 켤 수 있음, 느린 렌더링은 cProfile 덤프 저장)
+RENDER_PROFILE = os.getenv("RENDER_PROFILE", "false").lower() == "true"
+RENDER_PROFILE_SLOW_MS = float(os.getenv("RENDER_PROFILE_SLOW_MS", "1500"))
+RENDER_PROFILE_DIR = os.getenv("RENDER_PROFILE_DIR", "./profiles")
+
 # 기타 설정
 REFRESH_INTERVAL = int(os.getenv("REFRESH_INTERVAL", "10"))  # 초
 LOG_GENERATION_INTERVAL = 5  # 초
@@ -27,7 +129,9 @@ def validate_azure_config():
     if AZURE_OPENAI_KEY == "your-key" or not AZURE_OPENAI_KEY:
         return False, "AZURE_OPENAI_KEY가 설정되지 않았습니다."
     
-    if not AZURE_OPENAI_ENDPOINT.startswith("https://"):
+    # 로컬 테스트용 가짜 엔드포인트는 http 허용
+    is_local_endpoint = AZURE_OPENAI_ENDPOINT.startswith(("http://localhost", "http://127.0.0.1"))
+    if not AZURE_OPENAI_ENDPOINT.startswith("https://") and not is_local_endpoint:
         return False, "AZURE_OPENAI_ENDPOINT가 올바르지 않습니다."
     
     if AZURE_OPENAI_DEPLOYMENT == "dev-gpt-4.1-mini" and "dev-gpt-4.1-mini" not in AZURE_OPENAI_DEPLOYMENT:
@@ -1,16 +1,57 @@
 # 파일명: backend/db_manager.py
 import sqlite3
+import calendar
+import time
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence, Tuple
 from .config import DB_PATH
+from .lazy import LazySingleton
+from .sketches import RESPONSE_TIME_SKETCH
+from .fingerprint import message_fingerprint
 
 # 한국 시간대 설정
 KST = timezone(timedelta(hours=9))
 
+def to_wall_epoch(value: datetime) -> int:
+    """KST 벽시계 시간을 UTC로 간주한 epoch 초 (SQLite strftime('%s')와 동일 기준)"""
+    return calendar.timegm(value.timetuple())
+
+def from_wall_epoch(seconds: int) -> datetime:
+    """to_wall_epoch의 역변환 (tz 정보 없는 KST 벽시계 시간)"""
+    return datetime(1970, 1, 1) + timedelta(seconds=int(seconds))
+
+# 컬럼별 numpy dtype (지정되지 않은 컬럼은 object)
+COLUMN_DTYPES = {
+    'id': np.int64,
+    'bucket_ts': np.int64,
+    'bin': np.int64,
+    'count': np.int64,
+    'response_time': np.int64,
+    'error_count': np.int64,
+    'avg_response_time': np.float64,
+    'response_time_sum': np.float64,
+    'min_response_time': np.float64,
+    'max_response_time': np.float64,
+    'expected': np.float64,
+    'z_score': np.float64,
+    'seasonal': np.float64,
+    'seasonal_z': np.float64,
+}
+
+# 응답시간 히스토그램 테이블 (테이블명, 구간 크기(초))
+HISTOGRAM_TABLES = (('response_time_hist_1m', 60), ('response_time_hist_1h', 3600))
+
+# 기본 응답시간 분위수
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# datetime64로 미리 변환할 컬럼
+DATETIME_COLUMNS = ('timestamp', 'created_at', 'time_bucket')
+
 class DatabaseManager:
-    def __init__(self):
-        self.db_path = DB_PATH
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or DB_PATH
         self.init_database()
         
     def init_database(self):
@@ -27,55 +68,312 @@ class DatabaseManager:
                     created_at DATETIME NOT NULL
                 )
             ''')
+            
+            # 에러 지문 컬럼 (기존 DB는 컬럼 추가 후 채우기)
+            cursor.execute("PRAGMA table_info(error_logs)")
+            existing_columns = {row[1] for row in cursor.fetchall()}
+            if 'fingerprint' not in existing_columns:
+                cursor.execute("ALTER TABLE error_logs ADD COLUMN fingerprint TEXT")
+            conn.create_function('message_fingerprint', 2, message_fingerprint, deterministic=True)
+            cursor.execute('''
+                UPDATE error_logs SET fingerprint = message_fingerprint(level, message)
+                WHERE fingerprint IS NULL
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_error_logs_fingerprint
+                ON error_logs (fingerprint, timestamp)
+            ''')
+            
+            # 수집 멱등성 키 (원본 스트림 + 이벤트 시작 바이트 오프셋, 기존 행은 NULL)
+            if 'source' not in existing_columns:
+                cursor.execute("ALTER TABLE error_logs ADD COLUMN source TEXT")
+            if 'source_offset' not in existing_columns:
+                cursor.execute("ALTER TABLE error_logs ADD COLUMN source_offset INTEGER")
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_error_logs_source_offset
+                ON error_logs (source, source_offset)
+            ''')
+            
+            # 수집 호스트 (원격 에이전트 이벤트만, 로컬 수집은 NULL)
+            if 'host' not in existing_columns:
+                cursor.execute("ALTER TABLE error_logs ADD COLUMN host TEXT")
+            
+            # 원본 파일별 수집 체크포인트 (다음에 읽을 바이트 오프셋, 교체/truncate 시 generation 증가)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ingest_offsets (
+                    source TEXT PRIMARY KEY,
+                    offset INTEGER NOT NULL,
+                    inode INTEGER,
+                    generation INTEGER NOT NULL DEFAULT 0,
+                    updated_at DATETIME NOT NULL
+                )
+            ''')
+            
+            # 수집 워터마크 (저장 시점의 파일 크기, 최신 이벤트 시각과 조회 가능해진 시각, epoch 초)
+            cursor.execute("PRAGMA table_info(ingest_offsets)")
+            offset_columns = {row[1] for row in cursor.fetchall()}
+            for column, column_type in (('file_size', 'INTEGER'), ('event_time', 'REAL'), ('queryable_at', 'REAL')):
+                if column not in offset_columns:
+                    cursor.execute(f"ALTER TABLE ingest_offsets ADD COLUMN {column} {column_type}")
+            
+            # 1분 단위 사전 집계 테이블 (bucket_ts: KST 벽시계 기준 epoch 초)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS error_rollups_1m (
+                    bucket_ts INTEGER NOT NULL,
+                    level TEXT NOT NULL,
+                    error_count INTEGER NOT NULL DEFAULT 0,
+                    response_time_sum INTEGER NOT NULL DEFAULT 0,
+                    response_time_min INTEGER,
+                    response_time_max INTEGER,
+                    PRIMARY KEY (bucket_ts, level)
+                )
+            ''')
+            
+            # 기존 데이터가 있으면 집계 테이블 1회 채우기
+            cursor.execute('SELECT EXISTS(SELECT 1 FROM error_rollups_1m)')
+            if not cursor.fetchone()[0]:
+                cursor.execute('''
+                    INSERT INTO error_rollups_1m
+                    SELECT CAST(strftime('%s', timestamp) AS INTEGER) / 60 * 60, level,
+                           COUNT(*), SUM(response_time), MIN(response_time), MAX(response_time)
+                    FROM error_logs
+                    WHERE strftime('%s', timestamp) IS NOT NULL
+                    GROUP BY 1, 2
+                ''')
+            
+            # 에러 지문별 1분 집계 (이상 탐지용, 기존 데이터가 있으면 1회 채우기)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS signature_rollups_1m (
+                    bucket_ts INTEGER NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    error_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (bucket_ts, fingerprint)
+                )
+            ''')
+            cursor.execute('SELECT EXISTS(SELECT 1 FROM signature_rollups_1m)')
+            if not cursor.fetchone()[0]:
+                cursor.execute('''
+                    INSERT INTO signature_rollups_1m
+                    SELECT CAST(strftime('%s', timestamp) AS INTEGER) / 60 * 60, fingerprint, COUNT(*)
+                    FROM error_logs
+                    WHERE strftime('%s', timestamp) IS NOT NULL AND fingerprint IS NOT NULL
+                    GROUP BY 1, 2
+                ''')
+            
+            # 이상 탐지 결과 (AnomalyDetector가 주기적으로 갱신)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS signature_anomalies (
+                    bucket_ts INTEGER NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    error_count INTEGER NOT NULL,
+                    expected REAL NOT NULL,
+                    z_score REAL NOT NULL,
+                    seasonal REAL,
+                    seasonal_z REAL,
+                    detected_at DATETIME NOT NULL,
+                    PRIMARY KEY (bucket_ts, fingerprint)
+                )
+            ''')
+            
+            # 윈도우별 실시간 상위 에러 지문 (HeavyHitterTracker가 주기적으로 교체)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS heavy_hitters (
+                    window_key TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    previous_count INTEGER NOT NULL,
+                    window_total INTEGER NOT NULL,
+                    error_bound INTEGER NOT NULL,
+                    updated_at DATETIME NOT NULL,
+                    PRIMARY KEY (window_key, rank)
+                )
+            ''')
+            
+            # 응답시간 로그 구간 히스토그램 (분/시간 단위, 병합하여 분위수 계산)
+            conn.create_function('rt_bin', 1, RESPONSE_TIME_SKETCH.bin_index, deterministic=True)
+            for table, bucket_seconds in HISTOGRAM_TABLES:
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        bucket_ts INTEGER NOT NULL,
+                        level TEXT NOT NULL,
+                        bin INTEGER NOT NULL,
+                        count INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (bucket_ts, level, bin)
+                    )
+                ''')
+                cursor.execute(f'SELECT EXISTS(SELECT 1 FROM {table})')
+                if not cursor.fetchone()[0]:
+                    cursor.execute(f'''
+                        INSERT INTO {table}
+                        SELECT CAST(strftime('%s', timestamp) AS INTEGER) / {bucket_seconds} * {bucket_seconds},
+                               level, rt_bin(response_time), COUNT(*)
+                        FROM error_logs
+                        WHERE strftime('%s', timestamp) IS NOT NULL
+                        GROUP BY 1, 2, 3
+                    ''')
             conn.commit()
     
-    def insert_log(self, level: str, message: str, response_time: int = 0, timestamp=None):
-        """에러 로그 삽입 (한국 시간으로)"""
+    def _update_rollups(self, cursor, timestamp: str, level: str, response_time: int, fingerprint: str):
+        """1분 집계(레벨별/지문별) 및 응답시간 히스토그램 갱신 (삽입과 같은 트랜잭션에서 호출)"""
+        cursor.execute('''
+            INSERT INTO error_rollups_1m
+                (bucket_ts, level, error_count, response_time_sum, response_time_min, response_time_max)
+            SELECT CAST(strftime('%s', ?1) AS INTEGER) / 60 * 60, ?2, 1, ?3, ?3, ?3
+            WHERE strftime('%s', ?1) IS NOT NULL
+            ON CONFLICT(bucket_ts, level) DO UPDATE SET
+                error_count = error_count + 1,
+                response_time_sum = response_time_sum + excluded.response_time_sum,
+                response_time_min = MIN(response_time_min, excluded.response_time_min),
+                response_time_max = MAX(response_time_max, excluded.response_time_max)
+        ''', (timestamp, level, response_time))
+        
+        cursor.execute('''
+            INSERT INTO signature_rollups_1m (bucket_ts, fingerprint, error_count)
+            SELECT CAST(strftime('%s', ?1) AS INTEGER) / 60 * 60, ?2, 1
+            WHERE strftime('%s', ?1) IS NOT NULL
+            ON CONFLICT(bucket_ts, fingerprint) DO UPDATE SET error_count = error_count + 1
+        ''', (timestamp, fingerprint))
+        
+        bin_index = RESPONSE_TIME_SKETCH.bin_index(response_time)
+        for table, bucket_seconds in HISTOGRAM_TABLES:
+            cursor.execute(f'''
+                INSERT INTO {table} (bucket_ts, level, bin, count)
+                SELECT CAST(strftime('%s', ?1) AS INTEGER) / {bucket_seconds} * {bucket_seconds}, ?2, ?3, 1
+                WHERE strftime('%s', ?1) IS NOT NULL
+                ON CONFLICT(bucket_ts, level, bin) DO UPDATE SET count = count + 1
+            ''', (timestamp, level, bin_index))
+    
+    def _normalize_timestamp(self, timestamp) -> str:
+        """삽입 시각 문자열 (None이면 현재 한국 시간)"""
+        if timestamp is None:
+            return datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
+        # datetime 객체가 전달된 경우
+        if hasattr(timestamp, 'strftime'):
+            return timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        return str(timestamp)
+    
+    def _insert_row(self, cursor, level: str, message: str, response_time: int, timestamp,
+                    source: str = None, source_offset: int = None, fingerprint: str = None,
+                    host: str = None) -> Optional[int]:
+        """error_logs 1행 삽입 + 집계 갱신 (같은 source/offset이 이미 있으면 무시하고 None 반환)"""
+        current_timestamp = self._normalize_timestamp(timestamp)
+        
+        # created_at은 실제 수집 시각 (밀리초, 수집 지연 측정용)
+        ingested_at = datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        fingerprint = fingerprint or message_fingerprint(level, message)
+        
+        cursor.execute('''
+            INSERT OR IGNORE INTO error_logs
+                (timestamp, level, message, response_time, created_at, fingerprint, source, source_offset, host)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (current_timestamp, level, message, response_time, ingested_at,
+              fingerprint, source, source_offset, host))
+        if cursor.rowcount == 0:
+            return None
+        log_id = cursor.lastrowid
+        self._update_rollups(cursor, current_timestamp, level, response_time, fingerprint)
+        return log_id
+    
+    def insert_log(self, level: str, message: str, response_time: int = 0, timestamp=None,
+                   source: str = None, source_offset: int = None) -> Optional[int]:
+        """에러 로그 삽입 (한국 시간으로), 삽입된 로그 ID 반환 (중복 source/offset이면 None)"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            
-            # timestamp가 전달되지 않으면 한국 시간으로 생성
-            if timestamp is None:
-                current_timestamp = datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                # datetime 객체가 전달된 경우
-                if hasattr(timestamp, 'strftime'):
-                    current_timestamp = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    current_timestamp = str(timestamp)
-            
-            cursor.execute('''
-                INSERT INTO error_logs (timestamp, level, message, response_time, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (current_timestamp, level, message, response_time, current_timestamp))
+            log_id = self._insert_row(cursor, level, message, response_time, timestamp, source, source_offset)
             conn.commit()
+            return log_id
+    
+    def insert_logs(self, events: Sequence[Dict], checkpoint: Optional[Dict] = None) -> List[Optional[int]]:
+        """에러 로그 일괄 삽입 (한 트랜잭션), 이벤트별 삽입 ID 목록 반환 (중복은 None)
+        
+        events 항목: level, message, response_time, timestamp/source/offset/fingerprint/host(선택)
+        checkpoint({'source', 'offset', 'inode', 'generation'})를 주면 같은 트랜잭션에서
+        수집 오프셋을 갱신하므로 재시작 후에도 같은 이벤트가 두 번 저장되지 않습니다.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            log_ids = [
+                self._insert_row(cursor, event['level'], event['message'], event.get('response_time', 0),
+                                 event.get('timestamp'), event.get('source'), event.get('offset'),
+                                 event.get('fingerprint'), event.get('host'))
+                for event in events
+            ]
+            if checkpoint is not None:
+                # 커밋 직후부터 조회 가능하므로 queryable_at은 같은 트랜잭션의 기록 시각
+                cursor.execute('''
+                    INSERT INTO ingest_offsets
+                        (source, offset, inode, generation, updated_at, file_size, event_time, queryable_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(source) DO UPDATE SET
+                        offset = excluded.offset, inode = excluded.inode,
+                        generation = excluded.generation, updated_at = excluded.updated_at,
+                        file_size = excluded.file_size,
+                        event_time = COALESCE(excluded.event_time, event_time),
+                        queryable_at = CASE WHEN excluded.event_time IS NULL THEN queryable_at
+                                            ELSE excluded.queryable_at END
+                ''', (checkpoint['source'], checkpoint['offset'], checkpoint.get('inode'),
+                      checkpoint.get('generation', 0), datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S'),
+                      checkpoint.get('file_size'), checkpoint.get('event_time'), time.time()))
+            conn.commit()
+            return log_ids
+    
+    def get_ingest_offset(self, source: str) -> Optional[Dict]:
+        """원본 파일의 수집 체크포인트 ({'offset', 'inode', 'generation', 'updated_at'} + 워터마크, 없으면 None)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT offset, inode, generation, updated_at, file_size, event_time, queryable_at '
+                'FROM ingest_offsets WHERE source = ?', (source,)
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return {'offset': row[0], 'inode': row[1], 'generation': row[2], 'updated_at': row[3],
+                'file_size': row[4], 'event_time': row[5], 'queryable_at': row[6]}
+    
+    def get_ingest_watermarks(self) -> List[Dict]:
+        """원본 파일별 마지막 저장 워터마크 (source, offset, file_size, event_time, queryable_at, updated_at)"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT source, offset, file_size, event_time, queryable_at, updated_at
+                FROM ingest_offsets ORDER BY source
+            ''')
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def _build_recent_logs_query(self, limit: int, search_query: str = None,
+                                 start_date: str = None, end_date: str = None):
+        """최근 에러 로그 조회 쿼리 생성"""
+        query = '''
+            SELECT id, timestamp, level, message, response_time, host
+            FROM error_logs
+            WHERE 1=1
+        '''
+        params = []
+        
+        if search_query:
+            query += " AND message LIKE ?"
+            params.append(f"%{search_query}%")
+        
+        if start_date:
+            query += " AND DATE(timestamp) >= ?"
+            params.append(start_date)
+            
+        if end_date:
+            query += " AND DATE(timestamp) <= ?"
+            params.append(end_date)
+        
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+        return query, params
     
     def get_recent_logs(self, limit: int = 10, search_query: str = None, 
                        start_date: str = None, end_date: str = None) -> List[Dict]:
         """최근 에러 로그 조회"""
+        query, params = self._build_recent_logs_query(limit, search_query, start_date, end_date)
         with sqlite3.connect(self.db_path) as conn:
-            query = '''
-                SELECT id, timestamp, level, message, response_time
-                FROM error_logs
-                WHERE 1=1
-            '''
-            params = []
-            
-            if search_query:
-                query += " AND message LIKE ?"
-                params.append(f"%{search_query}%")
-            
-            if start_date:
-                query += " AND DATE(timestamp) >= ?"
-                params.append(start_date)
-                
-            if end_date:
-                query += " AND DATE(timestamp) <= ?"
-                params.append(end_date)
-            
-            query += " ORDER BY timestamp DESC LIMIT ?"
-            params.append(limit)
-            
             cursor = conn.cursor()
             cursor.execute(query, params)
             columns = [description[0] for description in cursor.description]
@@ -83,6 +381,63 @@ class DatabaseManager:
             
             return [dict(zip(columns, row)) for row in rows]
     
+    def fetch_columns(self, query: str, params: Sequence = ()) -> Dict[str, np.ndarray]:
+        """쿼리 결과를 행 단위 dict 없이 컬럼별 배열로 조회
+        
+        정수/실수 컬럼은 numpy 배열, 시간 컬럼은 datetime64[ns]로 변환됩니다.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+        
+        # 행 튜플을 컬럼 튜플로 전치 (결과가 없으면 빈 컬럼)
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        
+        data = {}
+        for name, column in zip(columns, values):
+            if name in DATETIME_COLUMNS:
+                data[name] = pd.to_datetime(
+                    pd.Index(column, dtype=object), format='ISO8601', errors='coerce'
+                ).values
+            elif name in COLUMN_DTYPES:
+                # NULL(None)은 0으로 처리
+                dtype = COLUMN_DTYPES[name]
+                data[name] = np.fromiter((v or 0 for v in column), dtype=dtype, count=len(column))
+            else:
+                data[name] = np.array(column, dtype=object)
+        return data
+    
+    def fetch_frame(self, query: str, params: Sequence = ()) -> pd.DataFrame:
+        """쿼리 결과를 컬럼 배열 기반 DataFrame으로 조회"""
+        return pd.DataFrame(self.fetch_columns(query, params), copy=False)
+    
+    def get_recent_logs_frame(self, limit: int = 10, search_query: str = None,
+                              start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """최근 에러 로그 조회 (DataFrame, timestamp는 datetime64)"""
+        query, params = self._build_recent_logs_query(limit, search_query, start_date, end_date)
+        return self.fetch_frame(query, params)
+    
+    def search_logs_frame(self, query: str, start_datetime: datetime, end_datetime: datetime,
+                          limit: int = 100) -> pd.DataFrame:
+        """기간 + 키워드 에러 검색 (DataFrame, timestamp는 datetime64)"""
+        sql_query = '''
+            SELECT id, timestamp, level, message, response_time, host
+            FROM error_logs
+            WHERE timestamp BETWEEN ? AND ?
+        '''
+        params = [start_datetime.strftime('%Y-%m-%d %H:%M:%S'),
+                  end_datetime.strftime('%Y-%m-%d %H:%M:%S')]
+        
+        if query and query.strip():
+            sql_query += ' AND message LIKE ?'
+            params.append(f'%{query}%')
+        
+        sql_query += ' ORDER BY timestamp DESC LIMIT ?'
+        params.append(limit)
+        return self.fetch_frame(sql_query, params)
+    
     def get_error_stats_last_hour(self) -> List[Dict]:
         """최근 1시간 에러 통계 (5분 간격) - 한국 시간 기준"""
         with sqlite3.connect(self.db_path) as conn:
@@ -110,12 +465,231 @@ class DatabaseManager:
             
             return [dict(zip(columns, row)) for row in rows]
     
+    def get_error_stats_frame(self, start: datetime, end: datetime,
+                              bucket_minutes: int = 5) -> pd.DataFrame:
+        """기간 내 에러 통계 (bucket_minutes 간격, 빈 구간은 0으로 채움)"""
+        bucket_seconds = bucket_minutes * 60
+        start_ts = to_wall_epoch(start) // bucket_seconds * bucket_seconds
+        bucket_start = from_wall_epoch(start_ts)
+        
+        frame = self.fetch_frame('''
+            SELECT 
+                datetime(CAST(strftime('%s', timestamp) AS INTEGER) / ? * ?, 'unixepoch') as time_bucket,
+                COUNT(*) as error_count,
+                AVG(response_time) as avg_response_time
+            FROM error_logs 
+            WHERE timestamp >= ? AND timestamp <= ?
+            GROUP BY time_bucket
+            ORDER BY time_bucket
+        ''', (bucket_seconds, bucket_seconds,
+              bucket_start.strftime('%Y-%m-%d %H:%M:%S'),
+              end.strftime('%Y-%m-%d %H:%M:%S')))
+        
+        # 데이터가 없는 구간도 0으로 표시
+        buckets = pd.date_range(
+            start=pd.Timestamp(bucket_start),
+            end=pd.Timestamp(end.replace(tzinfo=None)),
+            freq=f'{bucket_minutes}min'
+        )
+        frame = frame.set_index('time_bucket').reindex(buckets, fill_value=0)
+        frame.index.name = 'time_bucket'
+        frame['avg_response_time'] = frame['avg_response_time'].round(1)
+        return frame.reset_index()
+    
+    def get_rollup_series(self, start: datetime, end: datetime, bucket_seconds: int = 60,
+                          level: str = None) -> pd.DataFrame:
+        """1분 집계 테이블 기반 시계열 (bucket_seconds 간격으로 재집계, 빈 구간은 0)"""
+        start_ts = to_wall_epoch(start) // bucket_seconds * bucket_seconds
+        end_ts = to_wall_epoch(end)
+        
+        query = '''
+            SELECT 
+                bucket_ts / ? * ? as bucket_ts,
+                SUM(error_count) as error_count,
+                SUM(response_time_sum) as response_time_sum,
+                MIN(response_time_min) as min_response_time,
+                MAX(response_time_max) as max_response_time
+            FROM error_rollups_1m
+            WHERE bucket_ts >= ? AND bucket_ts <= ?
+        '''
+        params = [bucket_seconds, bucket_seconds, start_ts, end_ts]
+        
+        if level:
+            query += " AND level = ?"
+            params.append(level)
+        
+        query += " GROUP BY 1 ORDER BY 1"
+        columns = self.fetch_columns(query, params)
+        
+        # 전체 구간 기준으로 배열 채우기 (빈 구간 0)
+        buckets = np.arange(start_ts, end_ts + 1, bucket_seconds, dtype=np.int64)
+        positions = (columns['bucket_ts'] - start_ts) // bucket_seconds
+        
+        error_count = np.zeros(len(buckets), dtype=np.int64)
+        response_time_sum = np.zeros(len(buckets), dtype=np.float64)
+        min_response_time = np.zeros(len(buckets), dtype=np.float64)
+        max_response_time = np.zeros(len(buckets), dtype=np.float64)
+        
+        error_count[positions] = columns['error_count']
+        response_time_sum[positions] = columns['response_time_sum']
+        min_response_time[positions] = columns['min_response_time']
+        max_response_time[positions] = columns['max_response_time']
+        
+        avg_response_time = response_time_sum / np.maximum(error_count, 1)
+        
+        return pd.DataFrame({
+            'time_bucket': (buckets * 1_000_000_000).astype('datetime64[ns]'),
+            'error_count': error_count,
+            'avg_response_time': np.round(avg_response_time, 1),
+            'min_response_time': min_response_time,
+            'max_response_time': max_response_time,
+        })
+    
+    def _histogram_table(self, start_ts: int, bucket_seconds: int) -> str:
+        """조회 간격에 맞는 히스토그램 테이블 선택 (시간 단위로 정렬되면 1시간 테이블)"""
+        if bucket_seconds % 3600 == 0 and start_ts % 3600 == 0:
+            return 'response_time_hist_1h'
+        return 'response_time_hist_1m'
+    
+    def get_response_time_percentiles(self, start: datetime, end: datetime, level: str = None,
+                                      quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict:
+        """기간 내 응답시간 분위수 (분 단위 히스토그램 병합)
+        
+        반환: {'count': 건수, 'p50': ..., 'p95': ..., 'p99': ...}
+        """
+        query = '''
+            SELECT bin, SUM(count) as count
+            FROM response_time_hist_1m
+            WHERE bucket_ts >= ? AND bucket_ts <= ?
+        '''
+        params = [to_wall_epoch(start) // 60 * 60, to_wall_epoch(end)]
+        
+        if level:
+            query += " AND level = ?"
+            params.append(level)
+        
+        query += " GROUP BY bin"
+        columns = self.fetch_columns(query, params)
+        counts = columns['count'].astype(np.int64)
+        values = RESPONSE_TIME_SKETCH.quantiles_from_bins(columns['bin'].astype(np.int64), counts, quantiles)
+        
+        result = {'count': int(counts.sum())}
+        for q, value in zip(quantiles, values):
+            result[f"p{round(q * 100):g}"] = round(float(value), 1)
+        return result
+    
+    def get_percentile_series(self, start: datetime, end: datetime, bucket_seconds: int = 300,
+                              level: str = None,
+                              quantiles: Sequence[float] = DEFAULT_QUANTILES) -> pd.DataFrame:
+        """구간별 응답시간 분위수 시계열 (히스토그램 병합, 데이터 없는 구간은 NaN)"""
+        start_ts = to_wall_epoch(start) // bucket_seconds * bucket_seconds
+        end_ts = to_wall_epoch(end)
+        table = self._histogram_table(start_ts, bucket_seconds)
+        
+        query = f'''
+            SELECT bucket_ts / ? * ? as bucket_ts, bin, SUM(count) as count
+            FROM {table}
+            WHERE bucket_ts >= ? AND bucket_ts <= ?
+        '''
+        params = [bucket_seconds, bucket_seconds, start_ts, end_ts]
+        
+        if level:
+            query += " AND level = ?"
+            params.append(level)
+        
+        query += " GROUP BY 1, 2"
+        columns = self.fetch_columns(query, params)
+        
+        # [시간 구간, 히스토그램 구간] 개수 행렬 구성 후 행별 분위수 계산
+        buckets = np.arange(start_ts, end_ts + 1, bucket_seconds, dtype=np.int64)
+        bins, bin_positions = np.unique(columns['bin'].astype(np.int64), return_inverse=True)
+        matrix = np.zeros((len(buckets), len(bins)), dtype=np.int64)
+        rows = (columns['bucket_ts'] - start_ts) // bucket_seconds
+        np.add.at(matrix, (rows, bin_positions), columns['count'].astype(np.int64))
+        
+        values = RESPONSE_TIME_SKETCH.quantiles_matrix(bins, matrix, quantiles)
+        
+        frame = pd.DataFrame({'time_bucket': (buckets * 1_000_000_000).astype('datetime64[ns]')})
+        for j, q in enumerate(quantiles):
+            frame[f"p{round(q * 100):g}"] = np.round(values[:, j], 1)
+        return frame
+    
+    def get_signature_rollups(self, start_ts: int, end_ts: int) -> Dict[str, np.ndarray]:
+        """지문별 1분 집계 (bucket_ts, fingerprint, error_count 컬럼 배열, start_ts <= bucket_ts < end_ts)"""
+        return self.fetch_columns('''
+            SELECT bucket_ts, fingerprint, error_count
+            FROM signature_rollups_1m
+            WHERE bucket_ts >= ? AND bucket_ts < ?
+        ''', (start_ts, end_ts))
+    
+    def replace_anomalies(self, start_ts: int, end_ts: int, rows: Sequence[Tuple],
+                          retention_seconds: int = 30 * 24 * 3600):
+        """[start_ts, end_ts) 구간 이상 탐지 결과 교체 (rows: bucket_ts, fingerprint, error_count,
+        expected, z_score, seasonal, seasonal_z), 보관 기간이 지난 결과는 삭제"""
+        detected_at = datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM signature_anomalies WHERE bucket_ts >= ? AND bucket_ts < ?',
+                           (start_ts, end_ts))
+            cursor.execute('DELETE FROM signature_anomalies WHERE bucket_ts < ?', (end_ts - retention_seconds,))
+            cursor.executemany('''
+                INSERT OR REPLACE INTO signature_anomalies
+                    (bucket_ts, fingerprint, error_count, expected, z_score, seasonal, seasonal_z, detected_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [tuple(row) + (detected_at,) for row in rows])
+            conn.commit()
+    
+    def get_anomalies_frame(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """기간 내 지문별 이상 구간 (time_bucket은 datetime64, z_score 내림차순)"""
+        return self.fetch_frame('''
+            SELECT datetime(bucket_ts, 'unixepoch') AS time_bucket, fingerprint, error_count,
+                   expected, z_score, seasonal, seasonal_z
+            FROM signature_anomalies
+            WHERE bucket_ts >= ? AND bucket_ts <= ?
+            ORDER BY z_score DESC
+        ''', (to_wall_epoch(start) // 60 * 60, to_wall_epoch(end)))
+    
+    def replace_heavy_hitters(self, snapshot: Dict[str, Dict]):
+        """윈도우별 상위 지문 스냅샷 교체 (snapshot: 윈도우 키 -> {'total', 'error', 'top': [...]})"""
+        updated_at = datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            for window_key, window in snapshot.items():
+                cursor.execute('DELETE FROM heavy_hitters WHERE window_key = ?', (window_key,))
+                cursor.executemany('''
+                    INSERT INTO heavy_hitters
+                        (window_key, rank, fingerprint, count, previous_count, window_total, error_bound, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (window_key, rank, entry['fingerprint'], entry['count'], entry['previous_count'],
+                     window['total'], window['error'], updated_at)
+                    for rank, entry in enumerate(window['top'], start=1)
+                ])
+            conn.commit()
+    
+    def get_heavy_hitters(self, window_key: str) -> List[Dict]:
+        """윈도우의 상위 지문 스냅샷 (순위 오름차순, 레벨/대표 메시지 포함)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT h.rank, h.fingerprint, h.count, h.previous_count, h.window_total, h.error_bound,
+                       h.updated_at, l.level, l.message
+                FROM heavy_hitters h
+                LEFT JOIN error_logs l ON l.id = (
+                    SELECT MAX(id) FROM error_logs WHERE fingerprint = h.fingerprint
+                )
+                WHERE h.window_key = ?
+                ORDER BY h.rank
+            ''', (window_key,))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
     def get_log_by_id(self, log_id: int) -> Optional[Dict]:
         """ID로 로그 조회"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT id, timestamp, level, message, response_time
+                SELECT id, timestamp, level, message, response_time, fingerprint
                 FROM error_logs
                 WHERE id = ?
             ''', (log_id,))
@@ -125,6 +699,101 @@ class DatabaseManager:
                 columns = [description[0] for description in cursor.description]
                 return dict(zip(columns, row))
             return None
+    
+    def get_logs_by_ids(self, log_ids: Sequence[int]) -> List[Dict]:
+        """여러 ID의 로그 일괄 조회"""
+        if not log_ids:
+            return []
+        placeholders = ','.join('?' * len(log_ids))
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT id, timestamp, level, message, response_time, fingerprint
+                FROM error_logs
+                WHERE id IN ({placeholders})
+            ''', list(log_ids))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_latest_logs_by_fingerprints(self, fingerprints: Sequence[str]) -> List[Dict]:
+        """에러 지문별 가장 최근 로그 (대표 로그) 조회"""
+        if not fingerprints:
+            return []
+        placeholders = ','.join('?' * len(fingerprints))
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT id, timestamp, level, message, response_time, fingerprint
+                FROM error_logs
+                WHERE id IN (
+                    SELECT MAX(id) FROM error_logs
+                    WHERE fingerprint IN ({placeholders})
+                    GROUP BY fingerprint
+                )
+            ''', list(fingerprints))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_logs_in_window(self, start: datetime, end: datetime = None, limit: int = 5000) -> List[Dict]:
+        """기간 내 최신 limit건 에러 로그 (지문 포함, 시간 오름차순으로 반환)"""
+        end = end or datetime.now(KST)
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            # 급증 구간에서도 가장 최근 로그가 남도록 최신순으로 자른 뒤 뒤집음
+            cursor.execute('''
+                SELECT id, timestamp, level, message, response_time, fingerprint
+                FROM error_logs
+                WHERE timestamp >= ? AND timestamp <= ?
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            ''', (start.strftime('%Y-%m-%d %H:%M:%S'), end.strftime('%Y-%m-%d %H:%M:%S'), limit))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in reversed(cursor.fetchall())]
+    
+    def get_host_stats(self, start: datetime, end: datetime = None) -> List[Dict]:
+        """기간 내 수집 호스트별 에러 수와 마지막 발생 시각 (로컬 수집은 host가 None)"""
+        end = end or datetime.now(KST)
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT host, COUNT(*) as count, MAX(timestamp) as last_seen
+                FROM error_logs
+                WHERE timestamp >= ? AND timestamp <= ?
+                GROUP BY host
+                ORDER BY count DESC
+            ''', (start.strftime('%Y-%m-%d %H:%M:%S'), end.strftime('%Y-%m-%d %H:%M:%S')))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_distinct_fingerprints(self) -> List[str]:
+        """저장된 모든 에러 지문 (지문 인덱스만 읽음)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT DISTINCT fingerprint FROM error_logs WHERE fingerprint IS NOT NULL')
+            return [row[0] for row in cursor.fetchall()]
+    
+    def get_top_signatures(self, start: datetime, end: datetime = None, limit: int = 50) -> List[Dict]:
+        """기간 내 발생 건수 상위 에러 지문 (대표 로그 ID 포함)"""
+        end = end or datetime.now(KST)
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT fingerprint, level, COUNT(*) as count, MAX(id) as log_id,
+                       MIN(timestamp) as first_seen, MAX(timestamp) as last_seen
+                FROM error_logs
+                WHERE timestamp >= ? AND timestamp <= ? AND fingerprint IS NOT NULL
+                GROUP BY fingerprint
+                ORDER BY count DESC
+                LIMIT ?
+            ''', (start.strftime('%Y-%m-%d %H:%M:%S'), end.strftime('%Y-%m-%d %H:%M:%S'), limit))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+# 전역 인스턴스 (첫 사용 시 DB 초기화)
+get_db_manager = LazySingleton(DatabaseManager)
 
-# 전역 인스턴스
-db_manager = DatabaseManager()
\ No newline at end of file
+def __getattr__(name):
+    # 기존 `from .db_manager import db_manager` 호환 (첫 접근 시 생성)
+    if name == 'db_manager':
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
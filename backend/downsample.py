@@ -0,0 +1,66 @@
+# 파일명: backend/downsample.py
+import numpy as np
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 다운샘플링 (선택된 인덱스 반환)
+
+    첫/마지막 점은 항상 유지하고, 나머지 구간마다 인접 구간 평균점과
+    가장 큰 삼각형을 이루는 점을 하나씩 선택합니다.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # 첫/마지막 점을 제외한 구간 경계
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    prev = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 다음 구간의 평균점 (마지막 구간이면 마지막 점)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # 현재 구간 각 점과 (이전 선택점, 다음 구간 평균점)이 이루는 삼각형 면적
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+
+    return selected
+
+def minmax_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """구간별 최소/최대값 인덱스를 유지하는 다운샘플링 (스파이크 보존)"""
+    n = len(y)
+    if threshold >= n or threshold < 2:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    n_buckets = threshold // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+    indices = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        segment = y[start:end]
+        lo = start + int(np.argmin(segment))
+        hi = start + int(np.argmax(segment))
+        indices.extend(sorted({lo, hi}))
+
+    return np.asarray(indices, dtype=np.int64)
+
+def downsample(x: np.ndarray, y: np.ndarray, threshold: int, method: str = 'lttb') -> np.ndarray:
+    """다운샘플링 인덱스 반환 (method: 'lttb' | 'minmax')"""
+    if method == 'minmax':
+        return minmax_indices(y, threshold)
+    return lttb_indices(x, y, threshold)
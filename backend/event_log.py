@@ -0,0 +1,67 @@
+# 파일명: backend/event_log.py
+import json
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, TextIO
+from .config import EVENT_LOG_BURST, EVENT_LOG_RATE
+from .rate_limit import TokenBucket
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+def _format_value(value) -> str:
+    text = str(value)
+    if text == '' or any(ch in text for ch in ' ="\n\t'):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+class EventLogger:
+    """구조화 로그 (logfmt 한 줄) + 이벤트 종류별 속도 제한
+
+    같은 event 이름은 초당 rate건(버스트 burst건)까지만 출력하고, 나머지는 개수만 세었다가
+    다음 출력 줄에 suppressed=N으로 붙입니다. 버스트 중에도 stdout이 병목이 되지 않습니다.
+    """
+
+    def __init__(self, component: str, rate: float = EVENT_LOG_RATE, burst: float = EVENT_LOG_BURST,
+                 stream: Optional[TextIO] = None):
+        self.component = component
+        self.rate = rate
+        self.burst = burst
+        self.stream = stream
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def log(self, event: str, level: str = 'info', limit: bool = True, **fields):
+        """이벤트 1건 기록 (limit=False면 속도 제한 없이 항상 출력)"""
+        with self._lock:
+            if limit:
+                bucket = self._buckets.get(event)
+                if bucket is None:
+                    bucket = self._buckets[event] = TokenBucket(self.rate, self.burst)
+                if not bucket.try_acquire():
+                    self._suppressed[event] = self._suppressed.get(event, 0) + 1
+                    return
+            suppressed = self._suppressed.pop(event, 0)
+
+        parts = [
+            f"ts={datetime.now(KST).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]}",
+            f"level={level}",
+            f"component={self.component}",
+            f"event={event}",
+        ]
+        parts += [f"{key}={_format_value(value)}" for key, value in fields.items() if value is not None]
+        if suppressed:
+            parts.append(f"suppressed={suppressed}")
+        stream = self.stream or sys.stdout
+        stream.write(' '.join(parts) + '\n')
+
+    def info(self, event: str, **fields):
+        self.log(event, 'info', **fields)
+
+    def warning(self, event: str, **fields):
+        self.log(event, 'warning', **fields)
+
+    def error(self, event: str, **fields):
+        self.log(event, 'error', **fields)
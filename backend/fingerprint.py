@@ -0,0 +1,40 @@
+# 파일명: backend/fingerprint.py
+import hashlib
+import re
+
+# 정규화 규칙 (순서대로 적용: 가변 값을 자리표시자로 치환)
+_NORMALIZE_RULES = [
+    # 로그 라인 앞의 [타임스탬프] 및 레벨 접두어
+    (re.compile(r'^\[\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\]\s*'), ''),
+    (re.compile(r'^(?:(?:ERROR|FATAL|WARN|INFO|DEBUG|Exception):\s*)+'), ''),
+    # 로그 라인 끝의 [1234ms] 응답시간
+    (re.compile(r'\s*\[\d+ms\]\s*$'), ''),
+    # 날짜/시간
+    (re.compile(r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?'), '<ts>'),
+    # 따옴표 안의 값
+    (re.compile(r'"[^"\n]*"'), '"<str>"'),
+    # UUID / 16진수 / IP / URL
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<uuid>'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b'), '<hex>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}\b'), '<ip>'),
+    (re.compile(r'https?://\S+'), '<url>'),
+    # 자바 소스 라인 번호 (Foo.java:45) -> (Foo.java)
+    (re.compile(r'(\.java):\d+\)'), r'\1)'),
+    # 영문자와 붙은 식별자 내 숫자(req_1234abcd 등) 및 일반 숫자
+    (re.compile(r'\b[A-Za-z_]+_[0-9a-zA-Z]*\d[0-9a-zA-Z]*\b'), '<id>'),
+    (re.compile(r'\d+'), '<n>'),
+    # 공백 정리
+    (re.compile(r'[ \t]+'), ' '),
+]
+
+def normalize_message(message: str) -> str:
+    """에러 메시지에서 시간/숫자/식별자 등 가변 값을 제거한 정규화 문자열"""
+    text = (message or '').strip()
+    for pattern, replacement in _NORMALIZE_RULES:
+        text = pattern.sub(replacement, text)
+    return '\n'.join(line.strip() for line in text.splitlines() if line.strip())
+
+def message_fingerprint(level: str, message: str) -> str:
+    """레벨 + 정규화 메시지 기반 에러 지문 (16자리 16진수)"""
+    normalized = normalize_message(message)
+    return hashlib.sha1(f"{level}\n{normalized}".encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,192 @@
+# 파일명: backend/heavy_hitters.py
+"""수집 시점 실시간 상위 에러 지문 (heavy hitters)
+
+윈도우(5분/1시간/24시간)마다 슬롯 링 버퍼를 두고, 슬롯별로 Space-Saving(상위 후보)과
+Count-Min(개수 추정)을 유지합니다. 상위 K는 현재 윈도우 슬롯들의 후보를 모아 병합한 Count-Min으로
+개수를 추정해 고르고, 직전 윈도우 슬롯들로 같은 지문의 이전 개수(추세)를 계산합니다.
+메모리는 윈도우별 2 x slots x (capacity + depth x width)로 고정되며 이벤트 수와 무관합니다.
+
+수집 데몬이 interval마다 스냅샷을 heavy_hitters 테이블에 게시하고 대시보드는 그 표를 읽습니다.
+"""
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List
+import numpy as np
+from .config import (
+    HEAVY_HITTERS_CAPACITY, HEAVY_HITTERS_CMS_DEPTH, HEAVY_HITTERS_CMS_WIDTH, HEAVY_HITTERS_INTERVAL,
+    HEAVY_HITTERS_TOP_K,
+)
+from .db_manager import get_db_manager
+from .event_log import EventLogger
+from .fingerprint import message_fingerprint
+from .lazy import LazySingleton
+from .sketches import CountMinSketch, SpaceSaving, count_min_columns
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+logger = EventLogger('heavy_hitters')
+
+# 윈도우 키 -> (윈도우 길이(초), 슬롯 수)
+HEAVY_HITTER_WINDOWS = {
+    '5m': (300, 5),
+    '1h': (3600, 12),
+    '24h': (86400, 24),
+}
+
+
+class WindowedHeavyHitters:
+    """슬롯 링 버퍼 기반 슬라이딩 윈도우 상위 K (현재 윈도우 + 직전 윈도우, 만료 단위는 window / slots)"""
+
+    def __init__(self, window: float, slots: int, capacity: int = HEAVY_HITTERS_CAPACITY,
+                 width: int = HEAVY_HITTERS_CMS_WIDTH, depth: int = HEAVY_HITTERS_CMS_DEPTH):
+        self.window = window
+        self.slots = slots
+        self.slot_seconds = window / slots
+        ring = 2 * slots
+        self.slot_ids = [-1] * ring
+        self.counters = [SpaceSaving(capacity) for _ in range(ring)]
+        self.sketches = [CountMinSketch(width, depth) for _ in range(ring)]
+
+    @property
+    def memory_bytes(self) -> int:
+        """Count-Min 표 크기 합계 (Space-Saving 카운터는 capacity개로 제한)"""
+        return sum(sketch.table.nbytes for sketch in self.sketches)
+
+    def add(self, now: float, counts: Dict[str, int], columns: np.ndarray):
+        """지문별 개수 누적 (columns: counts 순서의 Count-Min 열 번호, now가 속한 슬롯에 기록)"""
+        slot_id = int(now // self.slot_seconds)
+        index = slot_id % len(self.slot_ids)
+        if self.slot_ids[index] != slot_id:
+            self.slot_ids[index] = slot_id
+            self.counters[index].clear()
+            self.sketches[index].clear()
+        self.counters[index].update(counts)
+        self.sketches[index].add_columns(columns, np.fromiter(counts.values(), dtype=np.int64, count=len(counts)))
+
+    def _merged(self, indices: List[int]) -> CountMinSketch:
+        merged = CountMinSketch(self.sketches[0].width, self.sketches[0].depth)
+        for index in indices:
+            merged.merge(self.sketches[index])
+        return merged
+
+    def top(self, now: float, k: int) -> Dict:
+        """현재 윈도우 상위 k개 지문 (count/previous_count는 Count-Min 추정, error는 추정 초과분 상한)"""
+        current = int(now // self.slot_seconds)
+        current_slots = [index for index, slot_id in enumerate(self.slot_ids)
+                         if current - self.slots < slot_id <= current]
+        previous_slots = [index for index, slot_id in enumerate(self.slot_ids)
+                          if current - 2 * self.slots < slot_id <= current - self.slots]
+        current_sketch, previous_sketch = self._merged(current_slots), self._merged(previous_slots)
+
+        candidates = set()
+        for index in current_slots:
+            candidates.update(self.counters[index].counters)
+        candidates = sorted(candidates)
+        columns = current_sketch.columns(candidates)
+        counts = current_sketch.estimate_columns(columns)
+        order = np.argsort(-counts, kind='stable')[:k]
+        previous_counts = previous_sketch.estimate_columns(columns[order])
+        return {
+            'total': current_sketch.total,
+            'previous_total': previous_sketch.total,
+            'error': current_sketch.error_bound,
+            'top': [
+                {'fingerprint': candidates[position], 'count': int(counts[position]),
+                 'previous_count': int(previous)}
+                for position, previous in zip(order, previous_counts)
+            ],
+        }
+
+
+class HeavyHitterTracker:
+    """윈도우별 실시간 상위 에러 지문 (DatabaseSink가 새로 저장한 이벤트를 observe로 전달)"""
+
+    def __init__(self, db=None, interval: float = HEAVY_HITTERS_INTERVAL, top_k: int = HEAVY_HITTERS_TOP_K,
+                 capacity: int = HEAVY_HITTERS_CAPACITY, width: int = HEAVY_HITTERS_CMS_WIDTH,
+                 depth: int = HEAVY_HITTERS_CMS_DEPTH, windows: Dict = None):
+        self.db = db or get_db_manager()
+        self.interval = interval
+        self.top_k = top_k
+        self.width, self.depth = width, depth
+        self.windows = {
+            key: WindowedHeavyHitters(window, slots, capacity, width, depth)
+            for key, (window, slots) in (windows or HEAVY_HITTER_WINDOWS).items()
+        }
+        self.running = False
+        self.thread = None
+        self.published_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def observe(self, events: Iterable[Dict], now: float = None):
+        """이벤트 누적 (시작 전이면 무시, 배치 안에서 지문별로 먼저 합산)"""
+        if not self.running:
+            return
+        counts = Counter(
+            event.get('fingerprint') or message_fingerprint(event['level'], event['message'])
+            for event in events
+        )
+        if not counts:
+            return
+        # 해시는 배치의 지문마다 한 번만 계산해 모든 윈도우에서 재사용
+        columns = count_min_columns(list(counts), self.width, self.depth)
+        now = now or time.time()
+        with self._lock:
+            for window in self.windows.values():
+                window.add(now, counts, columns)
+
+    def snapshot(self, now: float = None) -> Dict[str, Dict]:
+        """윈도우 키별 상위 K 스냅샷"""
+        now = now or time.time()
+        with self._lock:
+            return {key: window.top(now, self.top_k) for key, window in self.windows.items()}
+
+    def publish(self, now: float = None) -> Dict[str, Dict]:
+        """스냅샷을 heavy_hitters 테이블에 저장 (윈도우별 교체)"""
+        snapshot = self.snapshot(now)
+        self.db.replace_heavy_hitters(snapshot)
+        self.published_at = datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
+        return snapshot
+
+    def start(self):
+        """interval마다 publish() 실행하는 스레드 시작"""
+        if not self.running:
+            self.running = True
+            self._stop.clear()
+            self.thread = threading.Thread(target=self._loop, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """게시 스레드 중지 후 마지막 스냅샷 저장"""
+        if not self.running:
+            return
+        self.running = False
+        self._stop.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+        try:
+            self.publish()
+        except Exception as e:
+            logger.error('heavy_hitters_publish_error', error=f"{type(e).__name__}: {e}")
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.publish()
+            except Exception as e:
+                logger.error('heavy_hitters_publish_error', error=f"{type(e).__name__}: {e}")
+
+    def stats(self) -> Dict:
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'published_at': self.published_at,
+            'memory_bytes': sum(window.memory_bytes for window in self.windows.values()),
+        }
+
+
+# 전역 인스턴스 (첫 사용 시 생성)
+get_heavy_hitters = LazySingleton(HeavyHitterTracker)
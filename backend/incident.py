@@ -0,0 +1,138 @@
+# 파일명: backend/incident.py
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Sequence
+from .fingerprint import normalize_message
+from .prompt_budget import compact_for_prompt, estimate_tokens
+
+# 심각도 순서 (인시던트 정렬 및 대표 레벨 결정용)
+LEVEL_SEVERITY = {
+    'FATAL': 0,
+    'OutOfMemoryError': 0,
+    'ERROR': 1,
+    'SQLException': 1,
+    'TimeoutException': 2,
+    'Exception': 2,
+}
+
+def _bucket_set(timestamps: Sequence[str], bucket_seconds: int) -> set:
+    """타임스탬프 문자열 목록을 시간 버킷 번호 집합으로 변환 (해석할 수 없는 값은 건너뜀)"""
+    buckets = set()
+    for ts in timestamps:
+        try:
+            # 밀리초가 붙은 값 등 ISO 변형도 허용 (insert_log는 임의 문자열 시각을 저장할 수 있음)
+            epoch = datetime.fromisoformat(str(ts)).timestamp()
+        except ValueError:
+            continue
+        buckets.add(int(epoch // bucket_seconds))
+    return buckets
+
+def _jaccard(a: set, b: set) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+def build_incidents(logs: List[Dict], bucket_seconds: int = 60, min_cooccurrence: float = 0.3,
+                    min_events: int = 3, max_signatures: int = 50) -> List[Dict]:
+    """시간 구간의 에러 로그를 지문 + 동시 발생 기준으로 인시던트로 묶기
+
+    같은 지문은 하나의 시그니처로 모으고, 발생한 시간 버킷(bucket_seconds)의
+    Jaccard 유사도가 min_cooccurrence 이상인 시그니처끼리 같은 인시던트로 연결합니다.
+    min_events 미만이면서 FATAL이 아닌 단독 시그니처는 제외됩니다.
+    """
+    # 지문별 집계 (logs는 timestamp 오름차순)
+    signatures: Dict[str, Dict] = {}
+    for log in logs:
+        fingerprint = log.get('fingerprint')
+        if not fingerprint:
+            continue
+        signature = signatures.get(fingerprint)
+        if signature is None:
+            signature = signatures[fingerprint] = {
+                'fingerprint': fingerprint,
+                'level': log['level'],
+                'count': 0,
+                'first_seen': log['timestamp'],
+                'timestamps': [],
+            }
+        signature['count'] += 1
+        signature['last_seen'] = log['timestamp']
+        signature['timestamps'].append(log['timestamp'])
+        # 가장 최근 로그를 대표로 사용
+        signature['log_id'] = log['id']
+        signature['message'] = log['message']
+        signature['response_time'] = log.get('response_time', 0)
+
+    ranked = sorted(signatures.values(), key=lambda s: s['count'], reverse=True)[:max_signatures]
+    buckets = [_bucket_set(s.pop('timestamps'), bucket_seconds) for s in ranked]
+
+    # 동시 발생 그래프의 연결 요소 (union-find)
+    parent = list(range(len(ranked)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(ranked)):
+        for j in range(i + 1, len(ranked)):
+            if _jaccard(buckets[i], buckets[j]) >= min_cooccurrence:
+                parent[find(i)] = find(j)
+
+    groups: Dict[int, List[Dict]] = {}
+    for i, signature in enumerate(ranked):
+        groups.setdefault(find(i), []).append(signature)
+
+    incidents = []
+    for members in groups.values():
+        members.sort(key=lambda s: (LEVEL_SEVERITY.get(s['level'], 3), -s['count']))
+        total_count = sum(s['count'] for s in members)
+        severity = LEVEL_SEVERITY.get(members[0]['level'], 3)
+        if len(members) == 1 and total_count < min_events and severity > 0:
+            continue
+        fingerprints = sorted(s['fingerprint'] for s in members)
+        incidents.append({
+            'incident_id': hashlib.sha1(','.join(fingerprints).encode('utf-8')).hexdigest()[:16],
+            'level': members[0]['level'],
+            'total_count': total_count,
+            'first_seen': min(s['first_seen'] for s in members),
+            'last_seen': max(s['last_seen'] for s in members),
+            'signatures': members,
+        })
+
+    incidents.sort(key=lambda inc: (LEVEL_SEVERITY.get(inc['level'], 3), -inc['total_count']))
+    return incidents
+
+def format_incident_summary(incident: Dict, max_tokens: int, app_prefixes: Sequence[str],
+                            max_traces: int = 3) -> str:
+    """인시던트 요약 텍스트 (시그니처별 건수/기간 + 대표 스택 트레이스)
+
+    시그니처 목록을 먼저 넣고, 남은 토큰 예산을 상위 max_traces개 대표 트레이스에 나눠 씁니다.
+    """
+    lines = [
+        f"기간: {incident['first_seen']} ~ {incident['last_seen']}",
+        f"총 {incident['total_count']}건, 시그니처 {len(incident['signatures'])}개",
+        "",
+        "시그니처 목록:",
+    ]
+    if incident.get('truncated'):
+        lines.insert(2, f"(로그가 많아 {incident['sampled_since']} 이전 로그는 제외하고 집계)")
+    for signature in incident['signatures']:
+        first_line = normalize_message(signature['message'].splitlines()[0] if signature['message'] else '')
+        lines.append(
+            f"- [{signature['level']}] {signature['count']}건 "
+            f"({signature['first_seen']} ~ {signature['last_seen']}): {first_line[:200]}"
+        )
+    header = '\n'.join(lines)
+
+    traces = incident['signatures'][:max_traces]
+    remaining = max_tokens - estimate_tokens(header)
+    if not traces or remaining <= 0:
+        return header
+
+    per_trace = max(remaining // len(traces), 50)
+    sections = [header, "", "대표 로그:"]
+    for signature in traces:
+        sections.append(f"[{signature['level']}] {signature['last_seen']} (응답 {signature['response_time']}ms)")
+        sections.append(compact_for_prompt(signature['message'], per_trace, app_prefixes))
+    return '\n'.join(sections)
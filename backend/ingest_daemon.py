@@ -0,0 +1,235 @@
+# 파일명: backend/ingest_daemon.py
+"""독립 수집 데몬 (python main.py ingest / collector)
+
+Streamlit 프로세스와 분리해 로그 수집과 수집 시점 부가 작업(사전 분석, 알림, 이상 탐지, 상위 지문,
+원격 에이전트 수신)을 한 프로세스에서 실행합니다. 상태는 health 파일(JSON)과 /metrics로 내보내고,
+대시보드는 health 파일을 읽어 수집 상태와 지연을 표시합니다.
+"""
+import fcntl
+import json
+import os
+import signal
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from .config import (
+    ALERT_ENABLED, ANOMALY_ENABLED, COLLECTOR_HOST, HEAVY_HITTERS_ENABLED, INGEST_HEALTH_FILE, INGEST_HEALTH_INTERVAL,
+    LOG_FILE, METRICS_HOST, METRICS_PORT,
+)
+from .event_log import EventLogger
+from .metrics import ANALYSIS_QUEUE_DEPTH, MetricsServer
+from .watermark import ingest_lag, lag_alerts
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+logger = EventLogger('daemon')
+
+class IngestDaemon:
+    """Streamlit과 분리된 독립 수집 프로세스
+
+    LogMonitor(선택적으로 샘플 LogGenerator, 사전 분석 워커, 알림 엔진, 지문별 이상 탐지,
+    실시간 상위 지문 추적)를 실행하고, health_interval마다 상태와 원본 파일별 수집 워터마크를
+    health 파일(JSON)에 기록합니다 (지연이 기준을 넘으면 경고 로그).
+    metrics_port가 0이 아니면 /metrics(Prometheus 텍스트 형식)를 제공합니다.
+    collector_port를 주면 원격 에이전트 프레임 수신기(CollectorServer)도 함께 실행하며,
+    원격 원본 파일의 워터마크도 health 파일에 포함합니다.
+    SIGTERM/SIGINT를 받으면 진행 중인 배치와 체크포인트를 저장한 뒤 종료합니다.
+    같은 health 파일로 두 번 실행되지 않도록 파일 잠금을 사용합니다.
+    """
+
+    def __init__(self, log_file: str = None, health_file: str = None,
+                 health_interval: float = INGEST_HEALTH_INTERVAL, generate: bool = False,
+                 analysis_worker: bool = True, metrics_port: int = METRICS_PORT, alerts: bool = ALERT_ENABLED,
+                 anomalies: bool = ANOMALY_ENABLED, heavy_hitters: bool = HEAVY_HITTERS_ENABLED,
+                 collector_port: int = None, collector_host: str = COLLECTOR_HOST):
+        self.log_file = log_file or LOG_FILE
+        self.health_file = health_file or INGEST_HEALTH_FILE
+        self.health_interval = health_interval
+        self.generate = generate
+        self.use_analysis_worker = analysis_worker
+        self.metrics_port = metrics_port
+        self.use_alerts = alerts
+        self.use_anomalies = anomalies
+        self.use_heavy_hitters = heavy_hitters
+        self.collector_port = collector_port
+        self.collector_host = collector_host
+        self.metrics_server = None
+        self.started_at = None
+        self.monitor = None
+        self.generator = None
+        self.worker = None
+        self.alert_engine = None
+        self.anomaly_detector = None
+        self.heavy_hitters = None
+        self.collector = None
+        self._stop = threading.Event()
+        self._lock_file = None
+        self.lag_alerts = []
+
+    def _acquire_lock(self):
+        """단일 인스턴스 잠금 (이미 실행 중이면 RuntimeError)"""
+        self._lock_file = open(self.health_file + '.lock', 'w')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            self._lock_file = None
+            raise RuntimeError(f"수집 데몬이 이미 실행 중입니다 (잠금: {self.health_file}.lock)")
+        self._lock_file.write(str(os.getpid()))
+        self._lock_file.flush()
+
+    def _release_lock(self):
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def request_stop(self, signum=None, frame=None):
+        """종료 요청 (시그널 핸들러)"""
+        self._stop.set()
+
+    def watermarks(self) -> List[Dict]:
+        """원본 파일별 워터마크 + 지연 (ingest_lag, 수집기가 있으면 원격 원본 파일 포함)"""
+        watermarks = list(self.monitor.watermarks.values()) if self.monitor else []
+        if self.collector:
+            watermarks += list(self.collector.watermarks.values())
+        now = time.time()
+        return [ingest_lag(dict(watermark), now) for watermark in watermarks]
+    
+    def check_lag(self, watermarks: List[Dict]):
+        """지연 기준 초과/회복 시 경고 로그 (상태가 바뀔 때만)"""
+        alerts = lag_alerts(watermarks)
+        if alerts and not self.lag_alerts:
+            logger.log('ingest_lag_alert', 'warning', limit=False, detail='; '.join(alerts))
+        elif self.lag_alerts and not alerts:
+            logger.log('ingest_lag_recovered', limit=False)
+        self.lag_alerts = alerts
+    
+    def health(self, status: str = 'running') -> Dict:
+        """현재 상태 스냅샷"""
+        watermarks = self.watermarks()
+        if status == 'running':
+            self.check_lag(watermarks)
+        health = {
+            'status': status,
+            'pid': os.getpid(),
+            'log_file': os.path.abspath(self.log_file),
+            'started_at': self.started_at,
+            'updated_at': datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S'),
+            'updated_epoch': time.time(),
+            'interval': self.health_interval,
+            'monitor': dict(self.monitor.stats) if self.monitor else None,
+            'generator': bool(self.generator and self.generator.generating),
+            'analysis_worker': self.worker.stats() if self.worker else None,
+            'alerts': self.alert_engine.stats() if self.alert_engine else None,
+            'anomaly_detector': self.anomaly_detector.stats() if self.anomaly_detector else None,
+            'heavy_hitters': self.heavy_hitters.stats() if self.heavy_hitters else None,
+            'collector': self.collector.summary() if self.collector else None,
+            'metrics': self.metrics_server.address if self.metrics_server else None,
+            'watermarks': watermarks,
+            'lag_alerts': self.lag_alerts,
+        }
+        return health
+
+    def write_health(self, status: str = 'running'):
+        """health 파일 원자적 갱신 (임시 파일 작성 후 교체)"""
+        temp_path = f"{self.health_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.health(status), f, ensure_ascii=False)
+        os.replace(temp_path, self.health_file)
+
+    def start(self):
+        """수집 구성 요소 시작"""
+        from .log_monitor import get_log_monitor
+
+        self._acquire_lock()
+        self.started_at = datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
+        self.monitor = get_log_monitor()
+        self.monitor.log_file = self.log_file
+
+        if self.use_analysis_worker:
+            from .analysis_worker import get_analysis_worker
+            self.worker = get_analysis_worker()
+            self.worker.start()
+            ANALYSIS_QUEUE_DEPTH.set_function(self.worker.queue_depth)
+        if self.use_alerts:
+            from .alerting import get_alert_engine
+            from .db_manager import get_db_manager
+            self.alert_engine = get_alert_engine()
+            # 이미 저장된 지문은 새 지문 알림 대상에서 제외
+            self.alert_engine.start(get_db_manager().get_distinct_fingerprints())
+        if self.use_heavy_hitters:
+            from .heavy_hitters import get_heavy_hitters
+            self.heavy_hitters = get_heavy_hitters()
+            self.heavy_hitters.start()
+        if self.metrics_port:
+            self.metrics_server = MetricsServer(METRICS_HOST, self.metrics_port).start()
+            logger.log('metrics_listening', limit=False, address=self.metrics_server.address)
+        self.monitor.start_monitoring()
+        if self.collector_port is not None:
+            from .collector import CollectorServer
+            # 로컬 수집과 같은 sink (사전 분석/알림/상위 지문 추적 공유)
+            self.collector = CollectorServer(self.collector_host, self.collector_port, sink=self.monitor.sink).start()
+        if self.use_anomalies:
+            from .anomaly import get_anomaly_detector
+            self.anomaly_detector = get_anomaly_detector()
+            self.anomaly_detector.start()
+        if self.generate:
+            from .log_generator import get_log_generator
+            self.generator = get_log_generator()
+            self.generator.log_file = self.log_file
+            self.generator.start_generating()
+        self.write_health('running')
+
+    def shutdown(self):
+        """생성/원격 수신 → 수집 → 분석/알림 순서로 중지 (수집기는 남은 배치와 체크포인트를 저장)"""
+        if self.generator:
+            self.generator.stop_generating()
+        if self.collector:
+            self.collector.stop()
+        if self.monitor:
+            self.monitor.stop_monitoring()
+        if self.worker:
+            self.worker.stop()
+        if self.alert_engine:
+            self.alert_engine.stop()
+        if self.anomaly_detector:
+            self.anomaly_detector.stop()
+        if self.heavy_hitters:
+            self.heavy_hitters.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        self.write_health('stopped')
+        self._release_lock()
+
+    def run(self):
+        """메인 스레드에서 실행 (종료 시그널까지 health 파일 갱신)"""
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        self.start()
+        try:
+            while not self._stop.wait(self.health_interval):
+                if self.monitor.monitor_thread and not self.monitor.monitor_thread.is_alive():
+                    logger.error('monitor_thread_exited')
+                    break
+                self.write_health('running')
+        finally:
+            self.shutdown()
+
+def read_health(health_file: str = None) -> Optional[Dict]:
+    """health 파일 읽기 (없으면 None)
+
+    'alive'는 상태가 running이고 마지막 갱신이 갱신 주기의 3배 이내인지 여부입니다.
+    """
+    path = health_file or INGEST_HEALTH_FILE
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            health = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    age = time.time() - health.get('updated_epoch', 0)
+    health['age_seconds'] = age
+    health['alive'] = health.get('status') == 'running' and age <= 3 * health.get('interval', INGEST_HEALTH_INTERVAL)
+    return health
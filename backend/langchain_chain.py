@@ -1,36 +1,73 @@
 # 파일명: backend/langchain_chain.py
-from langchain_openai import AzureChatOpenAI
-from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
-from langchain.schema import AIMessage
+import time
+from typing import TYPE_CHECKING, Iterator, Optional
 from .config import AZURE_OPENAI_KEY, AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_DEPLOYMENT, AZURE_OPENAI_API_VERSION, validate_azure_config
+from .config import LLM_RATE_LIMIT_RPS, LLM_RATE_LIMIT_BURST, LLM_MAX_RETRIES, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX
+from .config import PROMPT_TOKEN_BUDGET, APP_PACKAGE_PREFIXES
+from .prompt_budget import compact_for_prompt, estimate_tokens
+from .rate_limit import TokenBucket, retry_with_backoff, retry_with_backoff_async, is_retryable_error, backoff_delay
+from .lazy import LazySingleton
+
+if TYPE_CHECKING:
+    from langchain.prompts import ChatPromptTemplate
+
+# Azure OpenAI 설정 오류 안내 메시지
+CONFIG_ERROR_MESSAGE = """❌ Azure OpenAI 설정이 올바르지 않습니다.
+
+다음을 확인해주세요:
+
+1. .env 파일 설정:
+   - AZURE_OPENAI_KEY: 실제 Azure OpenAI API 키
+   - AZURE_OPENAI_ENDPOINT: https://your-resource.openai.azure.com/ 형태
+   - AZURE_OPENAI_DEPLOYMENT: 실제 배포된 모델명 (예: gpt-4, gpt-35-turbo)
+
+2. Azure OpenAI 리소스 확인:
+   - 구독이 활성화되어 있는지 확인
+   - 올바른 지역의 엔드포인트인지 확인
+   - 배포된 모델명이 정확한지 확인
+
+3. 네트워크 연결 확인:
+   - 방화벽이나 프록시 설정 확인"""
 
 class LogAnalysisChain:
     def __init__(self):
+        # 모든 LLM 호출이 공유하는 요청 속도 제한
+        self.rate_limiter = TokenBucket(LLM_RATE_LIMIT_RPS, LLM_RATE_LIMIT_BURST)
+        
         # 설정 검증
         is_valid, message = validate_azure_config()
         if not is_valid:
             print(f"⚠️ Azure OpenAI 설정 오류: {message}")
             self.llm = None
             self.prompt_template = None
+            self.incident_prompt_template = None
             return
         
         try:
+            # LangChain/OpenAI 클라이언트는 체인 생성 시점에 로드 (모듈 import 비용 없음)
+            from langchain_openai import AzureChatOpenAI
+            
             self.llm = AzureChatOpenAI(
                 azure_endpoint=AZURE_OPENAI_ENDPOINT,
                 api_key=AZURE_OPENAI_KEY,
                 api_version=AZURE_OPENAI_API_VERSION,
                 deployment_name=AZURE_OPENAI_DEPLOYMENT,
-                temperature=0.7
+                temperature=0.7,
+                max_retries=0  # 재시도는 rate_limit 백오프로 직접 처리
             )
             self.prompt_template = self._create_prompt_template()
+            self.incident_prompt_template = self._create_incident_prompt_template()
             print("✅ Azure OpenAI 연결 설정 완료")
         except Exception as e:
             print(f"❌ Azure OpenAI 초기화 오류: {e}")
             self.llm = None
             self.prompt_template = None
+            self.incident_prompt_template = None
     
-    def _create_prompt_template(self) -> ChatPromptTemplate:
+    def _create_prompt_template(self) -> "ChatPromptTemplate":
         """LangChain 프롬프트 템플릿 생성"""
+        from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+        
         system_message = SystemMessagePromptTemplate.from_template(
             """당신은 Tomcat WAS 로그 분석 전문가입니다. 
             Java 웹 애플리케이션 서버 환경에서 발생하는 다양한 에러를 분석하고 해결책을 제시하는 것이 주요 업무입니다.
@@ -63,50 +100,226 @@ class LogAnalysisChain:
         
         return ChatPromptTemplate.from_messages([system_message, human_message])
     
+    def _create_incident_prompt_template(self) -> "ChatPromptTemplate":
+        """인시던트(연관 에러 묶음) 분석 프롬프트 템플릿 생성"""
+        from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+        
+        system_message = SystemMessagePromptTemplate.from_template(
+            """당신은 Tomcat WAS 장애 분석 전문가입니다.
+            같은 시간대에 함께 발생한 여러 에러 시그니처를 하나의 장애(인시던트)로 보고 분석합니다.
+            
+            분석 시 고려사항:
+            - 시그니처 간 인과 관계 (근본 원인과 파생 증상 구분)
+            - 발생 순서와 건수 추이
+            - 커넥션 풀, 메모리, 타임아웃 등 공통 자원 고갈 여부
+            
+            응답 형식:
+            장애 요약:
+            - [한 줄 요약]
+            
+            근본 원인:
+            - [근본 원인과 근거]
+            
+            파생 증상:
+            - [근본 원인으로 발생한 에러들]
+            
+            해결 방안:
+            - [즉시 조치 및 재발 방지책]"""
+        )
+        
+        human_message = HumanMessagePromptTemplate.from_template(
+            """다음은 같은 시간대에 함께 발생한 Tomcat WAS 에러 묶음입니다:
+            
+            {summary}
+            
+            이 장애의 근본 원인과 해결 방안을 제시해주세요."""
+        )
+        
+        return ChatPromptTemplate.from_messages([system_message, human_message])
+    
+    def is_available(self) -> bool:
+        """LLM 호출 가능 여부"""
+        return self.llm is not None
+    
+    def _format_prompt(self, log_data: dict, stats: Optional[dict] = None):
+        """로그 데이터로 프롬프트 메시지 생성 (메시지는 토큰 예산에 맞게 압축)"""
+        raw_message = log_data.get('message', '')
+        values = {
+            'level': log_data.get('level', 'UNKNOWN'),
+            'response_time': log_data.get('response_time', 0),
+            'timestamp': log_data.get('timestamp', '')
+        }
+        
+        # 시스템/템플릿 토큰을 제외한 메시지 예산
+        template_tokens = self._count_prompt_tokens(self.prompt_template.format_messages(message='', **values))
+        message_budget = max(PROMPT_TOKEN_BUDGET - template_tokens, 100)
+        message = compact_for_prompt(raw_message, message_budget, APP_PACKAGE_PREFIXES)
+        
+        tokens_before = template_tokens + estimate_tokens(raw_message)
+        tokens_after = template_tokens + estimate_tokens(message)
+        if stats is not None:
+            stats['prompt_tokens_before'] = tokens_before
+            stats['prompt_tokens_after'] = tokens_after
+        if tokens_after < tokens_before:
+            print(f"✂️ 프롬프트 압축: {tokens_before} → {tokens_after} 토큰 (예산 {PROMPT_TOKEN_BUDGET})")
+        
+        return self.prompt_template.format_messages(message=message, **values)
+    
+    def _count_prompt_tokens(self, messages) -> int:
+        """프롬프트 메시지 목록의 추정 토큰 수"""
+        return sum(estimate_tokens(message.content) for message in messages)
+    
     def analyze_log(self, log_data: dict) -> str:
         """로그 분석 실행"""
         # Azure OpenAI 설정 확인
         if self.llm is None:
-            return """❌ Azure OpenAI 설정이 올바르지 않습니다.
-
-다음을 확인해주세요:
-
-1. .env 파일 설정:
-   - AZURE_OPENAI_KEY: 실제 Azure OpenAI API 키
-   - AZURE_OPENAI_ENDPOINT: https://your-resource.openai.azure.com/ 형태
-   - AZURE_OPENAI_DEPLOYMENT: 실제 배포된 모델명 (예: gpt-4, gpt-35-turbo)
-
-2. Azure OpenAI 리소스 확인:
-   - 구독이 활성화되어 있는지 확인
-   - 올바른 지역의 엔드포인트인지 확인
-   - 배포된 모델명이 정확한지 확인
-
-3. 네트워크 연결 확인:
-   - 방화벽이나 프록시 설정 확인"""
+            return CONFIG_ERROR_MESSAGE
         
         try:
-            # 프롬프트 생성
-            formatted_prompt = self.prompt_template.format_messages(
-                level=log_data.get('level', 'UNKNOWN'),
-                message=log_data.get('message', ''),
-                response_time=log_data.get('response_time', 0),
-                timestamp=log_data.get('timestamp', '')
-            )
-            
+            return self.run_analysis(log_data)
+                
+        except Exception as e:
+            return self.format_error(e)
+    
+    def run_analysis(self, log_data: dict, stats: Optional[dict] = None) -> str:
+        """로그 분석 LLM 호출 (429/5xx는 백오프 재시도, 최종 오류는 예외로 전달)"""
+        # 프롬프트 생성
+        formatted_prompt = self._format_prompt(log_data, stats)
+        return self._invoke_with_retry(formatted_prompt, stats)
+    
+    def run_incident_analysis(self, summary: str, stats: Optional[dict] = None) -> str:
+        """인시던트 요약 분석 LLM 호출 (인시던트당 1회)"""
+        formatted_prompt = self.incident_prompt_template.format_messages(summary=summary)
+        if stats is not None:
+            stats['prompt_tokens_after'] = self._count_prompt_tokens(formatted_prompt)
+        return self._invoke_with_retry(formatted_prompt, stats)
+    
+    def _invoke_with_retry(self, formatted_prompt, stats: Optional[dict] = None) -> str:
+        """속도 제한 + 백오프 재시도로 LLM 호출 (stats에 total_ms와 토큰 수 기록)"""
+        def invoke():
+            self.rate_limiter.acquire()
             # LLM 호출 (invoke 메서드 사용)
-            response = self.llm.invoke(formatted_prompt)
+            return self.llm.invoke(formatted_prompt)
+        
+        from langchain.schema import AIMessage
+        
+        start_time = time.perf_counter()
+        try:
+            response = retry_with_backoff(invoke, LLM_MAX_RETRIES, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX, stats)
+        finally:
+            if stats is not None:
+                stats['total_ms'] = (time.perf_counter() - start_time) * 1000
+        
+        content = response.content if isinstance(response, AIMessage) else str(response)
+        self._record_usage(stats, content, getattr(response, 'usage_metadata', None),
+                           getattr(response, 'response_metadata', None))
+        return content
+    
+    def _record_usage(self, stats: Optional[dict], content: str, usage_metadata: Optional[dict] = None,
+                      response_metadata: Optional[dict] = None):
+        """응답의 토큰 사용량 기록 (API가 주지 않으면 로컬 추정치 사용)"""
+        if stats is None:
+            return
+        usage_metadata = usage_metadata or {}
+        token_usage = (response_metadata or {}).get('token_usage') or {}
+        stats['prompt_tokens'] = (usage_metadata.get('input_tokens') or token_usage.get('prompt_tokens')
+                                  or stats.get('prompt_tokens_after'))
+        stats['completion_tokens'] = (usage_metadata.get('output_tokens') or token_usage.get('completion_tokens')
+                                      or estimate_tokens(content))
+    
+    async def arun_analysis(self, log_data: dict, stats: Optional[dict] = None) -> str:
+        """run_analysis의 비동기 버전 (일괄 분석용)"""
+        formatted_prompt = self._format_prompt(log_data, stats)
+        
+        async def ainvoke():
+            await self.rate_limiter.acquire_async()
+            return await self.llm.ainvoke(formatted_prompt)
+        
+        from langchain.schema import AIMessage
+        
+        start_time = time.perf_counter()
+        try:
+            response = await retry_with_backoff_async(
+                ainvoke, LLM_MAX_RETRIES, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX, stats
+            )
+        finally:
+            if stats is not None:
+                stats['total_ms'] = (time.perf_counter() - start_time) * 1000
+        
+        content = response.content if isinstance(response, AIMessage) else str(response)
+        self._record_usage(stats, content, getattr(response, 'usage_metadata', None),
+                           getattr(response, 'response_metadata', None))
+        return content
+    
+    def stream_analyze_log(self, log_data: dict, stats: Optional[dict] = None) -> Iterator[str]:
+        """로그 분석 스트리밍 실행 (토큰이 도착하는 대로 yield)
+        
+        stats dict가 전달되면 ttft_ms(첫 토큰까지 시간), total_ms(전체 시간),
+        chunks(수신 청크 수), error(오류 클래스명)를 기록합니다.
+        """
+        stats = stats if stats is not None else {}
+        
+        # Azure OpenAI 설정 확인
+        if self.llm is None:
+            stats['error'] = 'ConfigError'
+            yield CONFIG_ERROR_MESSAGE
+            return
+        
+        start_time = time.perf_counter()
+        stats['chunks'] = 0
+        contents = []
+        usage_metadata = {}
+        
+        try:
+            formatted_prompt = self._format_prompt(log_data, stats)
+            attempt = 0
             
-            if isinstance(response, AIMessage):
-                return response.content
-            else:
-                return str(response)
+            while True:
+                try:
+                    self.rate_limiter.acquire()
+                    for chunk in self.llm.stream(formatted_prompt):
+                        # 사용량은 보통 마지막 청크에 포함 (서버가 지원하는 경우)
+                        usage_metadata = getattr(chunk, 'usage_metadata', None) or usage_metadata
+                        content = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                        if not content:
+                            continue
+                        
+                        if 'ttft_ms' not in stats:
+                            stats['ttft_ms'] = (time.perf_counter() - start_time) * 1000
+                        stats['chunks'] += 1
+                        contents.append(content)
+                        yield content
+                    
+                    self._record_usage(stats, ''.join(contents), usage_metadata)
+                    break
+                    
+                except Exception as e:
+                    # 첫 토큰 수신 전 429/5xx만 재시도 (부분 응답 후에는 재시도하지 않음)
+                    if stats['chunks'] or attempt >= LLM_MAX_RETRIES or not is_retryable_error(e):
+                        raise
+                    delay = backoff_delay(attempt, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX, e)
+                    attempt += 1
+                    stats['retries'] = attempt
+                    print(f"⏳ LLM 스트리밍 재시도 {attempt}/{LLM_MAX_RETRIES} ({type(e).__name__}, {delay:.1f}초 후)")
+                    time.sleep(delay)
                 
         except Exception as e:
-            error_message = str(e)
-            
-            # 구체적인 오류 메시지 제공
-            if "401" in error_message:
-                return """❌ 인증 오류 (401):
+            stats['error'] = type(e).__name__
+            # 일부 응답을 이미 받은 경우 구분해서 오류 표시
+            yield ("\n\n" if stats['chunks'] else "") + self.format_error(e)
+        
+        finally:
+            stats['total_ms'] = (time.perf_counter() - start_time) * 1000
+            if 'ttft_ms' in stats:
+                print(f"⏱️ 스트리밍 분석: 첫 토큰 {stats['ttft_ms']:.0f}ms / 전체 {stats['total_ms']:.0f}ms")
+    
+    def format_error(self, e: Exception) -> str:
+        """LLM 호출 오류를 사용자 안내 메시지로 변환"""
+        error_message = str(e)
+        
+        # 구체적인 오류 메시지 제공
+        if "401" in error_message:
+            return """❌ 인증 오류 (401):
 
 문제: API 키 또는 엔드포인트가 올바르지 않습니다.
 
@@ -115,9 +328,9 @@ class LogAnalysisChain:
 2. Azure Portal에서 API 키 재생성
 3. AZURE_OPENAI_ENDPOINT URL 확인 (예: https://your-resource.openai.azure.com/)
 4. 구독이 활성 상태인지 확인"""
-            
-            elif "404" in error_message:
-                return """❌ 리소스를 찾을 수 없음 (404):
+        
+        elif "404" in error_message:
+            return """❌ 리소스를 찾을 수 없음 (404):
 
 문제: 배포명 또는 엔드포인트가 잘못되었습니다.
 
@@ -125,18 +338,18 @@ class LogAnalysisChain:
 1. AZURE_OPENAI_DEPLOYMENT 이름 확인
 2. Azure Portal에서 실제 배포된 모델명 확인
 3. 엔드포인트 URL이 정확한지 확인"""
-            
-            elif "429" in error_message:
-                return """❌ 요청 한도 초과 (429):
+        
+        elif "429" in error_message:
+            return """❌ 요청 한도 초과 (429):
 
 문제: API 호출 한도를 초과했습니다.
 
 해결 방법:
 1. 잠시 후 다시 시도
 2. 구독 플랜 확인 및 업그레이드 고려"""
-            
-            else:
-                return f"""❌ 분석 중 오류가 발생했습니다:
+        
+        else:
+            return f"""❌ 분석 중 오류가 발생했습니다:
 
 오류 내용: {error_message}
 
@@ -145,5 +358,11 @@ class LogAnalysisChain:
 2. Azure OpenAI 서비스 상태 확인
 3. API 키와 엔드포인트 재확인"""
 
-# 전역 인스턴스
-log_analysis_chain = LogAnalysisChain()
\ No newline at end of file
+# 전역 인스턴스 (첫 분석 요청 시 LangChain 로드 및 생성)
+get_log_analysis_chain = LazySingleton(LogAnalysisChain)
+
+def __getattr__(name):
+    # 기존 `from .langchain_chain import log_analysis_chain` 호환 (첫 접근 시 생성)
+    if name == 'log_analysis_chain':
+        return get_log_analysis_chain()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,30 @@
+# 파일명: backend/lazy.py
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+class LazySingleton(Generic[T]):
+    """첫 호출 시 한 번만 생성되는 전역 인스턴스 (스레드 안전)
+
+    모듈 로드 시점에 DB 초기화나 LLM 클라이언트 생성 비용을 치르지 않도록,
+    `get_x = LazySingleton(X)` 형태로 정의하고 사용하는 시점에 `get_x()`를 호출합니다.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> T:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    def is_created(self) -> bool:
+        """인스턴스 생성 여부"""
+        return self._instance is not None
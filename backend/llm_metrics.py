@@ -0,0 +1,99 @@
+# 파일명: backend/llm_metrics.py
+import sqlite3
+import time
+from typing import Dict, Optional
+import numpy as np
+from .config import DB_PATH, LLM_METRICS_RETENTION
+from .lazy import LazySingleton
+
+class LLMMetrics:
+    """AI 분석 호출 계측 (SQLite llm_calls 테이블)
+
+    호출마다 지연 시간, 첫 토큰 시간, 프롬프트/응답 토큰 수, 캐시 적중 여부,
+    재시도 횟수, 오류 클래스를 저장하고 최근 구간 요약을 제공합니다.
+    """
+
+    def __init__(self, db_path: str = None, retention_seconds: int = LLM_METRICS_RETENTION):
+        self.db_path = db_path or DB_PATH
+        self.retention_seconds = retention_seconds
+        self._last_cleanup = 0.0
+        self.init_database()
+
+    def init_database(self):
+        """계측 테이블 생성"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS llm_calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at REAL NOT NULL,
+                    kind TEXT NOT NULL,
+                    fingerprint TEXT,
+                    cache_hit INTEGER NOT NULL DEFAULT 0,
+                    latency_ms REAL,
+                    ttft_ms REAL,
+                    prompt_tokens INTEGER,
+                    completion_tokens INTEGER,
+                    retries INTEGER NOT NULL DEFAULT 0,
+                    error TEXT
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_llm_calls_created_at ON llm_calls (created_at)')
+            conn.commit()
+
+    def record(self, kind: str, stats: Dict, fingerprint: Optional[str] = None):
+        """분석 호출 1건 기록 (stats는 체인/분석기가 채운 호출 통계)"""
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO llm_calls
+                    (created_at, kind, fingerprint, cache_hit, latency_ms, ttft_ms,
+                     prompt_tokens, completion_tokens, retries, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (now, kind, fingerprint, int(bool(stats.get('cache_hit'))), stats.get('total_ms'),
+                  stats.get('ttft_ms'), stats.get('prompt_tokens'), stats.get('completion_tokens'),
+                  stats.get('retries', 0), stats.get('error')))
+
+            # 보존 기간이 지난 기록은 1시간에 한 번 정리
+            if now - self._last_cleanup > 3600:
+                cursor.execute('DELETE FROM llm_calls WHERE created_at < ?', (now - self.retention_seconds,))
+                self._last_cleanup = now
+            conn.commit()
+
+    def summary(self, window_seconds: int = 3600) -> Dict:
+        """최근 구간 요약 (LLM 호출 지연 p50/p95, 시간당 토큰, 캐시 적중률, 오류/재시도 수)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT cache_hit, latency_ms, ttft_ms, prompt_tokens, completion_tokens, retries, error
+                FROM llm_calls
+                WHERE created_at >= ?
+            ''', (time.time() - window_seconds,))
+            rows = cursor.fetchall()
+
+        calls = len(rows)
+        cache_hits = sum(row[0] for row in rows)
+        llm_rows = [row for row in rows if not row[0]]
+        latencies = np.array([row[1] for row in llm_rows if row[1] is not None and row[6] is None], dtype=float)
+        ttfts = np.array([row[2] for row in llm_rows if row[2] is not None], dtype=float)
+        prompt_tokens = sum(row[3] or 0 for row in llm_rows)
+        completion_tokens = sum(row[4] or 0 for row in llm_rows)
+        hours = window_seconds / 3600
+
+        return {
+            'calls': calls,
+            'llm_calls': len(llm_rows),
+            'cache_hit_rate': cache_hits / calls if calls else 0.0,
+            'p50_latency_ms': float(np.percentile(latencies, 50)) if latencies.size else None,
+            'p95_latency_ms': float(np.percentile(latencies, 95)) if latencies.size else None,
+            'p50_ttft_ms': float(np.percentile(ttfts, 50)) if ttfts.size else None,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'tokens_per_hour': (prompt_tokens + completion_tokens) / hours,
+            'retries': sum(row[5] for row in llm_rows),
+            'errors': sum(1 for row in llm_rows if row[6] is not None),
+        }
+
+# 전역 인스턴스 (첫 사용 시 테이블 생성)
+get_llm_metrics = LazySingleton(LLMMetrics)
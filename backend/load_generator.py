@@ -0,0 +1,285 @@
+# 파일명: backend/load_generator.py
+"""수집 파이프라인 부하 생성기 (LogMonitor + DatabaseManager 최대 처리량 측정용)
+
+목표 초당 이벤트 수, 버스트 구간, 레벨 비율, 스택 트레이스 깊이 분포를 지정해
+여러 writer 프로세스가 로그 파일에 동시에 기록하고, 달성한 기록 속도와
+이벤트 시각(로그 줄 타임스탬프) 대비 DB 수집 시각(created_at) 지연을 보고합니다.
+"""
+import multiprocessing
+import os
+import random
+import re
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+KST = timezone(timedelta(hours=9))
+
+DEFAULT_LEVEL_MIX = {'ERROR': 0.6, 'FATAL': 0.05, 'Exception': 0.25, 'INFO': 0.1}
+
+# 레벨별 첫 줄 (INFO는 에러 패턴에 걸리지 않으므로 모니터의 필터링 비용만 발생)
+HEADLINES = {
+    'ERROR': [
+        'java.sql.SQLException: Connection is not available, request timed out',
+        'java.lang.IllegalStateException: Order state transition rejected',
+        'java.util.concurrent.TimeoutException: Upstream call exceeded deadline',
+    ],
+    'FATAL': [
+        'FATAL: Database connection pool exhausted - no available connections',
+        'FATAL: java.lang.OutOfMemoryError: Java heap space',
+    ],
+    'Exception': [
+        'IllegalArgumentException: Invalid request parameter',
+        'ConcurrentModificationException in thread pool executor',
+    ],
+    'INFO': [
+        'Request handled',
+        'Cache refreshed',
+    ],
+}
+
+# 스택 프레임 (에러 패턴 키워드를 포함하지 않도록 구성)
+APP_FRAMES = [
+    'com.example.service.OrderService.process(OrderService.java:{line})',
+    'com.example.service.PaymentService.charge(PaymentService.java:{line})',
+    'com.example.repository.ProductRepository.findById(ProductRepository.java:{line})',
+    'com.example.controller.OrderController.create(OrderController.java:{line})',
+]
+FRAMEWORK_FRAMES = [
+    'org.springframework.web.method.support.InvocableHandlerMethod.invoke(InvocableHandlerMethod.java:{line})',
+    'org.springframework.web.servlet.FrameworkServlet.service(FrameworkServlet.java:{line})',
+    'org.apache.catalina.core.ApplicationFilterChain.doFilter(ApplicationFilterChain.java:{line})',
+    'org.apache.tomcat.util.threads.TaskThread$WrappingRunnable.run(TaskThread.java:{line})',
+]
+
+_TIMESTAMP_PATTERN = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?)\]')
+
+
+def parse_level_mix(spec: str) -> Dict[str, float]:
+    """'ERROR=0.6,FATAL=0.05,INFO=0.35' 형식의 레벨 비율 파싱"""
+    mix = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        level, _, weight = item.partition('=')
+        level = level.strip()
+        if level not in HEADLINES:
+            raise ValueError(f"지원하지 않는 레벨: {level} (가능: {', '.join(HEADLINES)})")
+        mix[level] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("레벨 비율이 비어 있습니다")
+    return mix
+
+
+class LoadProfile:
+    """부하 프로파일
+
+    eps: 전체 목표 초당 이벤트 수 (writer 수로 균등 분배)
+    burst_factor / burst_every / burst_length: burst_every초마다 burst_length초 동안 eps × burst_factor
+    stack_depth: 'fixed' | 'uniform' | 'exponential' 분포로 평균 stack_depth_mean, 최대 stack_depth_max
+    """
+
+    def __init__(self, eps: float = 100, duration: float = 30, writers: int = 1,
+                 level_mix: Optional[Dict[str, float]] = None, stack_depth_mean: float = 6,
+                 stack_depth_max: int = 40, stack_depth: str = 'exponential', burst_factor: float = 1.0,
+                 burst_every: float = 0, burst_length: float = 0, seed: Optional[int] = None):
+        self.eps = eps
+        self.duration = duration
+        self.writers = max(1, writers)
+        self.level_mix = level_mix or dict(DEFAULT_LEVEL_MIX)
+        self.stack_depth_mean = stack_depth_mean
+        self.stack_depth_max = stack_depth_max
+        self.stack_depth = stack_depth
+        self.burst_factor = burst_factor
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.seed = seed
+
+    def rate_at(self, elapsed: float) -> float:
+        """경과 시간 기준 전체 목표 속도 (events/s)"""
+        if self.burst_every > 0 and self.burst_length > 0 and elapsed % self.burst_every < self.burst_length:
+            return self.eps * self.burst_factor
+        return self.eps
+
+    def sample_depth(self, rng: random.Random) -> int:
+        if self.stack_depth == 'fixed':
+            depth = self.stack_depth_mean
+        elif self.stack_depth == 'uniform':
+            depth = rng.uniform(0, 2 * self.stack_depth_mean)
+        else:
+            depth = rng.expovariate(1 / self.stack_depth_mean) if self.stack_depth_mean > 0 else 0
+        return max(0, min(self.stack_depth_max, int(round(depth))))
+
+
+def build_event(rng: random.Random, level: str, depth: int, run_id: str, writer: int, seq: int) -> str:
+    """`[ts] LEVEL: 메시지 [Nms]` + 스택 프레임 depth줄 형식의 이벤트 (KST 밀리초 타임스탬프)"""
+    timestamp = datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    headline = rng.choice(HEADLINES[level])
+    lines = [f"[{timestamp}] {level}: {headline} (load {run_id} w{writer} #{seq}) [{rng.randint(5, 5000)}ms]"]
+    for index in range(depth):
+        # 앞쪽은 애플리케이션 프레임, 뒤쪽은 프레임워크 프레임
+        frames = APP_FRAMES if index < max(1, depth // 3) else FRAMEWORK_FRAMES
+        lines.append('\tat ' + rng.choice(frames).format(line=rng.randint(10, 900)))
+    return '\n'.join(lines) + '\n'
+
+
+def _writer_process(profile: LoadProfile, log_file: str, run_id: str, writer: int, start_at: float, results):
+    """writer 프로세스: 10ms 틱마다 목표 누적 개수만큼 이벤트를 모아 한 번의 append로 기록"""
+    rng = random.Random(None if profile.seed is None else profile.seed + writer)
+    levels = list(profile.level_mix)
+    weights = [profile.level_mix[level] for level in levels]
+    counts = {level: 0 for level in levels}
+    share = 1 / profile.writers
+    sent = 0
+    due = 0.0
+    behind_ticks = 0
+
+    fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        time.sleep(max(0.0, start_at - time.time()))
+        started = time.perf_counter()
+        last = started
+        while True:
+            now = time.perf_counter()
+            elapsed = now - started
+            if elapsed >= profile.duration:
+                break
+            due += profile.rate_at(elapsed) * share * (now - last)
+            last = now
+
+            batch = []
+            while sent < int(due):
+                level = rng.choices(levels, weights)[0]
+                batch.append(build_event(rng, level, profile.sample_depth(rng), run_id, writer, sent))
+                counts[level] += 1
+                sent += 1
+            if batch:
+                os.write(fd, ''.join(batch).encode('utf-8'))
+
+            # 틱 안에 목표량을 다 쓰지 못하면 writer 자체가 병목
+            spare = 0.01 - (time.perf_counter() - now)
+            if spare > 0:
+                time.sleep(spare)
+            else:
+                behind_ticks += 1
+        elapsed = time.perf_counter() - started
+    finally:
+        os.close(fd)
+
+    results.put({'writer': writer, 'sent': sent, 'counts': counts,
+                 'elapsed_s': elapsed, 'behind_ticks': behind_ticks})
+
+
+def _to_epoch(value: str) -> float:
+    return datetime.fromisoformat(value).replace(tzinfo=KST).timestamp()
+
+
+def collect_ingest_lag(db_path: str, run_id: str) -> List[tuple]:
+    """이번 실행에서 수집된 행의 (이벤트 시각, 수집 시각) epoch 목록"""
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            'SELECT message, created_at FROM error_logs WHERE message LIKE ?', (f'%(load {run_id} %',)
+        ).fetchall()
+    pairs = []
+    for message, created_at in rows:
+        match = _TIMESTAMP_PATTERN.match(message)
+        if match and created_at:
+            pairs.append((_to_epoch(match.group(1)), _to_epoch(created_at)))
+    return pairs
+
+
+def run_load_test(profile: LoadProfile, log_file: str, db_path: str, monitor=None,
+                  drain_timeout: float = 30.0) -> Dict:
+    """writer 프로세스로 부하를 생성하고 수집 완료까지 기다린 뒤 결과 집계
+
+    monitor가 주어지면 부하 시작 전에 모니터링을 켜고 종료 후 끕니다
+    (None이면 외부에서 이미 동작 중인 수집기를 측정).
+    """
+    run_id = uuid.uuid4().hex[:8]
+    os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+    open(log_file, 'a').close()
+
+    if monitor is not None:
+        monitor.start_monitoring()
+        time.sleep(0.5)  # 모니터가 파일 끝으로 이동할 때까지 대기
+
+    results = multiprocessing.Queue()
+    start_at = time.time() + 0.2
+    processes = [
+        multiprocessing.Process(target=_writer_process, args=(profile, log_file, run_id, i, start_at, results),
+                                daemon=True)
+        for i in range(profile.writers)
+    ]
+    for process in processes:
+        process.start()
+    writer_results = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    write_done = time.time()
+
+    counts: Dict[str, int] = {}
+    for result in writer_results:
+        for level, count in result['counts'].items():
+            counts[level] = counts.get(level, 0) + count
+    sent = sum(result['sent'] for result in writer_results)
+    write_elapsed = max(result['elapsed_s'] for result in writer_results)
+    expected = sum(count for level, count in counts.items() if level != 'INFO')
+
+    # 수집이 끝나거나 더 이상 진행되지 않을 때까지 대기
+    pairs = collect_ingest_lag(db_path, run_id)
+    last_progress = time.time()
+    while len(pairs) < expected and time.time() - write_done < drain_timeout:
+        time.sleep(0.5)
+        previous = len(pairs)
+        pairs = collect_ingest_lag(db_path, run_id)
+        if len(pairs) > previous:
+            last_progress = time.time()
+        elif time.time() - last_progress > 5:
+            break
+
+    if monitor is not None:
+        monitor.stop_monitoring()
+
+    lags = np.array([(ingested - event) * 1000 for event, ingested in pairs], dtype=float)
+    ingest_span = (max(p[1] for p in pairs) - min(p[0] for p in pairs)) if pairs else 0.0
+
+    def lag_percentile(q):
+        return round(float(np.percentile(lags, q)), 1) if lags.size else None
+
+    return {
+        'run_id': run_id,
+        'target_eps': profile.eps,
+        'writers': profile.writers,
+        'duration_s': profile.duration,
+        'sent': sent,
+        'sent_by_level': counts,
+        'achieved_eps': round(sent / write_elapsed, 1) if write_elapsed else None,
+        'writer_behind_ticks': sum(result['behind_ticks'] for result in writer_results),
+        'expected_rows': expected,
+        'ingested_rows': len(pairs),
+        'ingest_eps': round(len(pairs) / ingest_span, 1) if ingest_span else None,
+        'drain_s': round(max(0.0, max(p[1] for p in pairs) - write_done), 2) if pairs else None,
+        'lag_p50_ms': lag_percentile(50),
+        'lag_p95_ms': lag_percentile(95),
+        'lag_p99_ms': lag_percentile(99),
+        'lag_max_ms': round(float(lags.max()), 1) if lags.size else None,
+    }
+
+
+def format_report(result: Dict) -> str:
+    lines = [
+        f"=== 부하 테스트 {result['run_id']} (목표 {result['target_eps']} eps, writer {result['writers']}개, "
+        f"{result['duration_s']}초) ===",
+        f"기록: {result['sent']}건, {result['achieved_eps']} eps "
+        f"(지연된 틱 {result['writer_behind_ticks']}회) - " +
+        ', '.join(f"{level} {count}" for level, count in result['sent_by_level'].items()),
+        f"수집: {result['ingested_rows']}/{result['expected_rows']}건, {result['ingest_eps']} eps, "
+        f"기록 종료 후 {result['drain_s']}초 추가 소요",
+        f"수집 지연: p50 {result['lag_p50_ms']}ms  p95 {result['lag_p95_ms']}ms  "
+        f"p99 {result['lag_p99_ms']}ms  max {result['lag_max_ms']}ms",
+    ]
+    return '\n'.join(lines)
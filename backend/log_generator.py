@@ -2,16 +2,82 @@
 import threading
 import time
 import random
-from datetime import datetime
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, Optional, Tuple
 from .config import LOG_FILE, LOG_GENERATION_INTERVAL
-from .db_manager import db_manager
+from .event_log import EventLogger
+from .metrics import GENERATED_EVENTS
+from .lazy import LazySingleton
+
+KST = timezone(timedelta(hours=9))
+
+logger = EventLogger('generator')
+
+# 재생 시 인식하는 로그 줄 타임스탬프 형식 (앞에서부터 검사)
+_TIMESTAMP_FORMATS = [
+    # [2025-08-05 12:47:57.123] ERROR: ... (LogGenerator 형식)
+    (re.compile(r'^\[(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?)\]'), 'iso'),
+    # 05-Aug-2025 12:47:57.123 SEVERE [main] ... (catalina.out 형식)
+    (re.compile(r'^(\d{2}-[A-Z][a-z]{2}-\d{4} \d{2}:\d{2}:\d{2}(?:\.\d+)?)'), 'catalina'),
+    # 2025-08-05 12:47:57,123 ERROR ... (log4j/logback 형식)
+    (re.compile(r'^(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?)'), 'iso'),
+    # ERROR: ... | timestamp=2025-08-05 12:47:57
+    (re.compile(r'timestamp=(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?)'), 'iso'),
+    # ERROR: Simulated error at 1754365127.524694 (epoch 초)
+    (re.compile(r'\bat (\d{10}(?:\.\d+)?)\s*$'), 'epoch'),
+]
+
+
+def parse_line_timestamp(line: str) -> Optional[float]:
+    """로그 줄의 타임스탬프를 epoch 초로 변환 (시간대 없는 값은 KST, 인식 못 하면 None)"""
+    for pattern, kind in _TIMESTAMP_FORMATS:
+        match = pattern.search(line)
+        if not match:
+            continue
+        value = match.group(1)
+        try:
+            if kind == 'epoch':
+                return float(value)
+            if kind == 'catalina':
+                parsed = datetime.strptime(value.split('.')[0], '%d-%b-%Y %H:%M:%S')
+                if '.' in value:
+                    parsed = parsed.replace(microsecond=int(value.split('.')[1][:6].ljust(6, '0')))
+            else:
+                parsed = datetime.fromisoformat(value.replace(',', '.').replace('T', ' '))
+        except ValueError:
+            continue
+        return parsed.replace(tzinfo=KST).timestamp()
+    return None
+
+
+def iter_timed_events(source: str) -> Iterator[Tuple[Optional[float], str]]:
+    """원본 파일을 (타임스탬프, 이벤트 텍스트)로 순회
+
+    타임스탬프가 없는 줄(스택 프레임 등)은 앞 이벤트에 붙여 한 번에 기록합니다.
+    """
+    pending_ts, pending = None, []
+    with open(source, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            ts = parse_line_timestamp(line)
+            if ts is not None and pending:
+                yield pending_ts, ''.join(pending)
+                pending = []
+            if ts is not None or not pending:
+                pending_ts = ts
+            pending.append(line if line.endswith('\n') else line + '\n')
+    if pending:
+        yield pending_ts, ''.join(pending)
+
 
 class LogGenerator:
     def __init__(self):
         self.log_file = LOG_FILE
-        self.db = db_manager
         self.generating = False
         self.generator_thread = None
+        self.replaying = False
+        self.replay_thread = None
+        self.replay_stats: Dict = {}
         
         # 샘플 에러 메시지 (더 상세하고 현실적인 에러 메시지)
         self.sample_errors = [
@@ -52,14 +118,14 @@ class LogGenerator:
             self.generating = True
             self.generator_thread = threading.Thread(target=self._generation_loop, daemon=True)
             self.generator_thread.start()
-            print("샘플 로그 생성 시작")
+            logger.log('generator_started', limit=False, file=self.log_file)
     
     def stop_generating(self):
         """샘플 로그 생성 중지"""
         self.generating = False
         if self.generator_thread:
             self.generator_thread.join(timeout=1)
-        print("샘플 로그 생성 중지")
+        logger.log('generator_stopped', limit=False)
     
     def _generation_loop(self):
         """주기적으로 샘플 로그 생성"""
@@ -68,7 +134,7 @@ class LogGenerator:
                 self._generate_random_error()
                 time.sleep(LOG_GENERATION_INTERVAL)
             except Exception as e:
-                print(f"로그 생성 오류: {e}")
+                logger.error('generator_error', error=str(e))
                 time.sleep(1)
     
     def _generate_random_error(self):
@@ -82,29 +148,98 @@ class LogGenerator:
             # 랜덤 응답시간 생성 (100ms ~ 5000ms)
             response_time = random.randint(100, 5000)
             
-            # 현재 시간을 정확히 사용
-            current_time = datetime.now()
+            # 현재 시간을 정확히 사용 (파서가 시간대 없는 값을 KST로 읽으므로 호스트 시간대와 무관하게 KST)
+            current_time = datetime.now(KST)
             timestamp = current_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # 밀리초까지
             
             # 로그 포맷 생성 (현재 시간 사용)
             log_line = f"[{timestamp}] {level}: {message} [{response_time}ms]"
             
-            # 파일에 기록
+            # 파일에만 기록 (DB 저장은 파일을 수집하는 LogMonitor가 담당)
             with open(self.log_file, 'a', encoding='utf-8') as f:
                 f.write(log_line + '\n')
                 f.flush()
             
-            # DB에 직접 저장 (현재 시간으로 저장)
-            self.db.insert_log(
-                level=level,
-                message=message,
-                response_time=response_time
-            )
-            
-            print(f"[{current_time.strftime('%H:%M:%S')}] 샘플 로그 생성: {level} - {message[:50]}...")
+            GENERATED_EVENTS.inc()
+            logger.info('sample_generated', severity=level, message=message.split('\n', 1)[0][:50])
             
         except Exception as e:
-            print(f"로그 생성 중 오류: {e}")
+            logger.error('generator_error', error=str(e))
+
+    def replay(self, source: str, target: str = None, speed: Optional[float] = 1.0,
+               max_gap: Optional[float] = None, loop: bool = False) -> Dict:
+        """기존 로그 파일을 원래 이벤트 간격대로 target(기본: LOG_FILE)에 다시 기록
+
+        speed는 배속 (1, 10 ...), None 또는 0이면 대기 없이 최대 속도로 기록합니다.
+        max_gap(초)을 주면 원본의 긴 공백 구간을 그 길이로 줄입니다.
+        stop_replay() 호출 시 중단하며 기록 통계를 반환합니다.
+        """
+        target = target or self.log_file
+        self.replaying = True
+        stats = self.replay_stats = {
+            'source': source, 'target': target, 'speed': speed or 'max',
+            'events': 0, 'bytes': 0, 'passes': 0, 'max_delay_ms': 0.0,
+        }
+        started = time.perf_counter()
+
+        with open(target, 'a', encoding='utf-8') as out:
+            while self.replaying:
+                # 원본 시각 → 재생 시각 대응 (간격 누적, 역행하는 시각은 0 간격)
+                replay_offset, previous_ts = 0.0, None
+                pass_started = time.perf_counter()
+                for ts, event in iter_timed_events(source):
+                    if not self.replaying:
+                        break
+                    if ts is not None:
+                        if previous_ts is not None:
+                            gap = max(0.0, ts - previous_ts)
+                            replay_offset += min(gap, max_gap) if max_gap is not None else gap
+                        previous_ts = ts
+                    if speed:
+                        delay = pass_started + replay_offset / speed - time.perf_counter()
+                        if delay > 0:
+                            out.flush()
+                            time.sleep(delay)
+                        else:
+                            stats['max_delay_ms'] = max(stats['max_delay_ms'], -delay * 1000)
+                    out.write(event)
+                    GENERATED_EVENTS.inc()
+                    stats['events'] += 1
+                    stats['bytes'] += len(event)
+                out.flush()
+                stats['passes'] += 1
+                if not loop:
+                    break
+
+        self.replaying = False
+        elapsed = time.perf_counter() - started
+        stats['elapsed_s'] = round(elapsed, 2)
+        stats['events_per_sec'] = round(stats['events'] / elapsed, 1) if elapsed else None
+        return stats
+
+    def start_replay(self, source: str, target: str = None, speed: Optional[float] = 1.0,
+                     max_gap: Optional[float] = None, loop: bool = False):
+        """백그라운드 스레드에서 로그 파일 재생 시작"""
+        if not self.replaying:
+            self.replay_thread = threading.Thread(
+                target=self.replay, args=(source, target, speed, max_gap, loop), daemon=True
+            )
+            self.replaying = True
+            self.replay_thread.start()
+            logger.log('replay_started', limit=False, source=source, speed=speed or 'max')
+
+    def stop_replay(self):
+        """로그 재생 중지"""
+        self.replaying = False
+        if self.replay_thread:
+            self.replay_thread.join(timeout=1)
+        logger.log('replay_stopped', limit=False, **self.replay_stats)
+
+# 전역 인스턴스 (첫 사용 시 생성)
+get_log_generator = LazySingleton(LogGenerator)
 
-# 전역 인스턴스
-log_generator = LogGenerator()
\ No newline at end of file
+def __getattr__(name):
+    # 기존 `from .log_generator import log_generator` 호환 (첫 접근 시 생성)
+    if name == 'log_generator':
+        return get_log_generator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
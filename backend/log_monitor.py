@@ -3,16 +3,81 @@ import threading
 import time
 import os
 import re
-from typing import Optional
-from .db_manager import db_manager
-from .config import LOG_FILE
+from typing import Dict, List, Optional
+from .db_manager import get_db_manager
+from .analysis_worker import get_analysis_worker
+from .alerting import get_alert_engine
+from .fingerprint import message_fingerprint
+from .heavy_hitters import get_heavy_hitters
+from .lazy import LazySingleton
+from .config import LOG_FILE, INGEST_BATCH_SIZE, INGEST_FLUSH_INTERVAL, INGEST_REPLAY_SKEW_SECONDS
+from .event_log import EventLogger
+from .metrics import (
+    INGEST_BACKLOG_BYTES, INGEST_BATCH_EVENTS, INGEST_BYTES, INGEST_DUPLICATES, INGEST_ERRORS,
+    INGEST_EVENT_DELAY_SECONDS, INGEST_EVENT_WATERMARK, INGEST_EVENTS, INGEST_INSERTED, INGEST_LAG_SECONDS,
+    INGEST_LAST_WRITE, INGEST_LINES, INGEST_MATCHED, INGEST_PENDING_EVENTS, INGEST_WRITE_SECONDS,
+)
+from .log_generator import parse_line_timestamp
+
+# 앞 이벤트에 이어지는 줄 (스택 프레임, Caused by, 들여쓴 상세 정보)
+CONTINUATION_PATTERN = re.compile(r'^(\s|Caused by:|\.\.\. \d+ more)')
+
+logger = EventLogger('ingest')
+
+class DatabaseSink:
+    """수집 이벤트 저장소 (기본: SQLite)
+    
+    이벤트는 source(파일 스트림) + offset(이벤트 시작 바이트)을 멱등성 키로 저장하고,
+    체크포인트를 같은 트랜잭션에서 갱신합니다. 에러 지문은 여기서 한 번만 계산하고, 새로 저장된
+    이벤트만 사전 분석 워커, 알림 엔진, 상위 지문 추적기에 전달합니다 (시작되지 않았으면 무시).
+    다른 저장소를 쓰려면 같은 메서드(get_checkpoint, write)를 가진 객체를 LogMonitor(sink=...)로 전달합니다.
+    """
+    
+    def __init__(self, db=None, analysis_worker=None, alert_engine=None, heavy_hitters=None):
+        self.db = db or get_db_manager()
+        self.analysis_worker = analysis_worker or get_analysis_worker()
+        self.alert_engine = alert_engine or get_alert_engine()
+        self.heavy_hitters = heavy_hitters or get_heavy_hitters()
+    
+    def get_checkpoint(self, source: str) -> Optional[Dict]:
+        return self.db.get_ingest_offset(source)
+    
+    def write(self, events: List[Dict], checkpoint: Dict) -> int:
+        """이벤트 일괄 저장, 새로 저장된 개수 반환 (이미 저장된 source/offset은 무시)"""
+        for event in events:
+            if 'fingerprint' not in event:
+                event['fingerprint'] = message_fingerprint(event['level'], event['message'])
+        log_ids = self.db.insert_logs(events, checkpoint=checkpoint)
+        new_events = []
+        for log_id, event in zip(log_ids, events):
+            if log_id is None:
+                continue
+            new_events.append(event)
+            # 신규 지문/FATAL은 백그라운드 사전 분석 대기열로
+            self.analysis_worker.observe(log_id, event['level'], event['message'], event['fingerprint'])
+            logger.info('error_detected', severity=event['level'], log_id=log_id,
+                        message=event['message'].split('\n', 1)[0][:100])
+        self.alert_engine.observe(new_events)
+        self.heavy_hitters.observe(new_events)
+        return len(new_events)
 
 class LogMonitor:
-    def __init__(self):
-        self.log_file = LOG_FILE
-        self.db = db_manager
+    """로그 파일 tail 수집기 (에러 로그의 유일한 저장 경로)
+    
+    여러 줄 이벤트(스택 트레이스)를 하나로 묶어 에러 패턴을 검사하고, 에러 이벤트만
+    배치로 sink에 저장합니다. 읽은 위치는 체크포인트로 남겨 재시작 시 이어서 읽습니다.
+    """
+    
+    def __init__(self, sink=None, log_file: str = None):
+        self.log_file = log_file or LOG_FILE
+        self.sink = sink or DatabaseSink()
+        self.batch_size = INGEST_BATCH_SIZE
+        self.flush_interval = INGEST_FLUSH_INTERVAL
         self.monitoring = False
         self.monitor_thread = None
+        self.stats = {'events': 0, 'errors': 0, 'inserted': 0, 'duplicates': 0, 'batches': 0}
+        # 원본 파일별 워터마크 (offset/file_size: 바이트, event_time/queryable_at: epoch 초)
+        self.watermarks: Dict[str, Dict] = {}
         
         # 에러 패턴 정의
         self.error_patterns = {
@@ -30,33 +95,183 @@ class LogMonitor:
             self.monitoring = True
             self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
             self.monitor_thread.start()
-            print(f"로그 모니터링 시작: {self.log_file}")
+            logger.log('monitor_started', limit=False, file=self.log_file)
     
     def stop_monitoring(self):
-        """로그 모니터링 중지"""
+        """로그 모니터링 중지 (진행 중인 배치와 체크포인트 저장 후 종료)"""
         self.monitoring = False
         if self.monitor_thread:
-            self.monitor_thread.join(timeout=1)
-        print("로그 모니터링 중지")
+            self.monitor_thread.join(timeout=5)
+        logger.log('monitor_stopped', limit=False, file=self.log_file, **self.stats)
     
     def _monitor_loop(self):
-        """로그 파일 tail 모드 모니터링"""
-        try:
-            self._ensure_log_file_exists()
+        """로그 파일 tail 모드 모니터링 (교체/truncate 시 다시 열기, 오류 시 체크포인트부터 재시도)"""
+        while self.monitoring:
+            try:
+                self._ensure_log_file_exists()
+                self._tail_file()
+            except Exception as e:
+                INGEST_ERRORS.inc()
+                logger.error('monitor_error', error=f"{type(e).__name__}: {e}")
+                time.sleep(1)
+    
+    def _resume_position(self, path: str, inode: int, size: int):
+        """체크포인트 기준 시작 위치와 generation (체크포인트가 없으면 파일 끝부터)"""
+        checkpoint = self.sink.get_checkpoint(path)
+        self.watermarks[path] = {
+            'source': path, 'offset': size if checkpoint is None else checkpoint['offset'], 'file_size': size,
+            'event_time': (checkpoint or {}).get('event_time'), 'queryable_at': (checkpoint or {}).get('queryable_at'),
+        }
+        if checkpoint is None:
+            return size, 0
+        generation = checkpoint.get('generation') or 0
+        if checkpoint.get('inode') not in (None, inode) or checkpoint['offset'] > size:
+            # 파일이 교체되었거나 잘렸으면 새 스트림으로 처음부터
+            return 0, generation + 1
+        return checkpoint['offset'], generation
+    
+    def _tail_file(self):
+        """현재 파일을 끝까지 따라가며 수집 (파일이 바뀌면 반환)"""
+        path = os.path.abspath(self.log_file)
+        with open(path, 'rb') as file:
+            inode = os.fstat(file.fileno()).st_ino
+            position, generation = self._resume_position(path, inode, os.fstat(file.fileno()).st_size)
+            file.seek(position)
+            # 행의 source는 파일 스트림 단위 (같은 경로라도 교체/truncate 후에는 다른 키)
+            stream = f"{path}#{inode}.{generation}"
+            checkpoint = {'source': path, 'offset': position, 'inode': inode, 'generation': generation}
+            
+            pending_offset, pending_lines, pending_read_at = None, [], 0.0
+            # 마지막으로 마무리된 이벤트의 첫 줄과 읽은 시각 (저장 시 이벤트 시각 워터마크로 사용)
+            last_event_line, last_event_read_at = None, 0.0
+            watermark = self.watermarks[path]
+            watermark['offset'] = position
+            batch: List[Dict] = []
+            batch_read_at: List[float] = []
+            unsaved = 0
+            read_lines = read_bytes = 0
+            last_data = last_flush = time.monotonic()
             
-            with open(self.log_file, 'r', encoding='utf-8') as file:
-                # 파일 끝으로 이동
-                file.seek(0, 2)
-                
+            def event_watermark() -> Optional[float]:
+                """마지막 이벤트의 로그 시각 (타임스탬프가 없거나 재생된 과거 줄이면 읽은 시각)
+
+                행은 수집 시각으로 저장되므로, 과거 파일 재생처럼 줄 시각이 읽은 시각보다
+                INGEST_REPLAY_SKEW_SECONDS 넘게 뒤처지면 줄 시각 대신 읽은 시각으로 지연을 잽니다.
+                (밀린 파일을 따라잡는 지연은 backlog_bytes 기준으로 계속 경고됩니다)
+                """
+                if last_event_line is None:
+                    return None
+                read_at = time.time() - (time.monotonic() - last_event_read_at)
+                parsed = parse_line_timestamp(last_event_line)
+                if parsed is None or read_at - parsed > INGEST_REPLAY_SKEW_SECONDS:
+                    return read_at
+                return parsed
+            
+            def update_backlog():
+                """미처리 바이트 게이지와 미처리 시작 시각 갱신 (지연 계산 시 짧은 미처리는 무시하기 위함)"""
+                backlog = max(0, watermark['file_size'] - checkpoint['offset'])
+                if not backlog:
+                    watermark['backlog_since'] = None
+                elif watermark.get('backlog_since') is None:
+                    watermark['backlog_since'] = time.time()
+                INGEST_BACKLOG_BYTES.set(backlog)
+            
+            def flush():
+                nonlocal batch, batch_read_at, unsaved, last_flush, read_lines, read_bytes, last_event_line
+                last_flush = time.monotonic()
+                INGEST_LINES.inc(read_lines)
+                INGEST_BYTES.inc(read_bytes)
+                read_lines = read_bytes = 0
+                if not batch and not unsaved:
+                    return
+                # 체크포인트는 아직 마무리되지 않은 이벤트의 시작 위치
+                checkpoint['offset'] = pending_offset if pending_offset is not None else file.tell()
+                checkpoint['file_size'] = os.fstat(file.fileno()).st_size
+                checkpoint['event_time'] = event_watermark()
+                with INGEST_WRITE_SECONDS.time():
+                    inserted = self.sink.write(batch, dict(checkpoint))
+                written_at = time.monotonic()
+                watermark.update(offset=checkpoint['offset'], file_size=checkpoint['file_size'])
+                if checkpoint['event_time'] is not None:
+                    watermark.update(event_time=checkpoint['event_time'], queryable_at=time.time())
+                    INGEST_EVENT_WATERMARK.set(watermark['event_time'])
+                    INGEST_LAG_SECONDS.set(max(0.0, watermark['queryable_at'] - watermark['event_time']))
+                last_event_line = None
+                for read_at in batch_read_at:
+                    INGEST_EVENT_DELAY_SECONDS.observe(written_at - read_at)
+                if batch:
+                    INGEST_BATCH_EVENTS.observe(len(batch))
+                INGEST_INSERTED.inc(inserted)
+                INGEST_DUPLICATES.inc(len(batch) - inserted)
+                INGEST_LAST_WRITE.set(time.time())
+                update_backlog()
+                INGEST_PENDING_EVENTS.set(0)
+                self.stats['inserted'] += inserted
+                self.stats['duplicates'] += len(batch) - inserted
+                self.stats['batches'] += 1
+                batch, batch_read_at, unsaved = [], [], 0
+            
+            def finish_pending():
+                nonlocal pending_offset, pending_lines, unsaved, last_event_line, last_event_read_at
+                event = self._build_event('\n'.join(pending_lines))
+                self.stats['events'] += 1
+                INGEST_EVENTS.inc()
+                if event is not None:
+                    event['source'] = stream
+                    event['offset'] = pending_offset
+                    batch.append(event)
+                    batch_read_at.append(pending_read_at)
+                    INGEST_MATCHED.inc(level=event['level'])
+                    INGEST_PENDING_EVENTS.set(len(batch))
+                unsaved += 1
+                last_event_line, last_event_read_at = pending_lines[0], pending_read_at
+                pending_offset, pending_lines = None, []
+            
+            try:
                 while self.monitoring:
-                    line = file.readline()
-                    if line:
-                        self._process_log_line(line.strip())
-                    else:
-                        time.sleep(0.1)  # 새로운 로그 대기
-                        
-        except Exception as e:
-            print(f"로그 모니터링 오류: {e}")
+                    offset = file.tell()
+                    raw = file.readline()
+                    if raw.endswith(b'\n'):
+                        last_data = time.monotonic()
+                        read_lines += 1
+                        read_bytes += len(raw)
+                        line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+                        if pending_lines and (not line or CONTINUATION_PATTERN.match(line)):
+                            if line:
+                                pending_lines.append(line)
+                        elif line:
+                            if pending_lines:
+                                finish_pending()
+                            pending_offset, pending_lines, pending_read_at = offset, [line], last_data
+                        # 배치가 차거나 계속 읽을 데이터가 있어도 flush_interval마다 저장
+                        if (len(batch) >= self.batch_size or unsaved >= self.batch_size * 10
+                                or last_data - last_flush >= self.flush_interval):
+                            flush()
+                        continue
+                    
+                    # 아직 줄바꿈이 기록되지 않은 줄은 다음에 다시 읽음
+                    file.seek(offset)
+                    if pending_lines and time.monotonic() - last_data >= self.flush_interval:
+                        finish_pending()
+                    flush()
+                    
+                    if self._file_replaced(path, inode, offset):
+                        return
+                    # 마무리 대기 중인 이벤트(최대 flush_interval)는 처리 중이므로 미처리 바이트로 세지 않음
+                    if not pending_lines:
+                        watermark['file_size'] = os.fstat(file.fileno()).st_size
+                        update_backlog()
+                    time.sleep(0.1)  # 새로운 로그 대기
+            finally:
+                flush()
+    
+    def _file_replaced(self, path: str, inode: int, position: int) -> bool:
+        """로그 로테이션(다른 파일로 교체) 또는 truncate 여부"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        return stat.st_ino != inode or stat.st_size < position
     
     def _ensure_log_file_exists(self):
         """로그 파일 존재 확인 및 생성"""
@@ -67,26 +282,17 @@ class LogMonitor:
             with open(self.log_file, 'w', encoding='utf-8') as f:
                 f.write("")
     
-    def _process_log_line(self, line: str):
-        """로그 라인 처리 및 에러 감지"""
-        try:
-            # 에러 패턴 확인
-            for level, pattern in self.error_patterns.items():
-                if pattern.search(line):
-                    # 응답시간 추출 (예: [1234ms] 형태)
-                    response_time = self._extract_response_time(line)
-                    
-                    # DB에 저장
-                    self.db.insert_log(
-                        level=level,
-                        message=line,
-                        response_time=response_time
-                    )
-                    print(f"에러 로그 감지: {level} - {line[:100]}...")
-                    break
-                    
-        except Exception as e:
-            print(f"로그 처리 오류: {e}")
+    def _build_event(self, text: str) -> Optional[Dict]:
+        """이벤트 텍스트의 에러 레벨 판별 (에러가 아니면 None)"""
+        for level, pattern in self.error_patterns.items():
+            if pattern.search(text):
+                self.stats['errors'] += 1
+                return {
+                    'level': level,
+                    'message': text,
+                    'response_time': self._extract_response_time(text),
+                }
+        return None
     
     def _extract_response_time(self, line: str) -> int:
         """로그에서 응답시간 추출"""
@@ -101,11 +307,17 @@ class LogMonitor:
             match = re.search(r'response_time=(\d+)', line)
             if match:
                 return int(match.group(1))
-                
+        
         except:
             pass
         
         return 0  # 기본값
 
-# 전역 인스턴스
-log_monitor = LogMonitor()
\ No newline at end of file
+# 전역 인스턴스 (첫 사용 시 생성)
+get_log_monitor = LazySingleton(LogMonitor)
+
+def __getattr__(name):
+    # 기존 `from .log_monitor import log_monitor` 호환 (첫 접근 시 생성)
+    if name == 'log_monitor':
+        return get_log_monitor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
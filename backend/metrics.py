@@ -0,0 +1,285 @@
+# 파일명: backend/metrics.py
+"""수집 파이프라인 계측 (Prometheus 텍스트 형식, 표준 라이브러리만 사용)
+
+Counter/Gauge/Histogram을 전역 REGISTRY에 등록하고, MetricsServer가
+`GET /metrics`로 Prometheus exposition 형식(0.0.4)을 제공합니다.
+"""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 기본 지연 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple = ()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    """공통 기반 (레이블 값 튜플별 시계열)"""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블 {self.labelnames} 필요 (전달: {tuple(labels)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines += [f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples()]
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    metric_type = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {} if self.labelnames else {(): 0.0}
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("카운터는 감소할 수 없습니다")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Gauge(_Metric):
+    """현재 값 게이지 (set_function으로 조회 시점 값 계산 가능)"""
+
+    metric_type = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {} if self.labelnames else {(): 0.0}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Optional[Callable[[], float]]):
+        """레이블 없는 게이지의 값을 조회 시점에 function()으로 계산"""
+        self._function = function
+
+    def value(self, **labels) -> float:
+        if self._function is not None and not self.labelnames:
+            return float(self._function())
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        if self._function is not None and not self.labelnames:
+            try:
+                return [(self.name, '', float(self._function()))]
+            except Exception:
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (_bucket / _sum / _count)"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple, List] = {}
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [버킷별 개수(+Inf 포함), 합계, 개수]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 실행 시간(초) 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+        samples = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, (('le', _format_value(float(bound))),))
+                samples.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.labelnames, key)
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """메트릭 모음 (이름 중복 등록 불가)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"이미 등록된 메트릭: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+# 수집 파이프라인 메트릭
+INGEST_LINES = Counter('aiwas_ingest_lines_total', '로그 파일에서 읽은 줄 수')
+INGEST_BYTES = Counter('aiwas_ingest_bytes_total', '로그 파일에서 읽은 바이트 수')
+INGEST_EVENTS = Counter('aiwas_ingest_events_total', '조립된 이벤트 수 (여러 줄 이벤트는 1건)')
+INGEST_MATCHED = Counter('aiwas_ingest_matched_events_total', '에러 패턴에 일치한 이벤트 수', ['level'])
+INGEST_INSERTED = Counter('aiwas_ingest_inserted_total', 'DB에 새로 저장된 이벤트 수')
+INGEST_DUPLICATES = Counter('aiwas_ingest_duplicates_total', '이미 저장되어 무시된 이벤트 수 (source/offset 중복)')
+INGEST_ERRORS = Counter('aiwas_ingest_errors_total', '수집 루프 오류 수')
+INGEST_WRITE_SECONDS = Histogram('aiwas_ingest_write_seconds', '배치 저장(DB 트랜잭션) 소요 시간')
+INGEST_BATCH_EVENTS = Histogram('aiwas_ingest_batch_events', '배치당 저장 이벤트 수',
+                                buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000))
+INGEST_EVENT_DELAY_SECONDS = Histogram('aiwas_ingest_event_delay_seconds',
+                                       '이벤트 첫 줄을 읽은 뒤 저장이 끝날 때까지의 시간')
+INGEST_BACKLOG_BYTES = Gauge('aiwas_ingest_backlog_bytes', '로그 파일 크기 - 저장 완료 오프셋 (수집 지연 바이트)')
+INGEST_PENDING_EVENTS = Gauge('aiwas_ingest_pending_events', '저장 대기 중인 배치 이벤트 수')
+INGEST_EVENT_WATERMARK = Gauge('aiwas_ingest_event_watermark_timestamp_seconds',
+                               '조회 가능해진 최신 이벤트의 로그 시각 (epoch)')
+INGEST_LAG_SECONDS = Gauge('aiwas_ingest_lag_seconds', '최신 이벤트의 로그 시각부터 조회 가능해질 때까지의 지연')
+INGEST_LAST_WRITE = Gauge('aiwas_ingest_last_write_timestamp_seconds', '마지막 배치 저장 시각 (epoch)')
+ANALYSIS_QUEUE_DEPTH = Gauge('aiwas_analysis_queue_depth', '사전 분석 대기열 길이')
+ALERTS_SENT = Counter('aiwas_alerts_sent_total', '전송한 알림 수', ['sink'])
+ALERT_SINK_ERRORS = Counter('aiwas_alert_sink_errors_total', '알림 전송 실패 횟수 (배치 단위)', ['sink'])
+ALERTS_DROPPED = Counter('aiwas_alerts_dropped_total', '전송 대기열이 가득 차 버린 알림 수')
+GENERATED_EVENTS = Counter('aiwas_generated_events_total', '샘플/재생으로 기록한 로그 이벤트 수')
+AGENT_FRAMES_SPOOLED = Counter('aiwas_agent_frames_spooled_total', '에이전트가 디스크 스풀에 기록한 프레임 수')
+AGENT_FRAMES_SENT = Counter('aiwas_agent_frames_sent_total', '수집기가 확인(ack)한 프레임 수')
+AGENT_FRAMES_REJECTED = Counter('aiwas_agent_frames_rejected_total', '수집기가 거부해 rejected/로 옮긴 프레임 수')
+AGENT_SEND_ERRORS = Counter('aiwas_agent_send_errors_total', '프레임 전송 실패 횟수 (재시도 포함)')
+AGENT_SPOOL_BYTES = Gauge('aiwas_agent_spool_bytes', '전송 대기 중인 스풀 크기')
+AGENT_SEND_SECONDS = Histogram('aiwas_agent_send_seconds', '프레임 전송(ack 수신까지) 소요 시간')
+COLLECTOR_FRAMES = Counter('aiwas_collector_frames_total', '수집기가 받은 프레임 수', ['result'])
+COLLECTOR_EVENTS = Counter('aiwas_collector_events_total', '수집기가 받은 이벤트 수', ['host'])
+COLLECTOR_BYTES = Counter('aiwas_collector_bytes_total', '수집기가 받은 압축 프레임 바이트 수')
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split('?')[0].rstrip('/')
+        if path == '/metrics':
+            body = self.registry.render().encode('utf-8')
+            status, content_type = 200, 'text/plain; version=0.0.4; charset=utf-8'
+        elif path in ('', '/healthz'):
+            body, status, content_type = b'ok\n', 200, 'text/plain; charset=utf-8'
+        else:
+            body, status, content_type = b'not found\n', 404, 'text/plain; charset=utf-8'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """백그라운드 스레드 /metrics HTTP 서버 (port=0이면 임의 포트)"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, registry: MetricsRegistry = None):
+        handler = type('BoundMetricsHandler', (_MetricsHandler,), {'registry': registry or REGISTRY})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> 'MetricsServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
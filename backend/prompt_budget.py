@@ -0,0 +1,112 @@
+# 파일명: backend/prompt_budget.py
+import math
+import re
+from typing import List, Sequence, Tuple
+
+# 스택 프레임 라인 (예: "\tat org.hibernate.Foo.bar(Foo.java:12)")
+_FRAME_PATTERN = re.compile(r'^\s*at\s+([\w$.<>/]+?)\.[\w$<>]+\(')
+
+# 예외 체인 라인 (Caused by / Nested exception / Suppressed)
+_CHAIN_PATTERN = re.compile(r'^\s*(?:Caused by|Nested exception is|Suppressed):', re.IGNORECASE)
+
+# 토큰 추정용 조각: 영문 단어 / 숫자 / 비ASCII 문자 / 기타 기호
+_TOKEN_PIECES = re.compile(r'[A-Za-z]+|\d+|[^\x00-\x7F]|[^\sA-Za-z\d]')
+
+def estimate_tokens(text: str) -> int:
+    """로컬 토큰 수 추정 (BPE 기준 근사: 영문 4자, 숫자 3자, 비ASCII 1자당 1토큰)"""
+    if not text:
+        return 0
+    count = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        first = piece[0]
+        if first.isascii() and first.isalpha():
+            count += math.ceil(len(piece) / 4)
+        elif first.isdigit():
+            count += math.ceil(len(piece) / 3)
+        else:
+            count += 1
+    return count
+
+def _frame_package(class_name: str) -> str:
+    """프레임 클래스의 상위 패키지 (예: org.springframework)"""
+    return '.'.join(class_name.split('.')[:2])
+
+def compact_stack_trace(message: str, app_prefixes: Sequence[str]) -> str:
+    """스택 트레이스 압축
+
+    예외 메시지와 예외 체인(Caused by)과 애플리케이션 프레임(app_prefixes)은 유지하고,
+    연속된 프레임워크 프레임은 "... N개 프레임 생략 (패키지)" 한 줄로 접습니다.
+    """
+    lines = message.splitlines()
+    compacted: List[str] = []
+    collapsed: List[str] = []
+
+    def flush_collapsed():
+        if collapsed:
+            packages = []
+            for package in collapsed:
+                if package not in packages:
+                    packages.append(package)
+            compacted.append(f"\t... 프레임워크 프레임 {len(collapsed)}개 생략 ({', '.join(packages[:3])})")
+            collapsed.clear()
+
+    for line in lines:
+        match = _FRAME_PATTERN.match(line)
+        if match and not match.group(1).startswith(tuple(app_prefixes)):
+            collapsed.append(_frame_package(match.group(1)))
+            continue
+        flush_collapsed()
+        compacted.append(line)
+    flush_collapsed()
+
+    return '\n'.join(compacted)
+
+def _line_priority(line: str, app_prefixes: Sequence[str]) -> int:
+    """예산 초과 시 유지 우선순위 (낮을수록 우선)"""
+    if _CHAIN_PATTERN.match(line):
+        return 0
+    match = _FRAME_PATTERN.match(line)
+    if match:
+        return 1 if match.group(1).startswith(tuple(app_prefixes)) else 3
+    return 2
+
+def fit_to_budget(text: str, max_tokens: int, app_prefixes: Sequence[str]) -> str:
+    """토큰 예산에 맞게 줄 단위로 축소 (첫 줄과 예외 체인, 앱 프레임 우선 유지)"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    lines = text.splitlines()
+    costs = [estimate_tokens(line) + 1 for line in lines]
+    order: List[Tuple[int, int]] = sorted(
+        ((0 if i == 0 else _line_priority(line, app_prefixes), i) for i, line in enumerate(lines))
+    )
+
+    kept = set()
+    used = 0
+    for _, index in order:
+        if used + costs[index] > max_tokens:
+            continue
+        kept.add(index)
+        used += costs[index]
+
+    result: List[str] = []
+    skipped = 0
+    for i, line in enumerate(lines):
+        if i in kept:
+            if skipped:
+                result.append(f"\t... {skipped}줄 생략")
+                skipped = 0
+            result.append(line)
+        else:
+            skipped += 1
+    if skipped:
+        result.append(f"\t... {skipped}줄 생략")
+
+    # 첫 줄 하나도 예산을 넘는 경우 문자 단위로 자르기
+    if not kept and lines:
+        return lines[0][:max_tokens * 4] + " ..."
+    return '\n'.join(result)
+
+def compact_for_prompt(message: str, max_tokens: int, app_prefixes: Sequence[str]) -> str:
+    """프롬프트용 메시지 압축 (스택 트레이스 접기 후 토큰 예산 적용)"""
+    return fit_to_budget(compact_stack_trace(message, app_prefixes), max_tokens, app_prefixes)
@@ -0,0 +1,131 @@
+# 파일명: backend/rate_limit.py
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# 재시도 대상 HTTP 상태 코드 (요청 한도 초과 + 서버 오류)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# 상태 코드가 없는 네트워크 오류 클래스명
+RETRYABLE_ERROR_NAMES = {'APIConnectionError', 'APITimeoutError', 'TimeoutError', 'ConnectionError'}
+
+class TokenBucket:
+    """토큰 버킷 요청 속도 제한 (스레드/asyncio 공용)
+
+    rate: 초당 충전 토큰 수, capacity: 최대 버스트 크기
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """토큰을 예약하고 사용 가능해질 때까지 기다려야 하는 시간(초) 반환"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            # 음수 잔량만큼 미래 토큰을 당겨쓴 것이므로 그만큼 대기
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """토큰이 있으면 차감하고 True, 없으면 대기하지 않고 False"""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1):
+        """토큰 획득 (필요 시 현재 스레드 대기)"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1):
+        """토큰 획득 (필요 시 이벤트 루프에서 대기)"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """예외에서 HTTP 상태 코드 추출 (openai/httpx 예외 공통)"""
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        response = getattr(error, 'response', None)
+        status_code = getattr(response, 'status_code', None)
+    return status_code
+
+def is_retryable_error(error: Exception) -> bool:
+    """429/5xx 및 일시적 네트워크 오류 여부"""
+    status_code = get_status_code(error)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Retry-After 응답 헤더 값(초)"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, base: float, cap: float, error: Exception = None) -> float:
+    """지수 백오프 + full jitter 대기 시간 (Retry-After가 있으면 하한으로 사용)"""
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    retry_after = get_retry_after(error) if error is not None else None
+    if retry_after is not None:
+        delay = max(delay, min(cap, retry_after))
+    return delay
+
+def retry_with_backoff(func: Callable[[], T], max_retries: int, base: float, cap: float,
+                       stats: Optional[dict] = None) -> T:
+    """재시도 가능한 오류 발생 시 지수 백오프로 재호출 (stats['retries']에 횟수 기록)"""
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            delay = backoff_delay(attempt, base, cap, e)
+            attempt += 1
+            if stats is not None:
+                stats['retries'] = attempt
+            print(f"⏳ LLM 호출 재시도 {attempt}/{max_retries} ({type(e).__name__}, {delay:.1f}초 후)")
+            time.sleep(delay)
+
+async def retry_with_backoff_async(func: Callable[[], Awaitable[T]], max_retries: int, base: float,
+                                   cap: float, stats: Optional[dict] = None) -> T:
+    """retry_with_backoff의 asyncio 버전"""
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            delay = backoff_delay(attempt, base, cap, e)
+            attempt += 1
+            if stats is not None:
+                stats['retries'] = attempt
+            await asyncio.sleep(delay)
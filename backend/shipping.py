@@ -0,0 +1,412 @@
+# 파일명: backend/shipping.py
+"""원격 호스트 로그 에이전트 (로컬 tail → 수집기로 압축 프레임 전송)
+
+LogMonitor의 sink 자리에 SpoolSink를 넣어, 배치마다 프레임(이벤트 + 체크포인트)을 zlib으로 압축해
+디스크 스풀에 먼저 기록하고 로컬 체크포인트를 갱신합니다. FrameShipper는 스풀의 가장 오래된
+프레임부터 수집기(/ingest)에 HTTP POST로 보내고, 같은 frame_id의 ack를 받은 뒤에만 삭제합니다.
+수집기가 내려가 있으면 지수 백오프로 재시도하며 그동안 프레임은 스풀에 쌓이고, 스풀이
+max_bytes를 넘으면 tail을 멈춰 원본 로그 파일이 버퍼 역할을 합니다.
+
+전달은 최소 한 번(at-least-once)이며, 수집기가 (호스트 + source, offset)을 멱등성 키로 저장하므로
+재전송/재시작으로 같은 프레임이 다시 와도 중복 저장되지 않습니다.
+"""
+import fcntl
+import json
+import math
+import os
+import signal
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from .config import (
+    AGENT_HOST_NAME, AGENT_SEND_TIMEOUT, AGENT_SPOOL_DIR, AGENT_SPOOL_MAX_BYTES, COLLECTOR_MAX_FRAME_BYTES,
+    COLLECTOR_TOKEN, COLLECTOR_URL, INGEST_HEALTH_INTERVAL,
+)
+from .event_log import EventLogger
+from .log_generator import parse_line_timestamp
+from .metrics import (
+    AGENT_FRAMES_REJECTED, AGENT_FRAMES_SENT, AGENT_FRAMES_SPOOLED, AGENT_SEND_ERRORS, AGENT_SEND_SECONDS,
+    AGENT_SPOOL_BYTES, MetricsServer,
+)
+from .rate_limit import backoff_delay
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+logger = EventLogger('agent')
+
+FRAME_VERSION = 1
+FRAME_SUFFIX = '.frame'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def encode_frame(frame: Dict) -> bytes:
+    """프레임 dict → zlib 압축 JSON"""
+    return zlib.compress(json.dumps(frame, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 6)
+
+
+def decode_frame(body: bytes, max_bytes: int = COLLECTOR_MAX_FRAME_BYTES) -> Dict:
+    """zlib 압축 JSON → 프레임 dict (형식이 잘못되었거나 max_bytes를 넘으면 ValueError)"""
+    decompressor = zlib.decompressobj()
+    try:
+        data = decompressor.decompress(body, max_bytes)
+    except zlib.error as e:
+        raise ValueError(f"압축 해제 실패: {e}")
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"프레임이 너무 큽니다 (최대 {max_bytes} bytes)")
+    try:
+        frame = json.loads(data)
+    except ValueError as e:
+        raise ValueError(f"JSON 형식 오류: {e}")
+
+    if not isinstance(frame, dict) or frame.get('version') != FRAME_VERSION:
+        raise ValueError(f"지원하지 않는 프레임 버전: {frame.get('version') if isinstance(frame, dict) else None}")
+    if not isinstance(frame.get('host'), str) or not frame['host'] or not isinstance(frame.get('frame_id'), str):
+        raise ValueError("host/frame_id가 필요합니다")
+    if not isinstance(frame.get('events'), list):
+        raise ValueError("events는 목록이어야 합니다")
+    for event in frame['events']:
+        if not (isinstance(event, dict) and isinstance(event.get('level'), str)
+                and isinstance(event.get('message'), str) and isinstance(event.get('source'), str)
+                and isinstance(event.get('offset'), int)):
+            raise ValueError("이벤트에는 level/message/source/offset이 필요합니다")
+        _validate_event_fields(event)
+    checkpoint = frame.get('checkpoint')
+    if checkpoint is not None:
+        if not (isinstance(checkpoint, dict) and isinstance(checkpoint.get('source'), str)
+                and checkpoint.get('offset') is not None):
+            raise ValueError("checkpoint에는 source/offset이 필요합니다")
+        _validate_checkpoint_fields(checkpoint)
+    return frame
+
+
+def _validate_event_fields(event: Dict):
+    """선택 필드 형식 검사 (저장 단계에서 실패하면 503 → 무한 재시도가 되므로 여기서 400으로 거부)"""
+    response_time = event.get('response_time', 0)
+    if isinstance(response_time, bool) or not isinstance(response_time, (int, float)) \
+            or not math.isfinite(response_time) or response_time < 0:
+        raise ValueError(f"response_time은 0 이상의 숫자여야 합니다: {response_time!r}")
+    timestamp = event.get('timestamp')
+    if timestamp is not None:
+        try:
+            datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+        except (TypeError, ValueError):
+            raise ValueError(f"timestamp는 '{TIMESTAMP_FORMAT}' 형식 문자열이어야 합니다: {timestamp!r}")
+    for key in ('fingerprint', 'host'):
+        if event.get(key) is not None and not isinstance(event[key], str):
+            raise ValueError(f"{key}는 문자열이어야 합니다: {event[key]!r}")
+
+
+def _validate_checkpoint_fields(checkpoint: Dict):
+    """체크포인트 필드 형식 검사 (ingest_offsets와 수집기 워터마크에 그대로 저장되어 지연 계산에 쓰임)"""
+    for key in ('offset', 'file_size', 'inode', 'generation'):
+        value = checkpoint.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            raise ValueError(f"checkpoint {key}는 0 이상의 정수여야 합니다: {value!r}")
+    event_time = checkpoint.get('event_time')
+    if event_time is not None and (isinstance(event_time, bool) or not isinstance(event_time, (int, float))
+                                   or not math.isfinite(event_time)):
+        raise ValueError(f"checkpoint event_time은 숫자여야 합니다: {event_time!r}")
+
+
+def event_timestamp(event: Dict, read_at: float) -> str:
+    """이벤트 저장 시각 (KST 문자열, 로그 줄 시각이 있으면 그 시각, 없으면 읽은 시각)"""
+    parsed = parse_line_timestamp(event['message'].split('\n', 1)[0])
+    return datetime.fromtimestamp(read_at if parsed is None else parsed, KST).strftime(TIMESTAMP_FORMAT)
+
+
+def _write_atomic(path: str, data: bytes):
+    """임시 파일에 기록 후 fsync → 교체 (중간에 죽어도 반쯤 쓴 파일이 남지 않음)"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class SpoolSink:
+    """LogMonitor용 디스크 스풀 sink (get_checkpoint/write 인터페이스)
+
+    write()는 배치를 프레임 파일로 기록한 뒤 로컬 체크포인트(checkpoints.json)를 갱신합니다.
+    체크포인트는 '스풀에 안전하게 기록된 위치'이므로 재시작해도 이미 스풀한 이벤트는 다시 읽지 않습니다.
+    """
+
+    def __init__(self, spool_dir: str = AGENT_SPOOL_DIR, host: str = AGENT_HOST_NAME,
+                 max_bytes: int = AGENT_SPOOL_MAX_BYTES):
+        self.spool_dir = spool_dir
+        self.host = host
+        self.max_bytes = max_bytes
+        self.closed = False
+        self.frame_ready = threading.Event()
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._checkpoint_path = os.path.join(self.spool_dir, 'checkpoints.json')
+        try:
+            with open(self._checkpoint_path, 'r', encoding='utf-8') as f:
+                self.checkpoints: Dict[str, Dict] = json.load(f)
+        except FileNotFoundError:
+            self.checkpoints = {}
+        frames = self.frames()
+        self._sequence = int(os.path.basename(frames[-1])[:-len(FRAME_SUFFIX)]) if frames else 0
+        self.spool_bytes = sum(os.path.getsize(path) for path in frames)
+        AGENT_SPOOL_BYTES.set(self.spool_bytes)
+        if frames:
+            self.frame_ready.set()
+
+    def frames(self) -> List[str]:
+        """전송 대기 프레임 파일 (오래된 순)"""
+        names = sorted(name for name in os.listdir(self.spool_dir) if name.endswith(FRAME_SUFFIX))
+        return [os.path.join(self.spool_dir, name) for name in names]
+
+    def get_checkpoint(self, source: str) -> Optional[Dict]:
+        return self.checkpoints.get(source)
+
+    def write(self, events: List[Dict], checkpoint: Dict) -> int:
+        """배치를 프레임으로 스풀에 기록, 기록한 이벤트 수 반환 (스풀이 가득 차면 빌 때까지 대기)
+
+        수집기는 도착 시각이 아니라 이벤트의 timestamp로 저장하므로, 장애 동안 스풀된 이벤트도
+        원래 분에 집계되도록 여기서(대기 전 읽은 시각 기준) timestamp를 붙여 보냅니다.
+        """
+        read_at = time.time()
+        for event in events:
+            event.setdefault('timestamp', event_timestamp(event, read_at))
+        while self.spool_bytes >= self.max_bytes and not self.closed:
+            time.sleep(0.5)
+        self._sequence += 1
+        frame = {
+            'version': FRAME_VERSION,
+            'host': self.host,
+            'frame_id': f"{self.host}-{os.getpid()}-{self._sequence}",
+            'events': events,
+            'checkpoint': checkpoint,
+        }
+        data = encode_frame(frame)
+        _write_atomic(os.path.join(self.spool_dir, f"{self._sequence:012d}{FRAME_SUFFIX}"), data)
+        self.checkpoints[checkpoint['source']] = checkpoint
+        _write_atomic(self._checkpoint_path, json.dumps(self.checkpoints, ensure_ascii=False).encode('utf-8'))
+        self.spool_bytes += len(data)
+        AGENT_SPOOL_BYTES.set(self.spool_bytes)
+        AGENT_FRAMES_SPOOLED.inc()
+        self.frame_ready.set()
+        return len(events)
+
+    def remove(self, path: str):
+        """전송 완료(또는 거부) 프레임을 스풀에서 제거"""
+        self.spool_bytes = max(0, self.spool_bytes - os.path.getsize(path))
+        os.remove(path)
+        AGENT_SPOOL_BYTES.set(self.spool_bytes)
+
+
+class CollectorRejected(Exception):
+    """수집기가 프레임 자체를 거부 (재시도해도 같은 결과인 4xx)"""
+
+
+class FrameShipper:
+    """스풀 프레임을 수집기로 순서대로 전송 (ack 확인 후 삭제, 실패 시 지수 백오프 재시도)"""
+
+    def __init__(self, spool: SpoolSink, url: str = COLLECTOR_URL, token: str = COLLECTOR_TOKEN,
+                 timeout: float = AGENT_SEND_TIMEOUT):
+        self.spool = spool
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+        self.running = False
+        self.thread = None
+        self.stats = {'sent_frames': 0, 'sent_events': 0, 'sent_bytes': 0, 'errors': 0, 'rejected': 0,
+                      'last_ack': None, 'last_error': None}
+        self.failures = 0  # 연속 실패 횟수 (백오프 단계)
+        self._stop = threading.Event()
+
+    def send(self, data: bytes) -> Dict:
+        """압축 프레임 1개 POST, 수집기 응답(JSON) 반환"""
+        headers = {'Content-Type': 'application/json', 'Content-Encoding': 'deflate'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        request = urllib.request.Request(self.url, data=data, method='POST', headers=headers)
+        try:
+            with AGENT_SEND_SECONDS.time(), urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            # 401/408/429는 설정 변경이나 시간이 지나면 성공할 수 있으므로 재시도
+            if 400 <= e.code < 500 and e.code not in (401, 408, 429):
+                raise CollectorRejected(f"HTTP {e.code}: {e.read()[:200].decode('utf-8', 'replace')}")
+            raise
+
+    def ship_once(self) -> bool:
+        """가장 오래된 프레임 1개 전송 (보낼 프레임이 없으면 False, 실패 시 예외)"""
+        frames = self.spool.frames()
+        if not frames:
+            return False
+        path = frames[0]
+        with open(path, 'rb') as f:
+            data = f.read()
+        frame_id = json.loads(zlib.decompress(data))['frame_id']
+        try:
+            response = self.send(data)
+        except CollectorRejected as e:
+            # 같은 프레임이 계속 막지 않도록 따로 보관하고 다음 프레임으로
+            rejected_dir = os.path.join(self.spool.spool_dir, 'rejected')
+            os.makedirs(rejected_dir, exist_ok=True)
+            os.replace(path, os.path.join(rejected_dir, os.path.basename(path)))
+            self.spool.spool_bytes = max(0, self.spool.spool_bytes - len(data))
+            AGENT_SPOOL_BYTES.set(self.spool.spool_bytes)
+            AGENT_FRAMES_REJECTED.inc()
+            self.stats['rejected'] += 1
+            logger.log('frame_rejected', 'error', limit=False, frame_id=frame_id, error=str(e))
+            return True
+        if response.get('ack') != frame_id:
+            raise ValueError(f"ack 불일치: {response.get('ack')} != {frame_id}")
+        self.spool.remove(path)
+        AGENT_FRAMES_SENT.inc()
+        self.stats['sent_frames'] += 1
+        self.stats['sent_events'] += response.get('received', 0)
+        self.stats['sent_bytes'] += len(data)
+        self.stats['last_ack'] = time.time()
+        return True
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self._stop.clear()
+            self.thread = threading.Thread(target=self._loop, daemon=True)
+            self.thread.start()
+
+    def stop(self, drain_timeout: float = 5):
+        """전송 중지 (drain_timeout 동안 남은 프레임 전송 시도, 못 보낸 프레임은 스풀에 남음)"""
+        deadline = time.monotonic() + drain_timeout
+        while self.spool.frames() and not self.failures and time.monotonic() < deadline:
+            time.sleep(0.1)
+        self.running = False
+        self._stop.set()
+        self.spool.frame_ready.set()
+        if self.thread:
+            self.thread.join(timeout=self.timeout + 1)
+
+    def _loop(self):
+        while self.running:
+            try:
+                if self.ship_once():
+                    if self.failures:
+                        logger.log('collector_recovered', limit=False, url=self.url, failures=self.failures)
+                    self.failures = 0
+                    continue
+            except Exception as e:
+                AGENT_SEND_ERRORS.inc()
+                self.stats['errors'] += 1
+                self.stats['last_error'] = f"{type(e).__name__}: {e}"
+                logger.warning('collector_send_error', url=self.url, failures=self.failures + 1,
+                               error=self.stats['last_error'], spool_bytes=self.spool.spool_bytes)
+                delay = backoff_delay(self.failures, 0.5, 10.0, e)
+                self.failures += 1
+                if self._stop.wait(delay):
+                    return
+                continue
+            # 보낼 프레임이 없으면 새 프레임이 스풀될 때까지 대기
+            self.spool.frame_ready.wait(1.0)
+            self.spool.frame_ready.clear()
+
+
+class LogAgent:
+    """원격 호스트 수집 에이전트 (LogMonitor + SpoolSink + FrameShipper)
+
+    health_interval마다 상태(스풀 크기, 전송/오류 수)를 구조화 로그로 남기고, SIGTERM/SIGINT를 받으면
+    진행 중인 배치를 스풀한 뒤 잠시 남은 프레임을 보내고 종료합니다. 같은 스풀 디렉토리로 두 번
+    실행되지 않도록 파일 잠금을 사용합니다.
+    """
+
+    def __init__(self, log_file: str = None, collector_url: str = COLLECTOR_URL, host: str = AGENT_HOST_NAME,
+                 spool_dir: str = AGENT_SPOOL_DIR, health_interval: float = INGEST_HEALTH_INTERVAL,
+                 metrics_port: int = 0, metrics_host: str = '127.0.0.1'):
+        self.log_file = log_file
+        self.collector_url = collector_url
+        self.host = host
+        self.spool_dir = spool_dir
+        self.health_interval = health_interval
+        self.metrics_port = metrics_port
+        self.metrics_host = metrics_host
+        self.spool = None
+        self.shipper = None
+        self.monitor = None
+        self.metrics_server = None
+        self._stop = threading.Event()
+        self._lock_file = None
+
+    def _acquire_lock(self):
+        """단일 인스턴스 잠금 (이미 실행 중이면 RuntimeError)"""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._lock_file = open(os.path.join(self.spool_dir, '.lock'), 'w')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            self._lock_file = None
+            raise RuntimeError(f"에이전트가 이미 실행 중입니다 (스풀: {self.spool_dir})")
+
+    def _release_lock(self):
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def request_stop(self, signum=None, frame=None):
+        """종료 요청 (시그널 핸들러)"""
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        return {
+            'host': self.host,
+            'collector': self.collector_url,
+            'spool_frames': len(self.spool.frames()) if self.spool else 0,
+            'spool_bytes': self.spool.spool_bytes if self.spool else 0,
+            'monitor': dict(self.monitor.stats) if self.monitor else None,
+            **(self.shipper.stats if self.shipper else {}),
+        }
+
+    def start(self):
+        from .log_monitor import LogMonitor
+
+        self._acquire_lock()
+        self.spool = SpoolSink(self.spool_dir, self.host)
+        self.shipper = FrameShipper(self.spool, self.collector_url)
+        self.shipper.start()
+        self.monitor = LogMonitor(sink=self.spool, log_file=self.log_file)
+        if self.metrics_port:
+            self.metrics_server = MetricsServer(self.metrics_host, self.metrics_port).start()
+            logger.log('metrics_listening', limit=False, address=self.metrics_server.address)
+        self.monitor.start_monitoring()
+        logger.log('agent_started', limit=False, host=self.host, collector=self.collector_url,
+                   spool=os.path.abspath(self.spool_dir), pending_frames=len(self.spool.frames()))
+
+    def shutdown(self):
+        """tail 중지(남은 배치 스풀) → 남은 프레임 전송 시도 → 종료"""
+        if self.monitor:
+            self.monitor.stop_monitoring()
+        if self.spool:
+            self.spool.closed = True
+        if self.shipper:
+            self.shipper.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        logger.log('agent_stopped', limit=False, **{key: value for key, value in self.stats().items()
+                                                    if key != 'monitor'})
+        self._release_lock()
+
+    def run(self):
+        """메인 스레드에서 실행 (종료 시그널까지 health_interval마다 상태 로그)"""
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        self.start()
+        try:
+            while not self._stop.wait(self.health_interval):
+                if self.monitor.monitor_thread and not self.monitor.monitor_thread.is_alive():
+                    logger.error('monitor_thread_exited')
+                    break
+                stats = self.stats()
+                logger.info('agent_status', spool_frames=stats['spool_frames'], spool_bytes=stats['spool_bytes'],
+                            sent_frames=stats['sent_frames'], errors=stats['errors'])
+        finally:
+            self.shutdown()
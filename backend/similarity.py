@@ -0,0 +1,180 @@
+# 파일명: backend/similarity.py
+import hashlib
+import re
+import sqlite3
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from .config import DB_PATH, SIMILARITY_NUM_PERM, SIMILARITY_BANDS
+from .lazy import LazySingleton
+
+# MinHash 해시 함수 a*x + b mod p (p는 2^32 미만 최대 소수, uint64 범위 내 곱셈 보장)
+_HASH_PRIME = np.uint64(4294967291)
+
+# 정규화된 메시지 토큰 (<n>, <uuid> 같은 치환 토큰 포함)
+_TOKEN_PATTERN = re.compile(r'<\w+>|\w+')
+
+def shingles(level: str, normalized_message: str) -> set:
+    """레벨 + 정규화 메시지의 단어 unigram/bigram 집합"""
+    tokens = [token.lower() for token in _TOKEN_PATTERN.findall(normalized_message)]
+    result = set(tokens)
+    result.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    if level:
+        result.add(f"level:{level}")
+    return result
+
+class SimilarityIndex:
+    """정규화 메시지의 MinHash/LSH 유사도 인덱스 (SQLite 저장)
+
+    지문마다 num_perm개의 MinHash 값을 저장하고, bands개 구간으로 나눈 밴드 해시를
+    인덱스 테이블에 넣어 같은 밴드 해시를 공유하는 후보만 비교합니다.
+    """
+
+    def __init__(self, db_path: str = None, num_perm: int = SIMILARITY_NUM_PERM,
+                 bands: int = SIMILARITY_BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다.")
+        self.db_path = db_path or DB_PATH
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        # 고정 시드 해시 계수 (재시작 후에도 저장된 시그니처와 호환)
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, int(_HASH_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(_HASH_PRIME), size=num_perm, dtype=np.uint64)
+        self.init_database()
+
+    def init_database(self):
+        """시그니처/밴드 테이블 생성"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS similarity_signatures (
+                    fingerprint TEXT PRIMARY KEY,
+                    level TEXT,
+                    normalized_message TEXT,
+                    minhash BLOB NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS similarity_bands (
+                    band INTEGER NOT NULL,
+                    band_hash INTEGER NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    PRIMARY KEY (band, band_hash, fingerprint)
+                ) WITHOUT ROWID
+            ''')
+            conn.commit()
+
+    def minhash(self, level: str, normalized_message: str) -> Optional[np.ndarray]:
+        """MinHash 시그니처 (uint32 배열, 토큰이 없으면 None)"""
+        items = shingles(level, normalized_message)
+        if not items:
+            return None
+        hashes = np.fromiter((zlib.crc32(item.encode('utf-8')) for item in items),
+                             dtype=np.uint64, count=len(items)) % _HASH_PRIME
+        permuted = (np.outer(hashes, self._a) + self._b) % _HASH_PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_hashes(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        """밴드별 해시 (band, 부호 있는 64비트 정수)"""
+        result = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            result.append((band, int.from_bytes(digest, 'little', signed=True)))
+        return result
+
+    def add_many(self, entries: Iterable[Tuple[str, str, str]]) -> int:
+        """(지문, 레벨, 정규화 메시지) 목록 색인, 색인된 개수 반환"""
+        signature_rows = []
+        band_rows = []
+        for fingerprint, level, normalized_message in entries:
+            signature = self.minhash(level, normalized_message or '')
+            if signature is None:
+                continue
+            signature_rows.append((fingerprint, level, normalized_message, signature.tobytes()))
+            band_rows.extend((band, band_hash, fingerprint) for band, band_hash in self._band_hashes(signature))
+
+        if not signature_rows:
+            return 0
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO similarity_signatures (fingerprint, level, normalized_message, minhash)
+                VALUES (?, ?, ?, ?)
+            ''', signature_rows)
+            cursor.executemany('''
+                INSERT OR IGNORE INTO similarity_bands (band, band_hash, fingerprint) VALUES (?, ?, ?)
+            ''', band_rows)
+            conn.commit()
+        return len(signature_rows)
+
+    def add(self, fingerprint: str, level: str, normalized_message: str) -> bool:
+        """단일 지문 색인"""
+        return self.add_many([(fingerprint, level, normalized_message)]) > 0
+
+    def query(self, level: str, normalized_message: str, k: int = 5, min_similarity: float = 0.0,
+              exclude: Optional[str] = None, max_candidates: int = 200) -> List[Dict]:
+        """유사도 상위 k개 지문 (추정 Jaccard 유사도 내림차순)
+
+        반환: [{'fingerprint', 'level', 'normalized_message', 'similarity'}]
+        """
+        signature = self.minhash(level, normalized_message or '')
+        if signature is None:
+            return []
+
+        band_hashes = self._band_hashes(signature)
+        # 밴드별 기본키 조회를 UNION ALL로 묶어 인덱스 탐색만 수행
+        band_lookup = ' UNION ALL '.join(
+            ['SELECT fingerprint FROM similarity_bands WHERE band = ? AND band_hash = ?'] * len(band_hashes)
+        )
+        params = [value for pair in band_hashes for value in pair]
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            # 밴드 해시를 많이 공유하는 지문부터 후보로 선택
+            cursor.execute(f'''
+                SELECT s.fingerprint, s.level, s.normalized_message, s.minhash
+                FROM (
+                    SELECT fingerprint, COUNT(*) AS shared
+                    FROM ({band_lookup})
+                    GROUP BY fingerprint
+                    ORDER BY shared DESC
+                    LIMIT ?
+                ) candidates
+                JOIN similarity_signatures s ON s.fingerprint = candidates.fingerprint
+            ''', params + [max_candidates])
+            rows = [row for row in cursor.fetchall() if row[0] != exclude]
+
+        if not rows:
+            return []
+
+        candidate_matrix = np.frombuffer(b''.join(row[3] for row in rows), dtype=np.uint32).reshape(len(rows), -1)
+        similarities = (candidate_matrix == signature).mean(axis=1)
+        order = np.argsort(-similarities, kind='stable')[:k]
+        return [
+            {
+                'fingerprint': rows[i][0],
+                'level': rows[i][1],
+                'normalized_message': rows[i][2],
+                'similarity': float(similarities[i]),
+            }
+            for i in order if similarities[i] >= min_similarity
+        ]
+
+    def count(self) -> int:
+        """색인된 지문 수"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM similarity_signatures')
+            return cursor.fetchone()[0]
+
+# 전역 인스턴스 (첫 사용 시 테이블 생성)
+get_similarity_index = LazySingleton(SimilarityIndex)
+
+def __getattr__(name):
+    # 기존 `from .similarity import similarity_index` 호환 (첫 접근 시 생성)
+    if name == 'similarity_index':
+        return get_similarity_index()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
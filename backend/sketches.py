@@ -0,0 +1,245 @@
+# 파일명: backend/sketches.py
+import hashlib
+import heapq
+import math
+from typing import Dict, Iterable, List, Sequence
+import numpy as np
+
+class LogBucketHistogram:
+    """HDR 방식의 로그 구간 히스토그램 (병합 가능한 분위수 스케치)
+
+    값 v는 gamma^(i-1) < v <= gamma^i 구간 i에 기록되며, 구간 대표값의
+    상대 오차는 relative_accuracy 이하입니다. 구간별 개수만 더하면 병합되므로
+    시간 구간별로 저장해 두고 임의 기간의 분위수를 원본 정렬 없이 계산할 수 있습니다.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.05):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.counts: Dict[int, int] = {}
+
+    def bin_index(self, value: float) -> int:
+        """값이 속하는 구간 번호 (1 미만 값은 0번 구간)"""
+        if value is None or value < 1:
+            return 0
+        return max(1, math.ceil(math.log(value) / self._log_gamma))
+
+    def bin_value(self, index: int) -> float:
+        """구간 대표값 (구간 경계의 조화 중앙값)"""
+        if index <= 0:
+            return 0.0
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def bin_values(self, indices: np.ndarray) -> np.ndarray:
+        """구간 대표값 (벡터화)"""
+        indices = np.asarray(indices, dtype=np.float64)
+        values = 2 * np.power(self.gamma, indices) / (self.gamma + 1)
+        return np.where(indices <= 0, 0.0, values)
+
+    def add(self, value: float, count: int = 1):
+        """값 기록"""
+        index = self.bin_index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+
+    def merge(self, other: 'LogBucketHistogram'):
+        """다른 히스토그램 병합 (같은 정확도여야 함)"""
+        if other.gamma != self.gamma:
+            raise ValueError("정확도가 다른 히스토그램은 병합할 수 없습니다.")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def quantiles(self, qs: Sequence[float]) -> Dict[float, float]:
+        """분위수 계산"""
+        if not self.counts:
+            return {q: 0.0 for q in qs}
+        indices = np.fromiter(self.counts.keys(), dtype=np.int64)
+        counts = np.fromiter(self.counts.values(), dtype=np.int64)
+        values = self.quantiles_from_bins(indices, counts, qs)
+        return dict(zip(qs, values))
+
+    def quantiles_from_bins(self, indices: np.ndarray, counts: np.ndarray,
+                            qs: Iterable[float]) -> np.ndarray:
+        """(구간 번호, 개수) 배열에서 분위수 계산"""
+        order = np.argsort(indices)
+        indices = np.asarray(indices)[order]
+        cumulative = np.cumsum(np.asarray(counts)[order])
+        total = cumulative[-1] if len(cumulative) else 0
+        qs = np.asarray(list(qs), dtype=np.float64)
+        if total == 0:
+            return np.zeros(len(qs))
+        ranks = qs * (total - 1)
+        positions = np.searchsorted(cumulative, ranks, side='right')
+        return self.bin_values(indices[np.minimum(positions, len(indices) - 1)])
+
+    def quantiles_matrix(self, indices: np.ndarray, matrix: np.ndarray,
+                         qs: Iterable[float]) -> np.ndarray:
+        """행(시간 구간)별 분위수 일괄 계산
+
+        indices: 열에 해당하는 구간 번호 (오름차순), matrix: [행, 구간] 개수
+        반환: [행, 분위수] (개수가 0인 행은 NaN)
+        """
+        qs = np.asarray(list(qs), dtype=np.float64)
+        result = np.full((matrix.shape[0], len(qs)), np.nan)
+        if matrix.shape[1] == 0:
+            return result
+
+        cumulative = np.cumsum(matrix, axis=1)
+        totals = cumulative[:, -1]
+        values = self.bin_values(indices)
+
+        for j, q in enumerate(qs):
+            ranks = q * (totals - 1)
+            # 누적 개수가 rank를 처음 초과하는 열 (행별 벡터화)
+            positions = (cumulative <= ranks[:, None]).sum(axis=1)
+            positions = np.minimum(positions, len(indices) - 1)
+            result[:, j] = np.where(totals > 0, values[positions], np.nan)
+        return result
+
+# 응답시간(ms) 히스토그램 공통 설정 (DB 저장 구간과 동일해야 함)
+RESPONSE_TIME_SKETCH = LogBucketHistogram(relative_accuracy=0.02)
+
+def _hash_pair(item: str):
+    """항목의 64비트 해시 두 개 (double hashing용, 두 번째는 홀수)"""
+    digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+class BloomFilter:
+    """블룸 필터 (집합 포함 여부 근사 검사, 고정 메모리)
+
+    거짓 음성은 없고 거짓 양성 비율은 capacity개까지 error_rate 이하입니다.
+    k개 위치는 blake2b 128비트 해시 두 개의 선형 결합(double hashing)으로 계산합니다.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, item: str) -> List[int]:
+        h1, h2 = _hash_pair(item)
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """항목 추가, 처음 보는 항목이면 True (거짓 양성이면 이미 본 것으로 판단)"""
+        new = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+def count_min_columns(items: Sequence[str], width: int, depth: int) -> np.ndarray:
+    """항목별 Count-Min 행마다의 열 번호 [항목, depth] (같은 크기 스케치끼리 재사용 가능)"""
+    columns = np.empty((len(items), depth), dtype=np.int64)
+    for position, item in enumerate(items):
+        h1, h2 = _hash_pair(item)
+        columns[position] = [(h1 + i * h2) % width for i in range(depth)]
+    return columns
+
+class CountMinSketch:
+    """Count-Min 스케치 (항목별 개수 근사, 고정 메모리 depth x width)
+
+    추정값은 실제 개수 이상이며, 초과분은 확률 1 - e^-depth로 e/width * 전체 개수 이하입니다.
+    같은 크기의 스케치는 표를 더하면 병합됩니다.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self._rows = np.arange(depth)
+
+    def columns(self, items: Sequence[str]) -> np.ndarray:
+        return count_min_columns(items, self.width, self.depth)
+
+    def add(self, item: str, count: int = 1):
+        self.add_columns(self.columns([item]), np.array([count]))
+
+    def add_columns(self, columns: np.ndarray, counts: np.ndarray):
+        """columns()로 계산한 열 번호로 일괄 누적 (같은 칸 중복도 합산)"""
+        np.add.at(self.table, (self._rows, columns), np.asarray(counts)[:, None])
+        self.total += int(np.sum(counts))
+
+    def estimate(self, item: str) -> int:
+        return int(self.estimate_columns(self.columns([item]))[0])
+
+    def estimate_columns(self, columns: np.ndarray) -> np.ndarray:
+        """항목별 추정 개수 (행별 값 중 최솟값, 벡터화)"""
+        return self.table[self._rows, columns].min(axis=1)
+
+    @property
+    def error_bound(self) -> int:
+        """추정 초과분 상한 (e/width * 전체 개수)"""
+        return math.ceil(math.e / self.width * self.total)
+
+    def merge(self, other: 'CountMinSketch'):
+        """다른 스케치 병합 (같은 크기여야 함)"""
+        if other.table.shape != self.table.shape:
+            raise ValueError("크기가 다른 Count-Min 스케치는 병합할 수 없습니다.")
+        self.table += other.table
+        self.total += other.total
+
+    def clear(self):
+        self.table.fill(0)
+        self.total = 0
+
+class SpaceSaving:
+    """Space-Saving 상위 빈도 항목 추적 (최대 capacity개 카운터)
+
+    카운터가 가득 차면 가장 작은 카운터를 새 항목에 넘겨주며(그 값은 error로 기록),
+    전체의 1/capacity보다 자주 나온 항목은 반드시 남습니다. 일괄 갱신(update)은 최소 힙으로
+    교체 대상을 찾으므로 새 항목당 O(log capacity)입니다.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.counters: Dict[str, List[int]] = {}  # 항목 -> [개수, 최대 과대 추정]
+
+    def add(self, item: str, count: int = 1):
+        self.update({item: count})
+
+    def update(self, counts: Dict[str, int]):
+        """항목별 개수 일괄 반영 (기존 항목 → 빈 카운터 → 최소 카운터 교체 순)"""
+        new_items = []
+        for item, count in counts.items():
+            counter = self.counters.get(item)
+            if counter is not None:
+                counter[0] += count
+            elif len(self.counters) < self.capacity:
+                self.counters[item] = [count, 0]
+            else:
+                new_items.append((item, count))
+        if not new_items:
+            return
+        # 큰 것부터 넣어야 같은 배치의 작은 항목에 밀려나지 않음
+        new_items.sort(key=lambda entry: entry[1], reverse=True)
+        heap = [(counter[0], item) for item, counter in self.counters.items()]
+        heapq.heapify(heap)
+        for item, count in new_items:
+            floor, victim = heapq.heappop(heap)
+            del self.counters[victim]
+            self.counters[item] = [floor + count, floor]
+            heapq.heappush(heap, (floor + count, item))
+
+    def top(self, k: int) -> List[tuple]:
+        """개수 상위 k개 (항목, 개수, 최대 과대 추정)"""
+        ranked = sorted(self.counters.items(), key=lambda entry: entry[1][0], reverse=True)[:k]
+        return [(item, count, error) for item, (count, error) in ranked]
+
+    def clear(self):
+        self.counters.clear()
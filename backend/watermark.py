@@ -0,0 +1,45 @@
+# 파일명: backend/watermark.py
+import time
+from typing import Dict, List, Optional
+from .config import INGEST_FLUSH_INTERVAL, INGEST_LAG_ALERT_BYTES, INGEST_LAG_ALERT_SECONDS
+
+def ingest_lag(watermark: Dict, now: float = None, grace: float = INGEST_FLUSH_INTERVAL) -> Dict:
+    """수집 워터마크의 지연 계산
+
+    - backlog_bytes: 파일 크기 - 저장 완료 오프셋 (아직 읽거나 저장하지 못한 바이트)
+    - commit_lag_seconds: 마지막 배치의 최신 이벤트 시각 → 조회 가능해진 시각
+    - lag_seconds: 대시보드가 뒤처진 정도. 남은 바이트가 grace초 넘게 남아 있으면 지금까지 기다린 시간
+      (now - 최신 조회 가능 이벤트 시각), 다 따라잡았거나 막 생긴 미처리면 commit_lag_seconds
+      (미처리 시작 시각 backlog_since가 없으면 마지막 저장 시각 queryable_at 기준)
+    """
+    now = now or time.time()
+    file_size, offset = watermark.get('file_size'), watermark.get('offset')
+    backlog_bytes = max(0, file_size - offset) if file_size is not None and offset is not None else None
+    event_time, queryable_at = watermark.get('event_time'), watermark.get('queryable_at')
+    commit_lag = max(0.0, queryable_at - event_time) if event_time and queryable_at else None
+    backlog_since = watermark.get('backlog_since') or queryable_at
+    if backlog_bytes and event_time and (backlog_since is None or now - backlog_since > grace):
+        lag = max(0.0, now - event_time)
+    else:
+        lag = commit_lag
+    return {**watermark, 'backlog_bytes': backlog_bytes, 'commit_lag_seconds': commit_lag, 'lag_seconds': lag}
+
+def lag_alerts(watermarks: List[Dict], max_seconds: float = INGEST_LAG_ALERT_SECONDS,
+               max_bytes: int = INGEST_LAG_ALERT_BYTES) -> List[str]:
+    """기준을 넘은 지연 설명 목록 (ingest_lag 결과 목록 입력, 없으면 빈 목록)"""
+    alerts = []
+    for watermark in watermarks:
+        lag, backlog = watermark.get('lag_seconds'), watermark.get('backlog_bytes')
+        if lag is not None and lag > max_seconds:
+            alerts.append(f"{watermark['source']}: 지연 {lag:.1f}초 (기준 {max_seconds:.0f}초)")
+        if backlog is not None and backlog > max_bytes:
+            alerts.append(f"{watermark['source']}: 미처리 {backlog / 1024 / 1024:.1f}MB "
+                          f"(기준 {max_bytes / 1024 / 1024:.0f}MB)")
+    return alerts
+
+def worst_lag(watermarks: List[Dict]) -> Optional[Dict]:
+    """지연이 가장 큰 워터마크 (상태 표시용)"""
+    measured = [watermark for watermark in watermarks if watermark.get('lag_seconds') is not None]
+    if not measured:
+        return watermarks[0] if watermarks else None
+    return max(measured, key=lambda watermark: watermark['lag_seconds'])
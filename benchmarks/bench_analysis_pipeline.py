@@ -0,0 +1,173 @@
+# 파일명: benchmarks/bench_analysis_pipeline.py
+"""AI 분석 파이프라인 벤치마크 (가짜 LLM 서버 사용, Azure 자격 증명 불필요)
+
+동시 실행 수별 일괄 분석 처리량, 지연 분위수(p50/p95/p99), 재시도/오류 수와
+스트리밍 첫 토큰 시간을 측정합니다.
+
+실행: python -m benchmarks.bench_analysis_pipeline --requests 200 --concurrency 1 4 16 --rate-429 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.fake_llm_server import FakeLLMConfig, FakeLLMServer
+
+
+def unique_log(index: int) -> dict:
+    """캐시/지문이 겹치지 않는 분석 대상 로그 (숫자는 정규화되므로 영문 토큰 사용)"""
+    token = ''.join(random.choices(string.ascii_lowercase, k=10))
+    return {
+        'id': index,
+        'level': 'ERROR',
+        'message': f"java.lang.IllegalStateException: bench {token} failed\n\tat com.example.Bench.run(Bench.java:1)",
+        'response_time': 0,
+        'timestamp': 'N/A',
+    }
+
+
+def percentile(values, q: float):
+    return round(float(np.percentile(values, q)), 1) if len(values) else None
+
+
+def call_metrics(db_path: str, since: float, kind: str) -> dict:
+    """llm_calls 계측 테이블에서 구간 지연/재시도/오류 집계"""
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute('''
+            SELECT latency_ms, retries, error FROM llm_calls
+            WHERE created_at >= ? AND kind = ? AND cache_hit = 0
+        ''', (since, kind)).fetchall()
+    latencies = [row[0] for row in rows if row[2] is None]
+    return {
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'retries': sum(row[1] for row in rows),
+        'errors': sum(1 for row in rows if row[2] is not None),
+    }
+
+
+def run_batch(analyzer, server: FakeLLMServer, db_path: str, requests: int, concurrency: int) -> dict:
+    """일괄 분석 1회 (동시 실행 수 concurrency)"""
+    logs = [unique_log(i) for i in range(requests)]
+    before = server.stats.snapshot()
+    since = time.time()
+    start = time.perf_counter()
+    results = asyncio.run(analyzer.analyze_logs_batch_async(logs, max_concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+    after = server.stats.snapshot()
+
+    succeeded = sum(1 for result in results.values() if result['error'] is None)
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'succeeded': succeeded,
+        'elapsed_s': round(elapsed, 2),
+        'throughput_rps': round(succeeded / elapsed, 2) if elapsed else None,
+        'server_429': after['errors_429'] - before['errors_429'],
+        'server_500': after['errors_500'] - before['errors_500'],
+        'server_max_in_flight': after['max_in_flight'],
+        **call_metrics(db_path, since, 'batch'),
+    }
+
+
+def run_stream(analyzer, requests: int) -> dict:
+    """순차 스트리밍 분석의 첫 토큰 / 전체 시간"""
+    ttfts, totals, errors = [], [], 0
+    for i in range(requests):
+        log = unique_log(i)
+        stats = {}
+        for _ in analyzer.stream_log_message(log['message'], log['level'], stats=stats):
+            pass
+        if 'error' in stats:
+            errors += 1
+        else:
+            ttfts.append(stats['ttft_ms'])
+            totals.append(stats['total_ms'])
+    return {
+        'requests': requests,
+        'ttft_p50_ms': percentile(ttfts, 50),
+        'ttft_p95_ms': percentile(ttfts, 95),
+        'total_p50_ms': percentile(totals, 50),
+        'errors': errors,
+    }
+
+
+def run(requests: int = 100, concurrency_levels=(1, 4, 16), stream_requests: int = 10,
+        config: FakeLLMConfig = None, rate_limit_rps: float = 1000) -> dict:
+    """가짜 서버를 띄우고 임시 DB로 분석 파이프라인 벤치마크 실행"""
+    if 'backend.config' in sys.modules:
+        raise RuntimeError("backend 설정이 이미 로드되었습니다. 벤치마크는 별도 프로세스에서 실행하세요.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = FakeLLMServer(config=config).start()
+        db_path = os.path.join(tmp, 'bench.db')
+        os.environ.update({
+            'DB_PATH': db_path,
+            'AZURE_OPENAI_ENDPOINT': server.endpoint,
+            'AZURE_OPENAI_KEY': 'fake',
+            'LLM_RATE_LIMIT_RPS': str(rate_limit_rps),
+            'LLM_RATE_LIMIT_BURST': str(rate_limit_rps),
+            'LLM_BACKOFF_BASE': '0.05',
+            'LLM_BACKOFF_MAX': '2',
+        })
+        # 설정은 import 시점에 읽으므로 환경 변수 지정 후 로드
+        from backend.ai_analyzer import get_ai_analyzer
+
+        try:
+            analyzer = get_ai_analyzer()
+            return {
+                'server': server.endpoint,
+                'batch': [run_batch(analyzer, server, db_path, requests, c) for c in concurrency_levels],
+                'stream': run_stream(analyzer, stream_requests) if stream_requests else None,
+            }
+        finally:
+            server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AI 분석 파이프라인 벤치마크 (가짜 LLM 서버)')
+    parser.add_argument('--requests', type=int, default=100, help="동시 실행 수별 분석 요청 수")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--stream-requests', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=200)
+    parser.add_argument('--tokens-per-sec', type=float, default=200)
+    parser.add_argument('--completion-tokens', type=int, default=60)
+    parser.add_argument('--rate-429', type=float, default=0.05)
+    parser.add_argument('--rate-500', type=float, default=0.01)
+    parser.add_argument('--rate-limit-rps', type=float, default=1000, help="클라이언트 토큰 버킷 속도")
+    parser.add_argument('--json', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    config = FakeLLMConfig(latency_ms=args.latency_ms, tokens_per_sec=args.tokens_per_sec,
+                           completion_tokens=args.completion_tokens, rate_429=args.rate_429,
+                           rate_500=args.rate_500, seed=1)
+    result = run(args.requests, args.concurrency, args.stream_requests, config, args.rate_limit_rps)
+
+    print(f"=== 일괄 분석 ({args.requests}건, 429 {args.rate_429:.0%} / 500 {args.rate_500:.0%}) ===")
+    for row in result['batch']:
+        print(f"동시 {row['concurrency']:3d}  {row['throughput_rps']:7.2f} req/s  "
+              f"p50 {row['p50_ms']}ms  p95 {row['p95_ms']}ms  p99 {row['p99_ms']}ms  "
+              f"재시도 {row['retries']}  실패 {row['requests'] - row['succeeded']}  "
+              f"(서버 429 {row['server_429']} / 500 {row['server_500']})")
+    if result['stream']:
+        stream = result['stream']
+        print(f"=== 스트리밍 ({stream['requests']}건) ===")
+        print(f"첫 토큰 p50 {stream['ttft_p50_ms']}ms  p95 {stream['ttft_p95_ms']}ms  "
+              f"전체 p50 {stream['total_p50_ms']}ms  오류 {stream['errors']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
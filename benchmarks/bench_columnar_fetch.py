@@ -0,0 +1,97 @@
+# 파일명: benchmarks/bench_columnar_fetch.py
+"""list[dict] 조회 경로와 컬럼 조회 경로의 지연시간/메모리 비교
+
+실행: python -m benchmarks.bench_columnar_fetch --rows 10000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from backend.db_manager import DatabaseManager
+
+
+def seed_database(db: DatabaseManager, rows: int):
+    """벤치마크용 에러 로그 생성"""
+    levels = ['ERROR', 'FATAL', 'Exception']
+    base = datetime.now() - timedelta(days=1)
+    records = []
+    for i in range(rows):
+        ts = (base + timedelta(seconds=i * 86400 / rows)).strftime('%Y-%m-%d %H:%M:%S')
+        records.append((ts, random.choice(levels),
+                        f'java.lang.RuntimeException: benchmark error {i}\n\tat com.example.Service.run(Service.java:{i % 500})',
+                        random.randint(100, 5000), ts))
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany('''
+            INSERT INTO error_logs (timestamp, level, message, response_time, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', records)
+        conn.commit()
+
+
+def dict_path(db: DatabaseManager, rows: int) -> pd.DataFrame:
+    """기존 경로: list[dict] -> DataFrame -> to_datetime"""
+    df = pd.DataFrame(db.get_recent_logs(limit=rows))
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
+
+
+def columnar_path(db: DatabaseManager, rows: int) -> pd.DataFrame:
+    """컬럼 경로: cursor -> 컬럼 배열 -> DataFrame"""
+    return db.get_recent_logs_frame(limit=rows)
+
+
+def measure(func, db: DatabaseManager, rows: int, repeat: int) -> dict:
+    """중앙값 지연시간과 최대 메모리 사용량 측정"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(db, rows)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func(db, rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'median_ms': round(statistics.median(timings), 2),
+        'min_ms': round(min(timings), 2),
+        'peak_mb': round(peak / 1024 / 1024, 2),
+    }
+
+
+def run(rows: int = 10000, repeat: int = 10) -> dict:
+    """벤치마크 실행 후 결과 반환"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(db_path=os.path.join(tmp, 'bench.db'))
+        seed_database(db, rows)
+        return {
+            'rows': rows,
+            'dict_path': measure(dict_path, db, rows, repeat),
+            'columnar_path': measure(columnar_path, db, rows, repeat),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='컬럼 조회 경로 벤치마크')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.repeat)
+    print(f"=== {result['rows']} rows ===")
+    for name in ('dict_path', 'columnar_path'):
+        stats = result[name]
+        print(f"{name:14s} median {stats['median_ms']:8.2f}ms  min {stats['min_ms']:8.2f}ms  peak {stats['peak_mb']:6.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+# 파일명: benchmarks/bench_suite.py
+"""수집/조회/렌더링 경로 재현 가능 벤치마크 (데이터 규모별, 시드 고정)
+
+쓰기 경로(새 DB): 이벤트 조립/에러 판별, LogMonitor 파일 수집(파싱만 / DatabaseSink 저장),
+insert_log 단건 반복 대비 insert_logs 배치 저장.
+조회 경로(규모별 시드 DB): 최근 로그/검색, 통계/롤업/분위수/시그니처 쿼리,
+차트 데이터 조회 + Plotly figure 생성 + JSON 직렬화(브라우저 전송 크기).
+이상 탐지: 합성 [지문, 분] 행렬(지문 수천 개 × 360분)의 EWMA/계절 점수 계산.
+
+결과는 JSON(커밋, Python/SQLite 버전, 플랫폼 포함)으로 저장하고, --compare로
+이전 결과와 비교해 느려진 항목을 표시합니다 (회귀가 있으면 종료 코드 1).
+
+실행: python -m benchmarks.bench_suite --sizes 10k 1m --json results.json --compare baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta, timezone
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+SIZE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+ANOMALY_SIGNATURES = (1_000, 5_000)
+ANOMALY_MINUTES = 360
+
+# 차트 벤치마크 조회 기간
+CHART_RANGES = ('1h', '24h', '7d')
+
+
+def parse_size(value: str) -> int:
+    """'10k', '1m', '10000' 형식의 행 수"""
+    text = value.strip().lower()
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def format_size(rows: int) -> str:
+    for suffix, factor in sorted(SIZE_SUFFIXES.items(), key=lambda item: -item[1]):
+        if rows >= factor and rows % factor == 0:
+            return f"{rows // factor}{suffix}"
+    return str(rows)
+
+
+def measure(func, repeat: int, warmup: int = 1) -> dict:
+    """중앙값/최소/p95 지연시간 (ms)"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(timings[0], 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'repeat': repeat,
+    }
+
+
+def run_meta() -> dict:
+    """결과 비교용 실행 환경 정보"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_sample_log(path: str, events: int, seed: int, error_ratio: float = 0.5) -> int:
+    """LogGenerator 형식의 로그 파일 작성 (에러는 스택 트레이스 포함), 에러 이벤트 수 반환"""
+    import random
+    from benchmarks.seed_data import sample_templates
+
+    rng = random.Random(seed)
+    templates = sample_templates()
+    errors = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(events):
+            ts = f"2024-01-01 00:{i // 60 % 60:02d}:{i % 60:02d}"
+            if rng.random() < error_ratio:
+                level, message, _ = rng.choice(templates)
+                f.write(f"[{ts}] {level}: {message} [{rng.randint(100, 5000)}ms]\n")
+                f.write("\tat com.example.service.OrderService.process(OrderService.java:42)\n")
+                f.write("\tat com.example.web.OrderController.create(OrderController.java:17)\n")
+                errors += 1
+            else:
+                f.write(f"[{ts}] INFO: request {i} completed [{rng.randint(5, 200)}ms]\n")
+    return errors
+
+
+class _CountingSink:
+    """저장 없이 이벤트 수만 세는 sink (파싱/조립 비용만 측정)"""
+
+    def __init__(self):
+        self.events = 0
+
+    def get_checkpoint(self, source):
+        return {'offset': 0, 'inode': None, 'generation': 0}
+
+    def write(self, events, checkpoint):
+        self.events += len(events)
+        return len(events)
+
+
+def _run_monitor(monitor, expected: int, timeout: float = 600) -> float:
+    """처음부터 파일을 수집해 expected개의 에러 이벤트가 sink에 기록될 때까지 걸린 시간 (초)"""
+    monitor.flush_interval = 0.05
+    started = time.perf_counter()
+    monitor.start_monitoring()
+    try:
+        while monitor.stats['inserted'] + monitor.stats['duplicates'] < expected:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"수집 시간 초과 ({monitor.stats})")
+            time.sleep(0.005)
+        return time.perf_counter() - started
+    finally:
+        monitor.stop_monitoring()
+
+
+def bench_ingest(tmp: str, events: int, repeat: int, seed: int) -> dict:
+    """쓰기 경로 벤치마크 (매번 새 DB)"""
+    from backend.analysis_worker import AnalysisWorker
+    from backend.db_manager import DatabaseManager
+    from backend.log_monitor import DatabaseSink, LogMonitor
+
+    log_path = os.path.join(tmp, 'ingest.log')
+    errors = write_sample_log(log_path, events, seed)
+    with open(log_path, 'r', encoding='utf-8') as f:
+        texts = f.read().split('\n[')
+    log_bytes = os.path.getsize(log_path)
+    result = {'events': events, 'error_events': errors, 'log_bytes': log_bytes}
+
+    # 이벤트 1건 에러 판별 + 응답시간 추출
+    parser = LogMonitor(sink=_CountingSink(), log_file=log_path)
+    stats = measure(lambda: [parser._build_event(text) for text in texts], repeat)
+    stats['events_per_sec'] = round(len(texts) / (stats['median_ms'] / 1000))
+    result['build_event'] = stats
+
+    # 파일 tail → 이벤트 조립 (저장 없음)
+    timings = [_run_monitor(LogMonitor(sink=_CountingSink(), log_file=log_path), errors) for _ in range(repeat)]
+    result['tail_parse_only'] = _throughput(timings, events, log_bytes)
+
+    # 파일 tail → DatabaseSink (배치 + 체크포인트 트랜잭션, 사전 분석 워커는 중지 상태)
+    worker = AnalysisWorker()
+    timings = []
+    for i in range(repeat):
+        db = DatabaseManager(db_path=os.path.join(tmp, f'ingest_{i}.db'))
+        db.insert_logs([], checkpoint={'source': os.path.abspath(log_path), 'offset': 0,
+                                       'inode': os.stat(log_path).st_ino})
+        timings.append(_run_monitor(LogMonitor(sink=DatabaseSink(db, worker), log_file=log_path), errors))
+    result['tail_database_sink'] = _throughput(timings, events, log_bytes)
+
+    # 단건 insert_log 반복 vs insert_logs 배치
+    rows = [event for event in (parser._build_event(text) for text in texts) if event is not None]
+    single_rows = rows[:min(len(rows), 2000)]
+    db = DatabaseManager(db_path=os.path.join(tmp, 'insert_single.db'))
+    stats = measure(lambda: [db.insert_log(row['level'], row['message'], row['response_time'])
+                             for row in single_rows], repeat=max(1, repeat // 2), warmup=0)
+    stats['rows'] = len(single_rows)
+    stats['rows_per_sec'] = round(len(single_rows) / (stats['median_ms'] / 1000))
+    result['insert_log_single'] = stats
+
+    db = DatabaseManager(db_path=os.path.join(tmp, 'insert_batch.db'))
+    batch_size = 500
+
+    def insert_batches():
+        for start in range(0, len(rows), batch_size):
+            db.insert_logs(rows[start:start + batch_size])
+
+    stats = measure(insert_batches, repeat, warmup=0)
+    stats['rows'] = len(rows)
+    stats['rows_per_sec'] = round(len(rows) / (stats['median_ms'] / 1000))
+    result['insert_logs_batch'] = stats
+    return result
+
+
+def _throughput(timings, events: int, log_bytes: int) -> dict:
+    median = statistics.median(timings)
+    return {
+        'median_ms': round(median * 1000, 1),
+        'min_ms': round(min(timings) * 1000, 1),
+        'events_per_sec': round(events / median),
+        'mb_per_sec': round(log_bytes / median / 1024 / 1024, 2),
+        'repeat': len(timings),
+    }
+
+
+def bench_queries(db_path: str, rows: int, repeat: int, seed: int) -> dict:
+    """조회/렌더링 경로 벤치마크 (규모별 시드 DB, 데이터 기준 시각 고정)"""
+    from backend.db_manager import DatabaseManager
+    from benchmarks.seed_data import ensure_seeded
+    from frontend.charts import build_error_chart_figure, load_error_chart_data
+
+    started = time.perf_counter()
+    anchor = ensure_seeded(db_path, rows, seed=seed).replace(tzinfo=KST)
+    seed_seconds = time.perf_counter() - started
+    db = DatabaseManager(db_path=db_path)
+    hour_ago, day_ago, week_ago = anchor - timedelta(hours=1), anchor - timedelta(days=1), anchor - timedelta(days=7)
+
+    cases = {
+        'get_recent_logs': lambda: db.get_recent_logs(limit=100),
+        'get_recent_logs_search': lambda: db.get_recent_logs(limit=100, search_query='Connection'),
+        'get_recent_logs_frame': lambda: db.get_recent_logs_frame(limit=1000),
+        'search_logs_frame_24h': lambda: db.search_logs_frame('Timeout', day_ago, anchor, limit=100),
+        'error_stats_last_hour': db.get_error_stats_last_hour,
+        'error_stats_frame_1h': lambda: db.get_error_stats_frame(hour_ago, anchor),
+        'rollup_series_24h_5m': lambda: db.get_rollup_series(day_ago, anchor, bucket_seconds=300),
+        'rollup_series_7d_1h': lambda: db.get_rollup_series(week_ago, anchor, bucket_seconds=3600),
+        'percentiles_24h': lambda: db.get_response_time_percentiles(day_ago, anchor),
+        'percentile_series_7d_1h': lambda: db.get_percentile_series(week_ago, anchor, bucket_seconds=3600),
+        'top_signatures_24h': lambda: db.get_top_signatures(day_ago, anchor),
+    }
+    result = {'rows': rows, 'seed_seconds': round(seed_seconds, 1),
+              'queries': {name: measure(func, repeat) for name, func in cases.items()}, 'charts': {}}
+
+    for range_key in CHART_RANGES:
+        data = load_error_chart_data(db, range_key, now=anchor)
+        figure = build_error_chart_figure(*data, range_key, now=anchor)
+        payload = figure.to_json()
+        result['charts'][range_key] = {
+            'load': measure(lambda: load_error_chart_data(db, range_key, now=anchor), repeat),
+            'figure': measure(lambda: build_error_chart_figure(*data, range_key, now=anchor), repeat),
+            'to_json': measure(figure.to_json, repeat),
+            'json_bytes': len(payload.encode('utf-8')),
+        }
+    return result
+
+
+def bench_anomaly(repeat: int, seed: int) -> dict:
+    """지문 수별 이상 탐지 점수 계산 (포아송 합성 데이터, 갱신 주기 안에 끝나는지 확인)"""
+    import numpy as np
+    from backend.anomaly import score_anomalies
+
+    rng = np.random.default_rng(seed)
+    result = {}
+    for signatures in ANOMALY_SIGNATURES:
+        matrix = rng.poisson(2.0, (signatures, ANOMALY_MINUTES)).astype(np.float64)
+        season_matrix = rng.poisson(2.0, (signatures, ANOMALY_MINUTES)).astype(np.float64)
+        result[f"score_{signatures}x{ANOMALY_MINUTES}"] = measure(lambda: score_anomalies(matrix, season_matrix), repeat)
+    return result
+
+
+def run(sizes=(10_000,), ingest_events: int = 20_000, repeat: int = 5, seed: int = 42,
+        data_dir: str = None, skip_ingest: bool = False) -> dict:
+    """벤치마크 실행 후 결과 반환 (data_dir을 지정하면 시드 DB를 재사용)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # 전역 인스턴스(분석기 등)가 실제 logs.db를 건드리지 않도록 임시 DB 사용
+        os.environ['DB_PATH'] = os.path.join(tmp, 'global.db')
+        result = {'meta': run_meta(), 'config': {
+            'sizes': list(sizes), 'ingest_events': ingest_events, 'repeat': repeat, 'seed': seed,
+        }}
+        if not skip_ingest:
+            result['ingest'] = bench_ingest(tmp, ingest_events, repeat, seed)
+        result['read'] = {}
+        for rows in sizes:
+            directory = data_dir or tmp
+            os.makedirs(directory, exist_ok=True)
+            db_path = os.path.join(directory, f"bench_{format_size(rows)}_seed{seed}.db")
+            result['read'][format_size(rows)] = bench_queries(db_path, rows, repeat, seed)
+        result['anomaly'] = bench_anomaly(repeat, seed)
+        return result
+
+
+def flatten(result: dict) -> dict:
+    """비교용 {항목 경로: median_ms}"""
+    flat = {}
+
+    def walk(node, path):
+        if isinstance(node, dict):
+            if 'median_ms' in node:
+                flat['.'.join(path)] = node['median_ms']
+                return
+            for key, value in node.items():
+                if key not in ('meta', 'config'):
+                    walk(value, path + [key])
+
+    walk(result, [])
+    return flat
+
+
+def compare(old: dict, new: dict, threshold: float = 0.2, min_ms: float = 1.0):
+    """이전 결과 대비 중앙값 변화 목록과 회귀 항목 (threshold 비율 이상 + min_ms 이상 느려진 경우)"""
+    old_flat, new_flat = flatten(old), flatten(new)
+    rows, regressions = [], []
+    for name, value in new_flat.items():
+        before = old_flat.get(name)
+        if before is None:
+            continue
+        change = (value - before) / before if before else 0.0
+        regressed = change >= threshold and value - before >= min_ms
+        rows.append((name, before, value, change, regressed))
+        if regressed:
+            regressions.append(name)
+    return rows, regressions
+
+
+def print_report(result: dict):
+    meta = result['meta']
+    print(f"=== commit {meta['commit']} · Python {meta['python']} · SQLite {meta['sqlite']} · {meta['platform']} ===")
+    for name, stats in flatten(result).items():
+        print(f"{name:55s} {stats:10.2f}ms")
+    for size, read in result['read'].items():
+        for range_key, chart in read['charts'].items():
+            print(f"read.{size}.charts.{range_key}.json_bytes{'':22s} {chart['json_bytes'] / 1024:10.1f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='수집/조회/렌더링 벤치마크')
+    parser.add_argument('--sizes', nargs='+', default=['10k'], help="조회 벤치마크 데이터 규모 (예: 10k 1m 10m)")
+    parser.add_argument('--ingest-events', type=int, default=20000, help="수집 벤치마크 로그 이벤트 수")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', help="시드 DB 보관 디렉토리 (같은 규모/시드면 재사용)")
+    parser.add_argument('--skip-ingest', action='store_true', help="수집 벤치마크 생략")
+    parser.add_argument('--json', help="결과 JSON 저장 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀 판정 비율 (기본 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    result = run([parse_size(size) for size in args.sizes], args.ingest_events, args.repeat,
+                 args.seed, args.data_dir, args.skip_ingest)
+    print_report(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows, regressions = compare(baseline, result, args.threshold)
+        print(f"\n=== 비교: {baseline['meta'].get('commit')} → {result['meta']['commit']} ===")
+        for name, before, after, change, regressed in rows:
+            print(f"{name:55s} {before:10.2f} → {after:10.2f}ms {change:+7.1%}{'  ⚠ 회귀' if regressed else ''}")
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건 (기준 +{args.threshold:.0%})")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
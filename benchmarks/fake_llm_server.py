@@ -0,0 +1,274 @@
+# 파일명: benchmarks/fake_llm_server.py
+"""Azure OpenAI / OpenAI 호환 가짜 Chat Completions 서버 (표준 라이브러리만 사용)
+
+응답 지연, 토큰 생성 속도, SSE 스트리밍, 429/500 오류 주입을 설정할 수 있습니다.
+LogAnalysisChain을 연결하려면 .env 또는 환경 변수로 다음을 지정합니다.
+
+    AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8799
+    AZURE_OPENAI_KEY=fake
+
+실행: python -m benchmarks.fake_llm_server --port 8799 --latency-ms 300 --tokens-per-sec 50 --rate-429 0.1
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from backend.prompt_budget import estimate_tokens
+
+# 응답 본문 (LogAnalysisChain의 "원인 분석/해결 방안" 형식)
+RESPONSE_TEMPLATE = (
+    "원인 분석:\n- 데이터베이스 커넥션 풀이 고갈되어 요청이 대기하다 타임아웃이 발생했습니다.\n"
+    "- 장시간 실행되는 쿼리 또는 반환되지 않은 커넥션이 원인일 수 있습니다.\n\n"
+    "해결 방안:\n- 커넥션 풀 크기와 connectionTimeout 설정을 점검하세요.\n"
+    "- 느린 쿼리를 찾아 인덱스를 추가하고 커넥션 누수를 확인하세요.\n"
+)
+
+_WORD_PATTERN = re.compile(r'\S+\s*')
+
+
+class FakeLLMConfig:
+    """가짜 서버 동작 설정"""
+
+    def __init__(self, latency_ms: float = 200, jitter_ms: float = 50, tokens_per_sec: float = 100,
+                 completion_tokens: int = 80, rate_429: float = 0.0, rate_500: float = 0.0,
+                 retry_after: Optional[float] = None, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.completion_tokens = completion_tokens
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+
+class FakeLLMStats:
+    """요청 통계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.streams = 0
+        self.errors_429 = 0
+        self.errors_500 = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def begin(self, stream: bool):
+        with self._lock:
+            self.requests += 1
+            self.streams += int(stream)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def end(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def error(self, status: int):
+        with self._lock:
+            if status == 429:
+                self.errors_429 += 1
+            else:
+                self.errors_500 += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'streams': self.streams,
+                'errors_429': self.errors_429,
+                'errors_500': self.errors_500,
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+            }
+
+
+def completion_words(count: int) -> list:
+    """응답 본문을 단어(≈토큰) 단위로 count개 생성"""
+    words = _WORD_PATTERN.findall(RESPONSE_TEMPLATE)
+    return [words[i % len(words)] for i in range(count)]
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    """/chat/completions 요청 처리 (Azure 배포 경로와 OpenAI /v1 경로 모두 허용)"""
+
+    protocol_version = 'HTTP/1.1'
+    config: FakeLLMConfig = None
+    stats: FakeLLMStats = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send_json(200, self.stats.snapshot())
+        else:
+            self._send_json(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.split('?')[0].endswith('/chat/completions'):
+            self._send_json(404, {'error': {'code': 'DeploymentNotFound', 'message': 'not found'}})
+            return
+
+        stream = bool(request.get('stream'))
+        self.stats.begin(stream)
+        try:
+            self._handle_completion(request, stream)
+        finally:
+            self.stats.end()
+
+    def _handle_completion(self, request: dict, stream: bool):
+        config = self.config
+        roll = config.random.random()
+        if roll < config.rate_429:
+            self.stats.error(429)
+            headers = {'Retry-After': str(config.retry_after)} if config.retry_after is not None else None
+            self._send_json(429, {'error': {'code': '429', 'message': 'Rate limit exceeded'}}, headers)
+            return
+        if roll < config.rate_429 + config.rate_500:
+            self.stats.error(500)
+            self._send_json(500, {'error': {'code': 'InternalServerError', 'message': 'Injected failure'}})
+            return
+
+        # 첫 토큰까지 지연
+        delay_ms = max(0.0, config.random.gauss(config.latency_ms, config.jitter_ms))
+        time.sleep(delay_ms / 1000)
+
+        prompt_tokens = sum(estimate_tokens(str(m.get('content', ''))) for m in request.get('messages', []))
+        words = completion_words(config.completion_tokens)
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': len(words),
+            'total_tokens': prompt_tokens + len(words),
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = request.get('model') or 'fake-gpt'
+
+        if not stream:
+            time.sleep(len(words) / config.tokens_per_sec if config.tokens_per_sec > 0 else 0)
+            self._send_json(200, {
+                'id': completion_id, 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': ''.join(words)}}],
+                'usage': usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        def send_event(payload):
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        interval = 1 / config.tokens_per_sec if config.tokens_per_sec > 0 else 0
+        for index, word in enumerate(words):
+            if index and interval:
+                time.sleep(interval)
+            send_event({
+                'id': completion_id, 'object': 'chat.completion.chunk', 'created': int(time.time()), 'model': model,
+                'choices': [{'index': 0, 'delta': {'content': word}, 'finish_reason': None}],
+            })
+        send_event({
+            'id': completion_id, 'object': 'chat.completion.chunk', 'created': int(time.time()), 'model': model,
+            'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+        })
+        if (request.get('stream_options') or {}).get('include_usage'):
+            send_event({'id': completion_id, 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                        'model': model, 'choices': [], 'usage': usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    # 동시 접속 부하 테스트에서 연결이 거부되지 않도록 대기열 확대
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FakeLLMServer:
+    """백그라운드 스레드에서 동작하는 가짜 LLM 서버 (port=0이면 임의 포트)"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, config: Optional[FakeLLMConfig] = None):
+        self.config = config or FakeLLMConfig()
+        self.stats = FakeLLMStats()
+        handler = type('BoundFakeLLMHandler', (FakeLLMHandler,), {'config': self.config, 'stats': self.stats})
+        self.httpd = _FakeHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeLLMServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Azure OpenAI 호환 가짜 LLM 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--latency-ms', type=float, default=200, help="첫 토큰까지 평균 지연")
+    parser.add_argument('--jitter-ms', type=float, default=50, help="지연 표준편차")
+    parser.add_argument('--tokens-per-sec', type=float, default=100, help="토큰 생성 속도")
+    parser.add_argument('--completion-tokens', type=int, default=80, help="응답 토큰 수")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument('--rate-500', type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument('--retry-after', type=float, default=None, help="429 응답의 Retry-After (초)")
+    parser.add_argument('--seed', type=int, default=None)
+    return parser
+
+
+def config_from_args(args) -> FakeLLMConfig:
+    return FakeLLMConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, tokens_per_sec=args.tokens_per_sec,
+        completion_tokens=args.completion_tokens, rate_429=args.rate_429, rate_500=args.rate_500,
+        retry_after=args.retry_after, seed=args.seed,
+    )
+
+
+def main():
+    args = build_parser().parse_args()
+    server = FakeLLMServer(args.host, args.port, config_from_args(args))
+    print(f"가짜 LLM 서버 시작: {server.endpoint} (통계: {server.endpoint}/stats)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"종료: {server.stats.snapshot()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# 파일명: benchmarks/seed_data.py
+"""벤치마크용 error_logs 데이터 생성 (LogGenerator 샘플 메시지 기반, 시드 고정)
+
+실행: python -m benchmarks.seed_data --rows 1000000 --db /tmp/bench_1m.db
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from backend.db_manager import DatabaseManager
+from backend.fingerprint import message_fingerprint
+from backend.log_generator import LogGenerator
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+# 데이터 기준 시각 저장 테이블 (재사용한 DB에서도 같은 구간을 조회하도록)
+META_TABLE = 'bench_meta'
+
+
+def sample_templates():
+    """LogGenerator 샘플 에러 (레벨, 메시지, 지문) 목록"""
+    return [
+        (group['level'], message, message_fingerprint(group['level'], message))
+        for group in LogGenerator().sample_errors
+        for message in group['messages']
+    ]
+
+
+def read_anchor(db_path: str):
+    """시드 데이터의 기준 시각 (마지막 이벤트 시각, KST 벽시계)과 행 수, 없으면 None"""
+    with sqlite3.connect(db_path) as conn:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (META_TABLE,)
+        ).fetchone()
+        if not exists:
+            return None
+        row = conn.execute(f'SELECT anchor, rows FROM {META_TABLE}').fetchone()
+    return (datetime.strptime(row[0], '%Y-%m-%d %H:%M:%S'), row[1]) if row else None
+
+
+def seed_database(db_path: str, rows: int, days: float = 7, seed: int = 42, chunk_size: int = 200_000) -> datetime:
+    """rows개의 에러 로그를 최근 days일에 고르게 분포시켜 저장하고 기준 시각 반환
+
+    집계 테이블(분 단위 롤업, 응답시간 히스토그램)은 DatabaseManager 초기화 시 한 번에 채웁니다.
+    """
+    rng = random.Random(seed)
+    templates = sample_templates()
+    weights = [6 if level == 'ERROR' else 1 if level == 'FATAL' else 3 for level, _, _ in templates]
+    anchor = datetime.now(KST).replace(tzinfo=None, second=0, microsecond=0)
+    start = anchor - timedelta(days=days)
+    step = days * 86400 / max(1, rows)
+
+    # 테이블만 만들고 (집계는 비어 있는 상태) 대량 삽입
+    DatabaseManager(db_path=db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        for chunk_start in range(0, rows, chunk_size):
+            records = []
+            for i in range(chunk_start, min(rows, chunk_start + chunk_size)):
+                level, message, fingerprint = templates[rng.choices(range(len(templates)), weights)[0]]
+                ts = (start + timedelta(seconds=i * step)).strftime('%Y-%m-%d %H:%M:%S')
+                response_time = min(30000, int(rng.lognormvariate(6.5, 0.8)))
+                records.append((ts, level, message, response_time, ts, fingerprint))
+            conn.executemany('''
+                INSERT INTO error_logs (timestamp, level, message, response_time, created_at, fingerprint)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', records)
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {META_TABLE} (anchor TEXT NOT NULL, rows INTEGER NOT NULL)')
+        conn.execute(f'DELETE FROM {META_TABLE}')
+        conn.execute(f'INSERT INTO {META_TABLE} VALUES (?, ?)', (anchor.strftime('%Y-%m-%d %H:%M:%S'), rows))
+        conn.commit()
+
+    # 비어 있는 집계 테이블을 기존 데이터로 채움
+    DatabaseManager(db_path=db_path)
+    return anchor
+
+
+def ensure_seeded(db_path: str, rows: int, days: float = 7, seed: int = 42) -> datetime:
+    """같은 행 수로 시드된 DB가 있으면 재사용, 없으면 새로 생성 후 기준 시각 반환"""
+    if os.path.exists(db_path):
+        existing = read_anchor(db_path)
+        if existing and existing[1] == rows:
+            return existing[0]
+        os.remove(db_path)
+    return seed_database(db_path, rows, days, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 에러 로그 DB 생성')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--days', type=float, default=7)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db', required=True, help="생성할 SQLite 파일")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    anchor = seed_database(args.db, args.rows, args.days, args.seed)
+    print(f"{args.rows}행 생성 ({time.perf_counter() - started:.1f}초, 기준 시각 {anchor})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,6 @@
 # 파일명: frontend/app.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, date, timedelta, timezone
 import sys
 import os
@@ -14,11 +12,18 @@ KST = timezone(timedelta(hours=9))
 # 백엔드 모듈 import를 위한 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.db_manager import db_manager
-from backend.ai_analyzer import ai_analyzer  # ai_analyzer로 복원 (내부적으로 LangChain 사용)
-from backend.log_monitor import log_monitor
-from backend.log_generator import log_generator
-from backend.config import REFRESH_INTERVAL
+# 백엔드 전역 인스턴스는 첫 사용 시 생성 (LangChain은 첫 분석 요청 시 로드)
+from backend.db_manager import get_db_manager
+from backend.ai_analyzer import get_ai_analyzer
+from backend.ingest_daemon import read_health
+from backend.watermark import ingest_lag, worst_lag
+from backend.config import (
+    REFRESH_INTERVAL, RENDER_PROFILE, RENDER_PROFILE_DIR, RENDER_PROFILE_SLOW_MS, validate_azure_config,
+)
+from frontend.charts import (
+    TIME_RANGE_OPTIONS, build_error_chart_figure, load_anomaly_markers, load_error_chart_data,
+)
+from frontend.profiler import RenderProfiler, instrument, start_render_profiler
 
 # Streamlit 페이지 설정
 st.set_page_config(
@@ -28,6 +33,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 렌더링 프로파일 (선택, 켜져 있으면 이번 rerun의 구간/백엔드 호출/전송 바이트 측정)
+profiler = start_render_profiler(RENDER_PROFILE, RENDER_PROFILE_SLOW_MS, RENDER_PROFILE_DIR)
+if isinstance(profiler, RenderProfiler):
+    instrument(get_db_manager(), 'db')
+    instrument(get_ai_analyzer(), 'ai_analyzer')
+
 # 현대적이고 깔끔한 CSS 스타일 + JavaScript 적용
 st.markdown("""
 <style>
@@ -376,6 +387,16 @@ st.markdown("""
         margin-right: 8px;
     }
     
+    .status-lagging {
+        display: inline-block;
+        width: 10px;
+        height: 10px;
+        background-color: #FFC107;
+        border-radius: 50%;
+        margin-right: 8px;
+        animation: pulse 1s infinite;
+    }
+    
     @keyframes pulse {
         0% { opacity: 1; }
         50% { opacity: 0.5; }
@@ -609,13 +630,7 @@ function showCopySuccess(buttonId) {
 }
 </script>
 """, unsafe_allow_html=True)
-
-def initialize_services():
-    """서비스 초기화"""
-    if 'services_initialized' not in st.session_state:
-        log_monitor.start_monitoring()
-        log_generator.start_generating()
-        st.session_state.services_initialized = True
+profiler.mark("CSS/스크립트 주입")
 
 def get_recent_errors_by_time(minutes=60):
     """지정된 시간(분) 내의 에러 로그 개수와 이전 기간 대비 비교 반환"""
@@ -679,59 +694,18 @@ def get_recent_errors_by_time(minutes=60):
         st.error(f"에러 수 조회 실패: {e}")
         return 0, "조회 실패", "normal"
 
-def get_realtime_error_stats():
-    """최근 1시간 에러 통계 생성 (5분 단위)"""
+def get_realtime_error_stats(range_key: str = '1h'):
+    """선택 기간의 에러 통계 생성 (사전 집계 테이블 기반)
+    
+    반환: (막대용 집계 DataFrame, 응답시간 라인용 DataFrame,
+          구간별 p50/p95/p99 DataFrame, 집계 간격(초))
+    """
     try:
-        import sqlite3
-        from backend.config import DB_PATH
-        
-        # 현재 시간에서 1시간 전까지 (KST 기준)
-        now = datetime.now(KST)
-        one_hour_ago = now - timedelta(hours=1)
-        
-        # 5분 단위로 시간 구간 생성 (더 세밀한 모니터링)
-        time_buckets = []
-        current_time = one_hour_ago
-        while current_time <= now:
-            time_buckets.append(current_time)
-            current_time += timedelta(minutes=5)
-        
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            
-            stats_data = []
-            
-            for i in range(len(time_buckets) - 1):
-                bucket_start = time_buckets[i]
-                bucket_end = time_buckets[i + 1]
-                
-                bucket_start_str = bucket_start.strftime('%Y-%m-%d %H:%M:%S')
-                bucket_end_str = bucket_end.strftime('%Y-%m-%d %H:%M:%S')
-                
-                # 해당 시간 구간의 에러 수와 평균 응답시간
-                cursor.execute('''
-                    SELECT 
-                        COUNT(*) as error_count,
-                        AVG(response_time) as avg_response_time
-                    FROM error_logs 
-                    WHERE timestamp >= ? AND timestamp < ?
-                ''', (bucket_start_str, bucket_end_str))
-                
-                result = cursor.fetchone()
-                error_count = result[0] if result[0] else 0
-                avg_response_time = result[1] if result[1] else 0
-                
-                stats_data.append({
-                    'time_bucket': bucket_start,
-                    'error_count': error_count,
-                    'avg_response_time': round(avg_response_time, 1)
-                })
-            
-            return stats_data
+        return load_error_chart_data(get_db_manager(), range_key)
             
     except Exception as e:
         st.error(f"통계 조회 실패: {e}")
-        return []
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), 300
 
 def create_copy_button_component(button_id, analysis_text, button_text="분석 결과 복사"):
     """Streamlit 컴포넌트 방식으로 클립보드 복사 버튼 생성"""
@@ -835,6 +809,52 @@ def create_copy_button_component(button_id, analysis_text, button_text="분석 
     # HTML 컴포넌트로 렌더링
     st.components.v1.html(component_html, height=80)
 
+def stream_analysis_result(log_id):
+    """AI 분석을 스트리밍으로 표시하고 (전체 텍스트, 시간 통계) 반환"""
+    stats = {}
+    placeholder = st.empty()
+    with placeholder.container():
+        st.markdown("#### 🔍 AI가 로그를 분석 중입니다...")
+        analysis_text = st.write_stream(get_ai_analyzer().stream_error_log(log_id, stats))
+    # 스트리밍 완료 후 아래에서 섹션별 형식으로 다시 표시
+    placeholder.empty()
+    return analysis_text if isinstance(analysis_text, str) else ''.join(map(str, analysis_text)), stats
+
+def show_reuse_candidates(log_id):
+    """유사한 과거 분석 재사용 선택 화면 (후보가 없으면 False)"""
+    candidates = get_ai_analyzer().get_reuse_candidates(log_id)
+    if not candidates:
+        return False
+    
+    st.info("LLM 호출 전에 유사한 과거 분석을 찾았습니다. 재사용하거나 새로 분석할 수 있습니다.")
+    for index, candidate in enumerate(candidates):
+        with st.expander(f"유사도 {candidate['similarity'] * 100:.0f}% · [{candidate['level']}] "
+                         f"{candidate['normalized_message'][:80]}", expanded=index == 0):
+            st.markdown(candidate['analysis'])
+            if st.button("♻️ 이 분석 재사용", key=f"reuse_{candidate['fingerprint']}"):
+                st.session_state.pop('pending_analysis_log_id', None)
+                st.session_state.analysis_result = candidate['analysis']
+                st.session_state.analysis_stats = {
+                    'reused_from': candidate['fingerprint'],
+                    'similarity': candidate['similarity'],
+                }
+                st.rerun()
+    
+    if st.button("🤖 새로 분석", key="force_new_analysis_button", type="primary"):
+        st.session_state.force_new_analysis = True
+        st.rerun()
+    return True
+
+def render_analysis_timing(stats):
+    """분석 응답 시간 (첫 토큰 / 전체) 표시"""
+    if stats and 'reused_from' in stats:
+        st.caption(f"♻️ 유사한 과거 분석 재사용 (유사도 {stats['similarity'] * 100:.0f}%)")
+    elif stats and stats.get('cache_hit'):
+        st.caption("⚡ 캐시된 분석 결과 (동일 에러 지문)")
+    elif stats and 'total_ms' in stats:
+        ttft_text = f"{stats['ttft_ms']:.0f}ms" if 'ttft_ms' in stats else "-"
+        st.caption(f"⏱️ 첫 토큰 {ttft_text} · 전체 {stats['total_ms']:.0f}ms")
+
 def create_app_header():
     """앱 헤더 생성"""
     st.markdown("""
@@ -844,15 +864,68 @@ def create_app_header():
     </div>
     """, unsafe_allow_html=True)
 
-def create_realtime_error_chart():
-    """에러 통계 차트 생성 - 최근 1시간 기준"""
+def format_bytes(size: int) -> str:
+    """바이트 수 표시 (B/KB/MB)"""
+    if size < 1024:
+        return f"{size}B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.0f}KB"
+    return f"{size / 1024 / 1024:.1f}MB"
+
+def create_ingest_status_bar(ingest_health):
+    """하단 상태바: 수집 워터마크 기반 지연 표시
+
+    데몬이 동작 중이면 health 파일의 실시간 워터마크를, 아니면 DB에 마지막으로 저장된
+    워터마크(ingest_offsets)를 사용합니다.
+    """
+    kst_now = datetime.now(KST)
+    alive = bool(ingest_health and ingest_health['alive'])
+    if alive:
+        watermarks = ingest_health.get('watermarks') or []
+    else:
+        watermarks = [ingest_lag(watermark) for watermark in get_db_manager().get_ingest_watermarks()]
+    watermark = worst_lag(watermarks)
+
+    event_text = ""
+    if watermark and watermark.get('event_time'):
+        event_text = f" · 최신 이벤트 {datetime.fromtimestamp(watermark['event_time'], KST).strftime('%H:%M:%S')}"
+
+    if not alive:
+        status_class, text = 'status-offline', f"수집 중지{event_text}"
+    elif watermark is None or watermark.get('lag_seconds') is None:
+        status_class, text = 'status-online', "수집 대기 중 (아직 저장된 이벤트 없음)"
+    else:
+        status_class = 'status-lagging' if ingest_health.get('lag_alerts') else 'status-online'
+        text = (f"수집 지연 {watermark['lag_seconds']:.1f}초 · "
+                f"미처리 {format_bytes(watermark.get('backlog_bytes') or 0)}{event_text}")
+
+    st.markdown(f"""
+    <div class="status-bar">
+        <span class="{status_class}"></span>
+        {text} | {kst_now.strftime('%H:%M:%S')}
+    </div>
+    """, unsafe_allow_html=True)
+
+def create_realtime_error_chart(range_key: str = None):
+    """에러 통계 차트 생성 - 선택 기간 기준 (집계 간격 자동 선택)"""
     # 표시기 추가
-    col1, col2 = st.columns([3, 1])
+    col1, col2, col3 = st.columns([2, 2, 1])
     
     with col1:
         st.markdown("## 📈 에러 현황")
     
     with col2:
+        if range_key is None:
+            range_key = st.radio(
+                "조회 기간",
+                options=list(TIME_RANGE_OPTIONS.keys()),
+                format_func=lambda key: TIME_RANGE_OPTIONS[key][0],
+                horizontal=True,
+                key="chart_time_range",
+                label_visibility="collapsed"
+            )
+    
+    with col3:
         current_time = datetime.now(KST).strftime('%H:%M:%S')
         st.markdown(f"""
         <div class="realtime-indicator">
@@ -861,160 +934,116 @@ def create_realtime_error_chart():
         </div>
         """, unsafe_allow_html=True)
     
+    range_label = TIME_RANGE_OPTIONS[range_key][0]
+    
     # 데이터 가져오기
-    stats_data = get_realtime_error_stats()
+    df, line_df, percentile_df, bucket_seconds = get_realtime_error_stats(range_key)
     
-    if not stats_data:
-        st.info("📊 최근 1시간 내 에러 데이터가 없습니다.")
+    if df.empty or df['error_count'].sum() == 0:
+        st.info(f"📊 최근 {range_label} 내 에러 데이터가 없습니다.")
         return
     
-    df = pd.DataFrame(stats_data)
-    df['time_bucket'] = pd.to_datetime(df['time_bucket'])
-    
-    # 현재 시간 기준 1시간 범위 설정
-    now = datetime.now(KST)
-    one_hour_ago = now - timedelta(hours=1)
-    
-    # 깔끔한 Plotly 차트 생성
-    fig = go.Figure()
-    
-    # 응답시간 라인 차트
-    fig.add_trace(go.Scatter(
-        x=df['time_bucket'],
-        y=df['avg_response_time'],
-        mode='lines+markers',
-        name='평균 응답시간 (ms)',
-        line=dict(color='#007BFF', width=3),
-        marker=dict(size=8, color='#007BFF'),
-        hovertemplate='<b>%{y:.1f}ms</b><br>%{x|%H:%M}<extra></extra>',
-        connectgaps=False
-    ))
-    
-    # 에러 개수 바 차트 (보조 y축)
-    fig.add_trace(go.Bar(
-        x=df['time_bucket'],
-        y=df['error_count'],
-        name='에러 개수',
-        yaxis='y2',
-        opacity=0.7,
-        marker_color='#DC3545',
-        hovertemplate='<b>%{y}개</b><br>%{x|%H:%M}<extra></extra>',
-        width=300000  # 5분을 밀리초로 변환 (5분 = 300초 = 300,000밀리초)
-    ))
-    
-    # 현재 시간 표시선을 shape으로 추가
-    fig.add_shape(
-        type="line",
-        x0=now,
-        x1=now,
-        y0=0,
-        y1=1,
-        yref="paper",
-        line=dict(
-            color="#28A745",
-            width=2,
-            dash="dash"
-        )
-    )
-    
-    # 현재 시간 주석 추가
-    fig.add_annotation(
-        x=now,
-        y=1,
-        yref="paper",
-        text="현재 시간",
-        showarrow=True,
-        arrowhead=2,
-        arrowsize=1,
-        arrowwidth=1,
-        arrowcolor="#28A745",
-        bgcolor="#28A745",
-        bordercolor="#28A745",
-        borderwidth=1,
-        font=dict(color="white", size=10)
-    )
+    # 지문별 이상 탐지 결과 (수집 데몬이 주기적으로 저장)
+    try:
+        anomaly_df = load_anomaly_markers(get_db_manager(), range_key, bucket_seconds)
+    except Exception as e:
+        st.warning(f"이상 탐지 결과 조회 실패: {e}")
+        anomaly_df = None
     
-    # 깔끔한 레이아웃 설정
-    fig.update_layout(
-        title=dict(
-            text=f'📈 에러 모니터링 (최근 1시간) - 5분 단위',
-            font=dict(size=20, color='#333333', family='Arial'),
-            x=0.5
-        ),
-        xaxis=dict(
-            title='시간 (5분 단위)',
-            color='#333333',
-            gridcolor='#E9ECEF',
-            range=[one_hour_ago, now],  # datetime 객체 사용 (range에서는 지원됨)
-            tickformat='%H:%M',
-            dtick=300000  # 5분 간격 (300초 = 300,000밀리초)
-        ),
-        yaxis=dict(
-            title='평균 응답시간 (ms)',
-            side='left',
-            color='#007BFF',
-            gridcolor='#E9ECEF'
-        ),
-        yaxis2=dict(
-            title='에러 개수',
-            side='right',
-            overlaying='y',
-            color='#DC3545'
-        ),
-        plot_bgcolor='#FFFFFF',
-        paper_bgcolor='#FFFFFF',
-        font=dict(color='#333333', family='Arial'),
-        hovermode='x unified',
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        ),
-        height=450,
-        margin=dict(t=80, b=50, l=50, r=50)
-    )
+    # Plotly 차트 생성 (frontend/charts.py)
+    fig = build_error_chart_figure(df, line_df, percentile_df, bucket_seconds, range_key,
+                                   anomaly_df=anomaly_df)
     
     # 차트 표시
     st.plotly_chart(fig, use_container_width=True)
 
-def perform_error_search(query: str, start_datetime: datetime, end_datetime: datetime):
-    """에러 검색 실행"""
-    try:
-        start_str = start_datetime.strftime('%Y-%m-%d %H:%M:%S')
-        end_str = end_datetime.strftime('%Y-%m-%d %H:%M:%S')
-        
-        import sqlite3
-        from backend.config import DB_PATH
-        
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            
-            sql_query = '''
-                SELECT id, timestamp, level, message, response_time
-                FROM error_logs
-                WHERE timestamp BETWEEN ? AND ?
-            '''
-            params = [start_str, end_str]
-            
-            if query and query.strip():
-                sql_query += ' AND message LIKE ?'
-                params.append(f'%{query}%')
-            
-            sql_query += ' ORDER BY timestamp DESC LIMIT 100'
+HEAVY_HITTER_WINDOW_LABELS = {'5m': '5분', '1h': '1시간', '24h': '24시간'}
+
+def trend_arrow(count: int, previous: int) -> str:
+    """직전 윈도우 대비 추세 표시 (±20% 이내는 보합)"""
+    if not previous:
+        return "🆕 신규" if count else "→"
+    change = (count - previous) / previous
+    if change > 0.2:
+        return f"↑ {change:+.0%}"
+    if change < -0.2:
+        return f"↓ {change:+.0%}"
+    return f"→ {change:+.0%}"
+
+def display_heavy_hitters():
+    """실시간 상위 에러 지문 (수집 데몬이 게시한 스냅샷, 직전 윈도우 대비 추세)"""
+    st.markdown("## 🔥 실시간 상위 에러")
+    window_key = st.radio("윈도우", list(HEAVY_HITTER_WINDOW_LABELS), horizontal=True, key="heavy_hitter_window",
+                          format_func=HEAVY_HITTER_WINDOW_LABELS.get, label_visibility="collapsed")
+    
+    rows = get_db_manager().get_heavy_hitters(window_key)
+    if not rows:
+        st.info("수집 데몬이 게시한 상위 에러 스냅샷이 없습니다. (`python main.py ingest` 실행 필요)")
+        return
+    
+    hitter_df = pd.DataFrame([
+        {
+            '순위': row['rank'],
+            '추세': trend_arrow(row['count'], row['previous_count']),
+            '건수': row['count'],
+            '이전': row['previous_count'],
+            '레벨': row['level'] or '',
+            '메시지': row['message'].splitlines()[0][:120] if row['message'] else row['fingerprint'],
+        }
+        for row in rows
+    ])
+    st.dataframe(hitter_df, use_container_width=True, hide_index=True)
+    st.caption(f"{HEAVY_HITTER_WINDOW_LABELS[window_key]} 전체 {rows[0]['window_total']:,}건 · "
+               f"건수는 최대 +{rows[0]['error_bound']:,} 과대 추정될 수 있음 · 갱신 {rows[0]['updated_at'][11:]}")
+
+def display_incidents(minutes: int = 60):
+    """최근 구간의 연관 에러 묶음(인시던트) 목록과 인시던트 단위 AI 분석"""
+    st.markdown(f"## 🧩 인시던트 (최근 {minutes}분)")
+    
+    now = datetime.now(KST)
+    incidents = get_ai_analyzer().find_incidents(now - timedelta(minutes=minutes), now)
+    if not incidents:
+        st.info("최근 연관 에러 묶음이 없습니다.")
+        return
+    
+    if incidents[0]['truncated']:
+        st.caption(f"⚠️ 로그가 많아 {incidents[0]['sampled_since']} 이전 로그는 제외하고 집계했습니다")
+    
+    analyses = st.session_state.setdefault('incident_analyses', {})
+    for incident in incidents[:5]:
+        title = (f"[{incident['level']}] 시그니처 {len(incident['signatures'])}개 · "
+                 f"{incident['total_count']}건 · {incident['first_seen'][11:]} ~ {incident['last_seen'][11:]}")
+        with st.expander(title, expanded=incident['incident_id'] in analyses):
+            signature_df = pd.DataFrame([
+                {
+                    '레벨': signature['level'],
+                    '건수': signature['count'],
+                    '최초': signature['first_seen'],
+                    '최근': signature['last_seen'],
+                    '메시지': signature['message'].splitlines()[0][:120] if signature['message'] else '',
+                }
+                for signature in incident['signatures']
+            ])
+            st.dataframe(signature_df, use_container_width=True, hide_index=True)
             
-            cursor.execute(sql_query, params)
-            columns = [description[0] for description in cursor.description]
-            rows = cursor.fetchall()
+            if st.button("🤖 인시던트 분석", key=f"incident_{incident['incident_id']}"):
+                with st.spinner("인시던트 분석 중..."):
+                    analyses[incident['incident_id']] = get_ai_analyzer().analyze_incident(incident)
             
-            results = [dict(zip(columns, row)) for row in rows]
-            return results
+            result = analyses.get(incident['incident_id'])
+            if result:
+                if result['cached']:
+                    st.caption("⚡ 캐시된 분석 결과")
+                st.markdown(result['analysis'])
+
+def perform_error_search(query: str, start_datetime: datetime, end_datetime: datetime):
+    """에러 검색 실행 (DataFrame 반환)"""
+    try:
+        return get_db_manager().search_logs_frame(query, start_datetime, end_datetime, limit=100)
             
     except Exception as e:
         st.error(f"검색 중 오류가 발생했습니다: {e}")
-        return []
+        return pd.DataFrame()
 
 def show_search_results_popup():
     """검색 결과 팝업 표시"""
@@ -1057,9 +1086,9 @@ def show_search_results_popup():
                 st.rerun()
         
         # 검색 결과 처리
-        results = st.session_state.get('search_results', [])
+        results = st.session_state.get('search_results')
         
-        if not results:
+        if results is None or len(results) == 0:
             st.markdown("""
             <div class="warning-card">
                 <h3 style="color: #856404; margin: 0 0 1rem 0;">🔍 검색 결과가 없습니다</h3>
@@ -1088,7 +1117,8 @@ def show_search_results_popup():
             current_page = st.session_state.current_page
             start_idx = (current_page - 1) * ITEMS_PER_PAGE
             end_idx = min(start_idx + ITEMS_PER_PAGE, total_items)
-            current_results = results[start_idx:end_idx]
+            # 현재 페이지 행만 dict로 변환
+            current_results = results.iloc[start_idx:end_idx].to_dict('records')
             
             # 검색 결과 요약
             st.markdown(f"""
@@ -1116,7 +1146,8 @@ def show_search_results_popup():
                     table_data.append({
                         '순번': global_index,
                         'ID': log['id'],
-                        '발생시간': log['timestamp'],
+                        # 변환 못 한 시각(NaT)이 한 행 있어도 검색 결과 전체가 깨지지 않도록
+                        '발생시간': '-' if pd.isna(log['timestamp']) else log['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
                         '레벨': log['level'],
                         '에러 메시지': message_preview,
                         '응답시간(ms)': log['response_time'],
@@ -1216,18 +1247,12 @@ def show_search_results_popup():
                             use_container_width=True,
                             help="선택된 로그를 AI로 분석합니다"
                         ):
-                            with st.spinner("🔍 AI가 로그를 분석 중입니다..."):
-                                try:
-                                    # ai_analyzer를 통한 분석 (내부적으로 LangChain 사용)
-                                    analysis_result = ai_analyzer.analyze_error_log(selected_log['id'])
-                                    st.session_state[f'analysis_result_{selected_log["id"]}'] = analysis_result
-                                    st.session_state.selected_analysis_result = analysis_result
-                                    st.session_state.show_analysis_popup = True
-                                    st.session_state.auto_scroll_to_analysis = True  # 자동 스크롤 플래그
-                                    st.success("✅ 분석 완료! 아래로 스크롤하여 결과를 확인하세요.")
-                                    st.rerun()
-                                except Exception as e:
-                                    st.error(f"❌ 분석 실패: {e}")
+                            # 분석은 결과 팝업에서 스트리밍으로 진행
+                            st.session_state.pending_popup_analysis_log_id = selected_log['id']
+                            st.session_state.selected_analysis_result = ''
+                            st.session_state.show_analysis_popup = True
+                            st.session_state.auto_scroll_to_analysis = True  # 자동 스크롤 플래그
+                            st.rerun()
                         
                         # 분석 결과 보기 버튼
                         if st.session_state.get(f'analysis_result_{selected_log["id"]}'):
@@ -1401,7 +1426,16 @@ def show_analysis_popup():
                 st.session_state.show_analysis_popup = False
                 st.rerun()
         
+        # 대기 중인 분석이 있으면 토큰 단위로 표시하며 실행
+        pending_log_id = st.session_state.pop('pending_popup_analysis_log_id', None)
+        if pending_log_id is not None:
+            analysis_result, stats = stream_analysis_result(pending_log_id)
+            st.session_state[f'analysis_result_{pending_log_id}'] = analysis_result
+            st.session_state.selected_analysis_result = analysis_result
+            st.session_state.selected_analysis_stats = stats
+        
         analysis_text = st.session_state.get('selected_analysis_result', '')
+        render_analysis_timing(st.session_state.get('selected_analysis_stats'))
         
         if "원인 분석:" in analysis_text and "해결 방안:" in analysis_text:
             parts = analysis_text.split("해결 방안:")
@@ -1445,9 +1479,9 @@ def display_error_logs():
                 del st.session_state.log_current_page
             st.rerun()
     
-    all_logs = db_manager.get_recent_logs(limit=100)
+    all_logs = get_db_manager().get_recent_logs_frame(limit=100)
     
-    if not all_logs:
+    if all_logs.empty:
         st.info("📝 표시할 에러 로그가 없습니다.")
         return
     
@@ -1462,7 +1496,8 @@ def display_error_logs():
     current_log_page = st.session_state.log_current_page
     start_log_idx = (current_log_page - 1) * LOGS_PER_PAGE
     end_log_idx = min(start_log_idx + LOGS_PER_PAGE, total_logs)
-    current_logs = all_logs[start_log_idx:end_log_idx]
+    df = all_logs.iloc[start_log_idx:end_log_idx]
+    current_logs = df.to_dict('records')
     
     # 페이지 정보
     if total_log_pages > 1:
@@ -1473,12 +1508,13 @@ def display_error_logs():
         </div>
         """, unsafe_allow_html=True)
     
-    # 데이터프레임 생성 및 표시
-    df = pd.DataFrame(current_logs)
-    df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
-    
+    # 데이터프레임 표시 (timestamp는 조회 시 이미 datetime64로 변환됨)
     display_df = df[['id', 'timestamp', 'level', 'message', 'response_time']].copy()
+    display_df['timestamp'] = display_df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
     display_df.columns = ['ID', '발생시간', '레벨', '에러 메시지', '응답시간(ms)']
+    # 원격 에이전트 수집분이 있으면 호스트 컬럼 표시 (로컬 수집은 '로컬')
+    if 'host' in df and df['host'].notna().any():
+        display_df.insert(2, '호스트', df['host'].fillna('로컬').values)
     
     st.dataframe(
         display_df,
@@ -1488,6 +1524,7 @@ def display_error_logs():
         column_config={
             "ID": st.column_config.NumberColumn("ID", width="small"),
             "발생시간": st.column_config.TextColumn("발생시간", width="medium"),
+            "호스트": st.column_config.TextColumn("호스트", width="small"),
             "레벨": st.column_config.TextColumn("레벨", width="small"),
             "에러 메시지": st.column_config.TextColumn("에러 메시지", width="large"),
             "응답시간(ms)": st.column_config.NumberColumn("응답시간(ms)", width="small")
@@ -1587,15 +1624,13 @@ def display_error_logs():
                 """, unsafe_allow_html=True)
                 
                 if st.button("🚀 AI 분석 실행", key="analyze_main", type="primary", use_container_width=True):
-                    with st.spinner("🔍 AI가 로그를 분석 중입니다..."):
-                        # ai_analyzer를 통한 분석 (내부적으로 LangChain 사용)
-                        analysis_result = ai_analyzer.analyze_error_log(selected_log['id'])
-                        st.session_state.analysis_result = analysis_result
-                        st.session_state.show_analysis = True
-                        st.session_state.analyzed_log_id = selected_log['id']
-                        st.session_state.auto_scroll_to_main_analysis = True  # 메인 분석 스크롤 플래그
-                        st.success("✅ 분석 완료! 아래로 스크롤하여 결과를 확인하세요.")
-                        st.rerun()
+                    # 분석은 결과 모달에서 스트리밍으로 진행
+                    st.session_state.pending_analysis_log_id = selected_log['id']
+                    st.session_state.analysis_result = ''
+                    st.session_state.show_analysis = True
+                    st.session_state.analyzed_log_id = selected_log['id']
+                    st.session_state.auto_scroll_to_main_analysis = True  # 메인 분석 스크롤 플래그
+                    st.rerun()
                 
                 if (st.session_state.get('analyzed_log_id') == selected_log['id'] and 
                     st.session_state.get('analysis_result')):
@@ -1693,7 +1728,21 @@ def show_analysis_modal():
                 st.session_state.show_analysis = False
                 st.rerun()
         
+        # 유사한 과거 분석이 있으면 LLM 호출 전에 재사용 여부 선택
+        pending_log_id = st.session_state.get('pending_analysis_log_id')
+        if pending_log_id is not None and not st.session_state.pop('force_new_analysis', False):
+            if show_reuse_candidates(pending_log_id):
+                return
+        
+        # 대기 중인 분석이 있으면 토큰 단위로 표시하며 실행
+        pending_log_id = st.session_state.pop('pending_analysis_log_id', None)
+        if pending_log_id is not None:
+            analysis_result, stats = stream_analysis_result(pending_log_id)
+            st.session_state.analysis_result = analysis_result
+            st.session_state.analysis_stats = stats
+        
         analysis_text = st.session_state.analysis_result
+        render_analysis_timing(st.session_state.get('analysis_stats'))
         
         if "원인 분석:" in analysis_text and "해결 방안:" in analysis_text:
             parts = analysis_text.split("해결 방안:")
@@ -1798,7 +1847,7 @@ def sidebar_filters():
             'end_datetime': end_datetime
         }
         
-        if search_results:
+        if len(search_results) > 0:
             st.sidebar.success(f"✅ {len(search_results)}개 결과 발견!")
         else:
             st.sidebar.warning("⚠️ 검색 결과가 없습니다.")
@@ -1833,7 +1882,6 @@ def sidebar_filters():
     st.sidebar.markdown("### 📊 시스템 상태")
     
     # AI 설정 확인
-    from backend.config import validate_azure_config
     is_valid, message = validate_azure_config()
     
     if is_valid:
@@ -1841,32 +1889,100 @@ def sidebar_filters():
     else:
         st.sidebar.markdown('<span class="status-offline"></span>**Azure OpenAI 설정 필요**', unsafe_allow_html=True)
     
-    st.sidebar.markdown('<span class="status-online"></span>**로그 모니터링 활성**', unsafe_allow_html=True)
-    st.sidebar.markdown('<span class="status-online"></span>**샘플 로그 생성 중**', unsafe_allow_html=True)
+    # 수집 데몬 상태 (python main.py ingest가 갱신하는 health 파일, 대시보드는 읽기 전용)
+    ingest_health = read_health()
+    if ingest_health and ingest_health['alive']:
+        monitor_stats = ingest_health['monitor'] or {}
+        st.sidebar.markdown('<span class="status-online"></span>**로그 수집 데몬 동작 중**', unsafe_allow_html=True)
+        st.sidebar.caption(
+            f"PID {ingest_health['pid']} · {ingest_health['started_at']} 시작 · "
+            f"저장 {monitor_stats.get('inserted', 0):,}건 · 중복 무시 {monitor_stats.get('duplicates', 0):,}건"
+        )
+        if ingest_health['generator']:
+            st.sidebar.markdown('<span class="status-online"></span>**샘플 로그 생성 중**', unsafe_allow_html=True)
+        for alert in ingest_health.get('lag_alerts') or []:
+            st.sidebar.warning(f"수집 지연: {alert}")
+        alert_stats = ingest_health.get('alerts')
+        if alert_stats and alert_stats['active']:
+            st.sidebar.error("🚨 발생 중인 알림: " + ", ".join(
+                f"{active['rule']}({active['key'][:12]})" for active in alert_stats['active']))
+    else:
+        reason = "상태 파일 없음" if ingest_health is None else (
+            f"마지막 갱신 {ingest_health['age_seconds']:.0f}초 전" if ingest_health['status'] == 'running'
+            else "중지됨"
+        )
+        st.sidebar.markdown(f'<span class="status-offline"></span>**로그 수집 데몬 중지** ({reason})',
+                            unsafe_allow_html=True)
+        st.sidebar.caption("`python main.py ingest`로 수집 데몬을 실행하세요")
+    
+    # AI 분석 캐시 적중률
+    cache_stats = get_ai_analyzer().get_cache_stats()
+    total_lookups = cache_stats['hits'] + cache_stats['misses']
+    st.sidebar.markdown(
+        f"**분석 캐시:** 적중률 {cache_stats['hit_ratio'] * 100:.1f}% "
+        f"({cache_stats['hits']}/{total_lookups}) · 저장 {cache_stats['entries']}건"
+    )
+    
+    # 백그라운드 사전 분석 상태
+    worker_stats = ingest_health['analysis_worker'] if ingest_health and ingest_health['alive'] else None
+    if worker_stats and worker_stats['running']:
+        st.sidebar.markdown(
+            f"**사전 분석:** 대기 {worker_stats['queued']}건 · 완료 {worker_stats['completed']}건 · "
+            f"시간당 예산 {worker_stats['budget_used']}/{worker_stats['budget']}"
+        )
+    
+    # AI 분석 호출 계측 (지연/토큰/캐시 적중률)
+    llm_summary = get_ai_analyzer().get_llm_summary()
+    st.sidebar.markdown("### 🤖 AI 분석 (1시간)")
+    latency_col, token_col = st.sidebar.columns(2)
+    with latency_col:
+        p50, p95 = llm_summary['p50_latency_ms'], llm_summary['p95_latency_ms']
+        st.metric("지연 p50", f"{p50 / 1000:.1f}s" if p50 is not None else "-",
+                  delta=f"p95 {p95 / 1000:.1f}s" if p95 is not None else None, delta_color="off")
+    with token_col:
+        st.metric("토큰/시간", f"{llm_summary['tokens_per_hour']:,.0f}",
+                  delta=f"캐시 적중 {llm_summary['cache_hit_rate'] * 100:.0f}%", delta_color="off")
+    ttft_text = f"{llm_summary['p50_ttft_ms']:.0f}ms" if llm_summary['p50_ttft_ms'] is not None else "-"
+    st.sidebar.caption(
+        f"호출 {llm_summary['calls']}건 (LLM {llm_summary['llm_calls']}) · 첫 토큰 p50 {ttft_text} · "
+        f"재시도 {llm_summary['retries']} · 오류 {llm_summary['errors']}"
+    )
     
     # 통계 정보
     recent_1hour_count, delta_text, delta_color = get_recent_errors_by_time(minutes=60)
     st.sidebar.markdown("### 📈 통계 (1시간)")
     st.sidebar.metric("에러 수", recent_1hour_count, delta=delta_text, delta_color=delta_color)
     
+    # 수집 호스트별 에러 수 (원격 에이전트가 있을 때만)
+    now = datetime.now(KST)
+    host_stats = get_db_manager().get_host_stats(now - timedelta(hours=1), now)
+    if any(row['host'] for row in host_stats):
+        st.sidebar.dataframe(
+            pd.DataFrame([
+                {'호스트': row['host'] or '로컬', '에러 수': row['count'], '최근': (row['last_seen'] or '')[11:19]}
+                for row in host_stats
+            ]),
+            use_container_width=True, hide_index=True
+        )
+    
     # 현재 시간
     kst_now = datetime.now(KST)
     st.sidebar.markdown(f"**현재 시간:** {kst_now.strftime('%H:%M:%S')}")
 
 def main():
     """메인 애플리케이션"""
-    # 서비스 초기화
-    initialize_services()
-    
     # 앱 헤더
-    create_app_header()
+    with profiler.section("헤더"):
+        create_app_header()
     
     # 사이드바 필터
-    sidebar_filters()
+    with profiler.section("사이드바"):
+        sidebar_filters()
     
     # 검색 결과가 있으면 최상단에 표시
     if st.session_state.get('show_search_results', False):
-        show_search_results_popup()
+        with profiler.section("검색 결과"):
+            show_search_results_popup()
         st.markdown("---")
     
     # 메인 대시보드 시작
@@ -1875,7 +1991,7 @@ def main():
     # 메트릭 카드 섹션
     col1, col2, col3 = st.columns(3)
     
-    with col1:
+    with col1, profiler.section("메트릭: 에러 수"):
         # 최근 1시간 에러 수 (이전 1시간 대비)
         current_count, delta_text, delta_color = get_recent_errors_by_time(minutes=60)
         st.metric(
@@ -1886,21 +2002,21 @@ def main():
             help="최근 1시간 내 발생한 에러 수 (이전 1시간 대비)"
         )
     
-    with col2:
-        # 기존 평균 응답시간 로직 (최근 20개 기준 유지)
-        recent_logs = db_manager.get_recent_logs(limit=20)
-        if recent_logs:
-            avg_time = sum(log['response_time'] for log in recent_logs) / len(recent_logs)
-            delta_color = "inverse" if avg_time > 2000 else "normal"
+    with col2, profiler.section("메트릭: 응답시간"):
+        # 최근 1시간 응답시간 분위수 (분 단위 히스토그램 병합)
+        now = datetime.now(KST)
+        percentiles = get_db_manager().get_response_time_percentiles(now - timedelta(hours=1), now)
+        if percentiles['count'] > 0:
+            delta_color = "inverse" if percentiles['p95'] > 2000 else "normal"
             st.metric(
-                label="⏱️ 평균 응답시간",
-                value=f"{avg_time:.1f}ms",
-                delta=f"최근 20개 평균",
+                label="⏱️ 응답시간 p95 (1시간)",
+                value=f"{percentiles['p95']:.0f}ms",
+                delta=f"p50 {percentiles['p50']:.0f}ms · p99 {percentiles['p99']:.0f}ms",
                 delta_color=delta_color,
-                help="최근 20개 에러의 평균 응답시간"
+                help="최근 1시간 에러의 응답시간 분위수 (p50/p95/p99)"
             )
         else:
-            st.metric("⏱️ 평균 응답시간", "0ms", help="데이터 없음")
+            st.metric("⏱️ 응답시간 p95 (1시간)", "0ms", help="데이터 없음")
     
     with col3:
         kst_now = datetime.now(KST)
@@ -1913,26 +2029,42 @@ def main():
     
     st.markdown("---")
     
-    # 에러 통계 차트 (최근 1시간 기준, 10분 단위)
-    create_realtime_error_chart()
+    # 에러 통계 차트 (기간 선택, 집계 간격 자동)
+    with profiler.section("에러 통계 차트"):
+        create_realtime_error_chart()
+    
+    st.markdown("---")
+    
+    # 실시간 상위 에러 지문 (수집 데몬 스냅샷)
+    with profiler.section("상위 에러"):
+        display_heavy_hitters()
+    
+    st.markdown("---")
+    
+    # 연관 에러 묶음 (인시던트 단위 분석)
+    with profiler.section("인시던트"):
+        display_incidents()
     
     st.markdown("---")
     
     # 에러 로그 테이블 (전체 폭 사용)
-    display_error_logs()
+    with profiler.section("에러 로그 테이블"):
+        display_error_logs()
     
     # 팝업 모달들
-    show_analysis_modal()
-    show_analysis_popup()
+    with profiler.section("분석 모달"):
+        show_analysis_modal()
+        show_analysis_popup()
     
-    # 하단 고정 상태바
-    kst_now = datetime.now(KST)
-    st.markdown(f"""
-    <div class="status-bar">
-        <span class="status-online"></span>
-        모니터링 중 | {kst_now.strftime('%H:%M:%S')}
-    </div>
-    """, unsafe_allow_html=True)
+    # 하단 고정 상태바 (수집 지연 워터마크)
+    create_ingest_status_bar(read_health())
+    
+    # 렌더링 프로파일 결과 (켜져 있을 때만)
+    profiler.render_panel()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        # st.rerun()/st.stop()으로 중단되어도 프로파일 측정은 종료
+        profiler.finish()
\ No newline at end of file
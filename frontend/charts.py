@@ -0,0 +1,240 @@
+# 파일명: frontend/charts.py
+"""에러 현황 차트 데이터 조회 및 Plotly figure 생성 (Streamlit 비의존, 벤치마크에서도 사용)"""
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from backend.downsample import downsample
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+# 차트 조회 기간 (키: (라벨, 기간))
+TIME_RANGE_OPTIONS = {
+    '1h': ('1시간', timedelta(hours=1)),
+    '6h': ('6시간', timedelta(hours=6)),
+    '24h': ('24시간', timedelta(hours=24)),
+    '7d': ('7일', timedelta(days=7)),
+    '30d': ('30일', timedelta(days=30)),
+}
+
+# 자동 선택되는 막대 집계 간격 (초) 및 목표 막대 개수
+BUCKET_SIZE_CHOICES = [60, 300, 900, 1800, 3600, 3 * 3600, 6 * 3600, 12 * 3600, 24 * 3600]
+TARGET_BAR_COUNT = 48
+
+# 트레이스당 브라우저로 전송하는 최대 점 개수
+MAX_POINTS_PER_TRACE = 1000
+
+def choose_bucket_seconds(span: timedelta) -> int:
+    """조회 기간에 맞는 막대 집계 간격 자동 선택"""
+    for bucket_seconds in BUCKET_SIZE_CHOICES:
+        if span.total_seconds() / bucket_seconds <= TARGET_BAR_COUNT:
+            return bucket_seconds
+    return BUCKET_SIZE_CHOICES[-1]
+
+def format_bucket_label(bucket_seconds: int) -> str:
+    """집계 간격 표시용 문자열"""
+    if bucket_seconds >= 86400:
+        return f"{bucket_seconds // 86400}일"
+    if bucket_seconds >= 3600:
+        return f"{bucket_seconds // 3600}시간"
+    return f"{bucket_seconds // 60}분"
+
+def load_error_chart_data(db, range_key: str = '1h', now: datetime = None):
+    """선택 기간의 차트 데이터 (막대 집계, 응답시간 라인, 구간별 분위수, 집계 간격(초))"""
+    now = now or datetime.now(KST)
+    span = TIME_RANGE_OPTIONS[range_key][1]
+    start = now - span
+    bucket_seconds = choose_bucket_seconds(span)
+
+    # 에러 개수 막대: 자동 선택된 간격으로 재집계
+    bar_df = db.get_rollup_series(start, now, bucket_seconds=bucket_seconds)
+
+    # 응답시간 라인: 1분 집계에서 데이터가 있는 구간만 사용 후 다운샘플링
+    line_df = db.get_rollup_series(start, now, bucket_seconds=60)
+    line_df = line_df[line_df['error_count'] > 0].reset_index(drop=True)
+    if len(line_df) > MAX_POINTS_PER_TRACE:
+        indices = downsample(
+            line_df['time_bucket'].values.astype('int64'),
+            line_df['avg_response_time'].values,
+            MAX_POINTS_PER_TRACE
+        )
+        line_df = line_df.iloc[indices].reset_index(drop=True)
+
+    # 응답시간 분위수: 막대와 같은 간격으로 히스토그램 병합
+    percentile_df = db.get_percentile_series(start, now, bucket_seconds=bucket_seconds)
+
+    return bar_df, line_df, percentile_df, bucket_seconds
+
+def load_anomaly_markers(db, range_key: str, bucket_seconds: int, now: datetime = None) -> pd.DataFrame:
+    """지문별 이상 탐지 결과를 차트 집계 간격으로 묶음
+
+    반환 컬럼: time_bucket, signatures(이상 지문 수), max_z, fingerprint(z가 가장 큰 지문), label(대표 메시지)
+    """
+    now = now or datetime.now(KST)
+    anomalies = db.get_anomalies_frame(now - TIME_RANGE_OPTIONS[range_key][1], now)
+    columns = ['time_bucket', 'signatures', 'max_z', 'fingerprint', 'label']
+    if anomalies.empty:
+        return pd.DataFrame(columns=columns)
+
+    # z_score 내림차순이므로 구간별 첫 행이 대표 지문
+    anomalies['time_bucket'] = anomalies['time_bucket'].dt.floor(f'{bucket_seconds}s')
+    markers = anomalies.groupby('time_bucket', sort=True).agg(
+        signatures=('fingerprint', 'nunique'), max_z=('z_score', 'max'), fingerprint=('fingerprint', 'first'),
+    ).reset_index()
+    messages = {
+        log['fingerprint']: log['message'].split('\n', 1)[0][:80]
+        for log in db.get_latest_logs_by_fingerprints(markers['fingerprint'].unique().tolist())
+    }
+    markers['label'] = [messages.get(fingerprint, fingerprint[:12]) for fingerprint in markers['fingerprint']]
+    return markers[columns]
+
+def build_error_chart_figure(df: pd.DataFrame, line_df: pd.DataFrame, percentile_df: pd.DataFrame,
+                             bucket_seconds: int, range_key: str, now: datetime = None,
+                             anomaly_df: pd.DataFrame = None):
+    """에러 개수 막대 + 응답시간 라인/분위수 (+ 이상 구간 표시) Plotly figure"""
+    range_label, span = TIME_RANGE_OPTIONS[range_key]
+    bucket_label = format_bucket_label(bucket_seconds)
+
+    # 현재 시간 기준 조회 범위 설정
+    now = now or datetime.now(KST)
+    range_start = now - span
+
+    # 깔끔한 Plotly 차트 생성 (plotly는 차트를 그릴 때 로드)
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    # 응답시간 라인 차트 (1분 집계, 최대 MAX_POINTS_PER_TRACE개로 다운샘플링)
+    fig.add_trace(go.Scatter(
+        x=line_df['time_bucket'],
+        y=line_df['avg_response_time'],
+        mode='lines+markers' if len(line_df) <= 120 else 'lines',
+        name='평균 응답시간 (ms)',
+        line=dict(color='#007BFF', width=3 if len(line_df) <= 120 else 1.5),
+        marker=dict(size=8, color='#007BFF'),
+        hovertemplate='<b>%{y:.1f}ms</b><br>%{x|%m-%d %H:%M}<extra></extra>',
+        connectgaps=False
+    ))
+
+    # 응답시간 분위수 라인 (구간별 히스토그램 병합 결과)
+    percentile_styles = [
+        ('p50', 'p50 응답시간', '#17A2B8', 'dot'),
+        ('p95', 'p95 응답시간', '#FD7E14', 'dash'),
+        ('p99', 'p99 응답시간', '#6F42C1', 'dash'),
+    ]
+    for column, name, color, dash in percentile_styles:
+        fig.add_trace(go.Scatter(
+            x=percentile_df['time_bucket'] + pd.Timedelta(seconds=bucket_seconds / 2),
+            y=percentile_df[column],
+            mode='lines',
+            name=name,
+            line=dict(color=color, width=2, dash=dash),
+            hovertemplate=f'<b>{column} %{{y:.0f}}ms</b><extra></extra>',
+            connectgaps=False
+        ))
+
+    # 에러 개수 바 차트 (보조 y축)
+    fig.add_trace(go.Bar(
+        x=df['time_bucket'],
+        y=df['error_count'],
+        name='에러 개수',
+        yaxis='y2',
+        opacity=0.7,
+        marker_color='#DC3545',
+        hovertemplate='<b>%{y}개</b><br>%{x|%m-%d %H:%M}<extra></extra>',
+        width=bucket_seconds * 1000,  # 집계 간격을 밀리초로 변환
+        offset=0
+    ))
+
+    # 이상 구간 표시 (막대 위 삼각형, 보조 y축)
+    if anomaly_df is not None and not anomaly_df.empty:
+        bar_heights = df.set_index('time_bucket')['error_count']
+        fig.add_trace(go.Scatter(
+            x=anomaly_df['time_bucket'] + pd.Timedelta(seconds=bucket_seconds / 2),
+            y=anomaly_df['time_bucket'].map(bar_heights).fillna(0),
+            mode='markers',
+            name='이상 탐지',
+            yaxis='y2',
+            marker=dict(symbol='triangle-down', size=14, color='#FD7E14', line=dict(color='#333333', width=1)),
+            customdata=anomaly_df[['signatures', 'max_z', 'label']].values,
+            hovertemplate='<b>이상 %{customdata[0]}개 지문 (z %{customdata[1]:.1f})</b>'
+                          '<br>%{customdata[2]}<extra></extra>',
+            cliponaxis=False
+        ))
+
+    # 현재 시간 표시선을 shape으로 추가
+    fig.add_shape(
+        type="line",
+        x0=now,
+        x1=now,
+        y0=0,
+        y1=1,
+        yref="paper",
+        line=dict(
+            color="#28A745",
+            width=2,
+            dash="dash"
+        )
+    )
+
+    # 현재 시간 주석 추가
+    fig.add_annotation(
+        x=now,
+        y=1,
+        yref="paper",
+        text="현재 시간",
+        showarrow=True,
+        arrowhead=2,
+        arrowsize=1,
+        arrowwidth=1,
+        arrowcolor="#28A745",
+        bgcolor="#28A745",
+        bordercolor="#28A745",
+        borderwidth=1,
+        font=dict(color="white", size=10)
+    )
+
+    # 깔끔한 레이아웃 설정
+    fig.update_layout(
+        title=dict(
+            text=f'📈 에러 모니터링 (최근 {range_label}) - {bucket_label} 단위',
+            font=dict(size=20, color='#333333', family='Arial'),
+            x=0.5
+        ),
+        xaxis=dict(
+            title=f'시간 ({bucket_label} 단위)',
+            color='#333333',
+            gridcolor='#E9ECEF',
+            range=[range_start, now],  # datetime 객체 사용 (range에서는 지원됨)
+            tickformat='%H:%M' if span <= timedelta(hours=24) else '%m-%d %H:%M'
+        ),
+        yaxis=dict(
+            title='응답시간 (ms)',
+            side='left',
+            color='#007BFF',
+            gridcolor='#E9ECEF'
+        ),
+        yaxis2=dict(
+            title='에러 개수',
+            side='right',
+            overlaying='y',
+            color='#DC3545'
+        ),
+        plot_bgcolor='#FFFFFF',
+        paper_bgcolor='#FFFFFF',
+        font=dict(color='#333333', family='Arial'),
+        hovermode='x unified',
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        height=450,
+        margin=dict(t=80, b=50, l=50, r=50)
+    )
+
+    return fig
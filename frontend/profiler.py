@@ -0,0 +1,266 @@
+# 파일명: frontend/profiler.py
+"""대시보드 렌더링 프로파일러 (선택 기능)
+
+RENDER_PROFILE=true 또는 URL에 ?profile=1을 붙이면 한 번의 rerun을 구간별로 측정합니다.
+구간마다 소요 시간, 호출한 백엔드 메서드(DB/AI 분석기), 조회한 행 수, 브라우저로 보낸
+메시지 바이트를 기록해 expander에 폭포(waterfall) 차트로 보여주고, 느린 렌더링은
+JSON 줄 로그와 cProfile 덤프(.prof)로 저장합니다.
+"""
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import streamlit as st
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+# 백엔드 호출 기록 대상 제외 메서드 (쓰기/초기화)
+_SKIP_METHODS = {'init_database', 'insert_log', 'insert_logs'}
+
+# 현재 스레드(Streamlit 세션 스크립트 스레드)의 활성 프로파일러
+_active = threading.local()
+_instrumented = set()
+_instrument_lock = threading.Lock()
+
+
+def _result_rows(result) -> Optional[int]:
+    """반환값의 행 수 (리스트/DataFrame/컬럼 배열 dict)"""
+    if isinstance(result, dict):
+        if result and all(hasattr(value, '__len__') and not isinstance(value, str) for value in result.values()):
+            return len(next(iter(result.values())))
+        return None
+    if hasattr(result, '__len__') and not isinstance(result, (str, bytes)):
+        return len(result)
+    return None
+
+
+def _wrap_method(owner: str, name: str, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        profiler = getattr(_active, 'profiler', None)
+        # 프로파일 중이 아니거나 백엔드 내부의 중첩 호출이면 그대로 실행
+        if profiler is None or getattr(_active, 'depth', 0) > 0:
+            return method(*args, **kwargs)
+        _active.depth = 1
+        started = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            _active.depth = 0
+        profiler.record_call(f"{owner}.{name}", time.perf_counter() - started, _result_rows(result))
+        return result
+    return wrapper
+
+
+def instrument(instance, owner: str = None):
+    """백엔드 객체의 공개 메서드를 호출 기록 래퍼로 교체 (인스턴스당 한 번, 비활성 시 오버헤드 없음)"""
+    with _instrument_lock:
+        if id(instance) in _instrumented:
+            return instance
+        owner = owner or type(instance).__name__
+        for name in dir(type(instance)):
+            if name.startswith('_') or name in _SKIP_METHODS:
+                continue
+            attribute = getattr(type(instance), name, None)
+            if callable(attribute) and not isinstance(attribute, (staticmethod, classmethod, type)):
+                setattr(instance, name, _wrap_method(owner, name, getattr(instance, name)))
+        _instrumented.add(id(instance))
+    return instance
+
+
+class RenderProfiler:
+    """한 번의 rerun 측정 (구간, 백엔드 호출, 전송 바이트, 선택적 cProfile)"""
+
+    def __init__(self, slow_ms: float, output_dir: str, use_cprofile: bool = True):
+        self.slow_ms = slow_ms
+        self.output_dir = output_dir
+        self.started = time.perf_counter()
+        self.sections: List[Dict] = []
+        self.calls: List[Dict] = []
+        self.bytes_sent = 0
+        self._stack: List[Dict] = []
+        self._last_mark = self.started
+        self._ctx = None
+        self._original_enqueue = None
+        self.total_ms = None
+        self.dump_path = None
+
+        self.cprofile = cProfile.Profile() if use_cprofile else None
+        if self.cprofile is not None:
+            try:
+                self.cprofile.enable()
+            except ValueError:
+                # 다른 세션이 이미 프로파일 중이면 cProfile 없이 측정
+                self.cprofile = None
+
+        _active.profiler = self
+        _active.depth = 0
+        self._hook_enqueue()
+
+    def _hook_enqueue(self):
+        """스크립트 컨텍스트의 메시지 전송을 감싸 브라우저로 보내는 바이트 집계"""
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        if ctx is None or not hasattr(ctx, '_enqueue'):
+            return
+        original = ctx._enqueue
+
+        def enqueue(msg):
+            size = msg.ByteSize()
+            self.bytes_sent += size
+            if self._stack:
+                self._stack[-1]['bytes'] += size
+            return original(msg)
+
+        self._ctx, self._original_enqueue = ctx, original
+        ctx._enqueue = enqueue
+
+    def _open(self, name: str, started: float) -> Dict:
+        section = {
+            'name': name, 'depth': len(self._stack), 'start_ms': (started - self.started) * 1000,
+            'duration_ms': 0.0, 'calls': 0, 'call_ms': 0.0, 'rows': 0, 'bytes': 0,
+        }
+        self.sections.append(section)
+        self._stack.append(section)
+        return section
+
+    def _close(self, section: Dict, ended: float):
+        section['duration_ms'] = (ended - self.started) * 1000 - section['start_ms']
+        self._stack.remove(section)
+        if self._stack:
+            parent = self._stack[-1]
+            parent['bytes'] += section['bytes']
+            parent['calls'] += section['calls']
+            parent['call_ms'] += section['call_ms']
+            parent['rows'] += section['rows']
+        self._last_mark = ended
+
+    @contextmanager
+    def section(self, name: str):
+        """with 블록을 하나의 구간으로 측정 (중첩 가능)"""
+        section = self._open(name, time.perf_counter())
+        try:
+            yield section
+        finally:
+            self._close(section, time.perf_counter())
+
+    def mark(self, name: str):
+        """직전 구간이 끝난 시점부터 지금까지를 하나의 구간으로 기록 (with로 감싸기 어려운 코드용)"""
+        section = self._open(name, self._last_mark)
+        self._close(section, time.perf_counter())
+
+    def record_call(self, name: str, seconds: float, rows: Optional[int]):
+        call = {'name': name, 'ms': seconds * 1000, 'rows': rows,
+                'section': self._stack[-1]['name'] if self._stack else None}
+        self.calls.append(call)
+        if self._stack:
+            section = self._stack[-1]
+            section['calls'] += 1
+            section['call_ms'] += call['ms']
+            section['rows'] += rows or 0
+
+    def finish(self):
+        """측정 종료 (느린 렌더링이면 로그/cProfile 덤프 저장)"""
+        if self.total_ms is not None:
+            return
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        if self._ctx is not None:
+            self._ctx._enqueue = self._original_enqueue
+        _active.profiler = None
+        if self.total_ms >= self.slow_ms:
+            self._write_slow_render()
+
+    def _write_slow_render(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now(KST).strftime('%Y%m%d-%H%M%S-%f')[:-3]
+        if self.cprofile is not None:
+            self.dump_path = os.path.join(self.output_dir, f"render-{stamp}.prof")
+            self.cprofile.dump_stats(self.dump_path)
+        record = {
+            'at': datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S'),
+            'total_ms': round(self.total_ms, 1),
+            'bytes_sent': self.bytes_sent,
+            'profile': self.dump_path,
+            'sections': [{key: round(value, 1) if isinstance(value, float) else value
+                          for key, value in section.items()} for section in self.sections],
+            'calls': [{**call, 'ms': round(call['ms'], 1)} for call in self.calls],
+        }
+        with open(os.path.join(self.output_dir, 'slow_renders.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def render_panel(self):
+        """폭포 차트 + 구간/호출 표 (측정 종료 후 호출)"""
+        import pandas as pd
+        import plotly.graph_objects as go
+
+        self.finish()
+        slow = self.total_ms >= self.slow_ms
+        with st.expander(f"⏱️ 렌더링 프로파일: {self.total_ms:.0f}ms · {self.bytes_sent / 1024:.0f}KB 전송"
+                         f"{' (느림)' if slow else ''}", expanded=slow):
+            sections = self.sections[::-1]
+            labels = [('  ' * section['depth']) + section['name'] for section in sections]
+            fig = go.Figure(go.Bar(
+                y=labels,
+                x=[section['duration_ms'] for section in sections],
+                base=[section['start_ms'] for section in sections],
+                orientation='h',
+                marker_color=['#dc3545' if section['duration_ms'] >= self.slow_ms / 4 else '#1f77b4'
+                              for section in sections],
+                text=[f"{section['duration_ms']:.0f}ms" for section in sections],
+                textposition='outside',
+                hovertemplate='%{y}: %{base:.0f} → +%{x:.0f}ms<extra></extra>',
+            ))
+            fig.update_layout(height=max(200, 28 * len(sections) + 60), margin=dict(l=10, r=10, t=10, b=30),
+                              xaxis_title='ms (렌더 시작 기준)', showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+
+            st.dataframe(pd.DataFrame([{
+                '구간': ('· ' * section['depth']) + section['name'],
+                '시간(ms)': round(section['duration_ms'], 1),
+                '백엔드 호출': section['calls'],
+                '호출 시간(ms)': round(section['call_ms'], 1),
+                '행 수': section['rows'],
+                '전송(KB)': round(section['bytes'] / 1024, 1),
+            } for section in self.sections]), use_container_width=True, hide_index=True)
+
+            if self.calls:
+                st.dataframe(pd.DataFrame([{
+                    '구간': call['section'], '호출': call['name'], '시간(ms)': round(call['ms'], 1),
+                    '행 수': call['rows'],
+                } for call in self.calls]), use_container_width=True, hide_index=True)
+            if self.dump_path:
+                st.caption(f"cProfile 덤프: `{self.dump_path}` (python -m pstats {self.dump_path})")
+
+
+class NullProfiler:
+    """프로파일링을 켜지 않았을 때 사용하는 빈 구현"""
+
+    @contextmanager
+    def section(self, name: str):
+        yield None
+
+    def mark(self, name: str):
+        pass
+
+    def finish(self):
+        pass
+
+    def render_panel(self):
+        pass
+
+
+def start_render_profiler(enabled: bool, slow_ms: float, output_dir: str):
+    """이번 rerun의 프로파일러 (enabled 또는 ?profile=1이면 RenderProfiler, 아니면 NullProfiler)"""
+    if not enabled and st.query_params.get('profile') not in ('1', 'true'):
+        return NullProfiler()
+    return RenderProfiler(slow_ms, output_dir)
@@ -1,5 +1,241 @@
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+
+def run_analyze_top(args):
+    """오늘 발생한 상위 에러 지문 일괄 AI 분석 (야간 배치용)"""
+    from backend.ai_analyzer import ai_analyzer
+
+    start = datetime.now(KST).replace(hour=0, minute=0, second=0, microsecond=0)
+    if args.days > 1:
+        start -= timedelta(days=args.days - 1)
+
+    started_at = time.perf_counter()
+
+    def on_result(result):
+        status = "캐시" if result['cached'] else ("실패" if result['error'] else "완료")
+        retries = f" (재시도 {result['retries']}회)" if result['retries'] else ""
+        print(f"[{status}] {result['fingerprint']} - 로그 ID {result['log_id']}{retries}")
+
+    results = ai_analyzer.analyze_top_signatures(
+        start, limit=args.limit, max_concurrency=args.concurrency, on_result=on_result
+    )
+
+    elapsed = time.perf_counter() - started_at
+    cached = sum(1 for r in results.values() if r['cached'])
+    failed = sum(1 for r in results.values() if r['error'])
+    print(f"총 {len(results)}개 지문 분석: 신규 {len(results) - cached - failed}, "
+          f"캐시 {cached}, 실패 {failed} ({elapsed:.1f}초)")
+
+
+def run_analyze_incidents(args):
+    """최근 구간의 인시던트(연관 에러 묶음)별 AI 분석"""
+    from backend.ai_analyzer import ai_analyzer
+
+    end = datetime.now(KST)
+    incidents = ai_analyzer.find_incidents(end - timedelta(minutes=args.minutes), end)
+    print(f"최근 {args.minutes}분 인시던트 {len(incidents)}개")
+    if incidents and incidents[0]['truncated']:
+        print(f"(로그가 많아 {incidents[0]['sampled_since']} 이전 로그는 제외하고 집계)")
+
+    for incident in incidents[:args.limit]:
+        print(f"\n=== [{incident['level']}] {incident['incident_id']} - 시그니처 {len(incident['signatures'])}개, "
+              f"{incident['total_count']}건 ({incident['first_seen']} ~ {incident['last_seen']}) ===")
+        for signature in incident['signatures']:
+            first_line = signature['message'].splitlines()[0] if signature['message'] else ''
+            print(f"  - [{signature['level']}] {signature['count']}건: {first_line[:100]}")
+        result = ai_analyzer.analyze_incident(incident)
+        print(("(캐시) " if result['cached'] else "") + result['analysis'])
+
+
+def run_ingest(args):
+    """독립 수집 데몬 실행 (collector 명령이면 원격 에이전트 수신 포함, SIGTERM/SIGINT 시 남은 배치 저장 후 종료)"""
+    from backend.config import (
+        ALERT_ENABLED, ANALYSIS_WORKER_ENABLED, ANOMALY_ENABLED, HEAVY_HITTERS_ENABLED, validate_azure_config,
+    )
+    from backend.ingest_daemon import IngestDaemon
+
+    collector_port = getattr(args, 'port', None)
+    use_worker = ANALYSIS_WORKER_ENABLED and not args.no_analysis_worker and validate_azure_config()[0]
+    daemon = IngestDaemon(log_file=args.log_file, health_file=args.health_file,
+                          generate=args.generate, analysis_worker=use_worker,
+                          alerts=ALERT_ENABLED and not args.no_alerts,
+                          anomalies=ANOMALY_ENABLED and not args.no_anomaly_detection,
+                          heavy_hitters=HEAVY_HITTERS_ENABLED and not args.no_heavy_hitters,
+                          collector_port=collector_port)
+    if collector_port is not None and args.bind:
+        daemon.collector_host = args.bind
+    if args.metrics_port is not None:
+        daemon.metrics_port = args.metrics_port
+    if args.health_interval:
+        daemon.health_interval = args.health_interval
+    try:
+        daemon.run()
+    except RuntimeError as e:
+        print(e)
+        raise SystemExit(1)
+    print(f"수집 데몬 종료: {daemon.monitor.stats}")
+    if daemon.collector:
+        print(f"원격 수신: {daemon.collector.summary()}")
+
+
+def run_agent(args):
+    """원격 호스트 에이전트 실행 (로컬 로그 tail → 수집기로 압축 프레임 전송, 실패 시 디스크 스풀)"""
+    from backend.config import AGENT_HOST_NAME, AGENT_SPOOL_DIR, COLLECTOR_URL
+    from backend.shipping import LogAgent
+
+    agent = LogAgent(log_file=args.log_file, collector_url=args.collector_url or COLLECTOR_URL,
+                     host=args.host or AGENT_HOST_NAME, spool_dir=args.spool_dir or AGENT_SPOOL_DIR,
+                     metrics_port=args.metrics_port)
+    if args.health_interval:
+        agent.health_interval = args.health_interval
+    try:
+        agent.run()
+    except RuntimeError as e:
+        print(e)
+        raise SystemExit(1)
+    print(f"에이전트 종료: {agent.stats()}")
+
+
+def run_load(args):
+    """수집 파이프라인 부하 테스트 (목표 eps로 로그 파일 기록 후 달성 속도/수집 지연 보고)"""
+    import json
+    from backend.config import DB_PATH, LOG_FILE
+    from backend.load_generator import LoadProfile, format_report, parse_level_mix, run_load_test
+
+    profile = LoadProfile(
+        eps=args.eps, duration=args.duration, writers=args.writers, level_mix=parse_level_mix(args.level_mix),
+        stack_depth_mean=args.stack_depth_mean, stack_depth_max=args.stack_depth_max,
+        stack_depth=args.stack_depth, burst_factor=args.burst_factor, burst_every=args.burst_every,
+        burst_length=args.burst_length, seed=args.seed,
+    )
+    log_file = args.log_file or LOG_FILE
+    monitor = None
+    if not args.no_monitor:
+        from backend.log_monitor import get_log_monitor
+        monitor = get_log_monitor()
+        monitor.log_file = log_file
+
+    result = run_load_test(profile, log_file, DB_PATH, monitor=monitor, drain_timeout=args.drain_timeout)
+    print(format_report(result))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+def parse_speed(value: str):
+    """재생 배속 ('1', '10x', 'max')"""
+    value = value.lower()
+    return None if value == 'max' else float(value.rstrip('x'))
+
+
+def run_replay(args):
+    """기존 로그 파일을 원래 간격(배속 적용)으로 모니터링 대상 파일에 재생"""
+    from backend.log_generator import get_log_generator
+
+    generator = get_log_generator()
+    speed = parse_speed(args.speed)
+    print(f"재생: {args.source} → {args.target or generator.log_file} ({args.speed})")
+    try:
+        stats = generator.replay(args.source, args.target, speed=speed, max_gap=args.max_gap, loop=args.loop)
+    except KeyboardInterrupt:
+        generator.replaying = False
+        stats = generator.replay_stats
+    print(f"이벤트 {stats['events']}건, {stats['bytes']} bytes, {stats.get('elapsed_s')}초 "
+          f"({stats.get('events_per_sec')} events/s, 최대 지연 {stats['max_delay_ms']:.0f}ms)")
+
+
 def main():
-    print("Hello from logiq-v2!")
+    parser = argparse.ArgumentParser(description="Tomcat WAS 로그 모니터 CLI")
+    subparsers = parser.add_subparsers(dest="command")
+
+    analyze_top = subparsers.add_parser("analyze-top", help="상위 에러 지문 일괄 AI 분석")
+    analyze_top.add_argument("--limit", type=int, default=50, help="분석할 지문 개수")
+    analyze_top.add_argument("--days", type=int, default=1, help="집계 기간 (오늘 포함 일 수)")
+    analyze_top.add_argument("--concurrency", type=int, default=None, help="동시 LLM 호출 수")
+
+    analyze_incidents = subparsers.add_parser("analyze-incidents", help="최근 인시던트 단위 AI 분석")
+    analyze_incidents.add_argument("--minutes", type=int, default=60, help="분석 구간 (분)")
+    analyze_incidents.add_argument("--limit", type=int, default=5, help="분석할 인시던트 개수")
+
+    ingest = subparsers.add_parser("ingest", help="로그 수집 데몬 실행 (Streamlit과 별도 프로세스)")
+    collector = subparsers.add_parser("collector", help="중앙 수집기 실행 (수집 데몬 + 원격 에이전트 프레임 수신)")
+    for command in (ingest, collector):
+        command.add_argument("--log-file", default=None, help="수집할 로컬 로그 파일 (기본: LOG_FILE)")
+        command.add_argument("--health-file", default=None, help="상태 파일 경로 (기본: INGEST_HEALTH_FILE)")
+        command.add_argument("--health-interval", type=float, default=None, help="상태 파일 갱신 주기 (초)")
+        command.add_argument("--generate", action="store_true", help="샘플 에러 로그도 함께 생성 (데모용)")
+        command.add_argument("--no-analysis-worker", action="store_true", help="백그라운드 사전 분석 워커 끄기")
+        command.add_argument("--no-alerts", action="store_true", help="수집 시점 알림 엔진 끄기")
+        command.add_argument("--no-anomaly-detection", action="store_true", help="지문별 이상 탐지 작업 끄기")
+        command.add_argument("--no-heavy-hitters", action="store_true", help="실시간 상위 에러 지문 추적 끄기")
+        command.add_argument("--metrics-port", type=int, default=None,
+                             help="/metrics 포트 (0이면 끔, 기본: METRICS_PORT)")
+    collector.add_argument("--bind", default=None, help="수신 주소 (기본: COLLECTOR_HOST)")
+    collector.add_argument("--port", type=int, default=None, help="수신 포트 (기본: COLLECTOR_PORT, 0이면 임의 포트)")
+
+    agent = subparsers.add_parser("agent", help="원격 호스트 에이전트 실행 (로컬 로그 → 수집기 전송)")
+    agent.add_argument("--collector-url", default=None, help="수집기 주소 (기본: COLLECTOR_URL)")
+    agent.add_argument("--log-file", default=None, help="수집할 로그 파일 (기본: LOG_FILE)")
+    agent.add_argument("--host", default=None, help="호스트 이름 (기본: AGENT_HOST_NAME 또는 hostname)")
+    agent.add_argument("--spool-dir", default=None, help="전송 대기 프레임 스풀 디렉토리 (기본: AGENT_SPOOL_DIR)")
+    agent.add_argument("--health-interval", type=float, default=None, help="상태 로그 주기 (초)")
+    agent.add_argument("--metrics-port", type=int, default=0, help="/metrics 포트 (기본 0: 끔)")
+
+    load = subparsers.add_parser("load", help="수집 파이프라인 부하 테스트")
+    load.add_argument("--eps", type=float, default=100, help="목표 초당 이벤트 수 (전체)")
+    load.add_argument("--duration", type=float, default=30, help="부하 시간 (초)")
+    load.add_argument("--writers", type=int, default=1, help="동시 writer 프로세스 수")
+    load.add_argument("--level-mix", default="ERROR=0.6,FATAL=0.05,Exception=0.25,INFO=0.1",
+                      help="레벨 비율 (예: ERROR=0.6,FATAL=0.05,INFO=0.35)")
+    load.add_argument("--stack-depth", choices=["fixed", "uniform", "exponential"], default="exponential",
+                      help="스택 트레이스 깊이 분포")
+    load.add_argument("--stack-depth-mean", type=float, default=6)
+    load.add_argument("--stack-depth-max", type=int, default=40)
+    load.add_argument("--burst-factor", type=float, default=1.0, help="버스트 구간 속도 배수")
+    load.add_argument("--burst-every", type=float, default=0, help="버스트 주기 (초, 0이면 없음)")
+    load.add_argument("--burst-length", type=float, default=0, help="버스트 지속 시간 (초)")
+    load.add_argument("--log-file", default=None, help="기록할 로그 파일 (기본: LOG_FILE)")
+    load.add_argument("--no-monitor", action="store_true", help="내장 LogMonitor 없이 외부 수집기를 측정")
+    load.add_argument("--drain-timeout", type=float, default=30, help="기록 종료 후 수집 대기 최대 시간 (초)")
+    load.add_argument("--seed", type=int, default=None)
+    load.add_argument("--json", help="결과 JSON 저장 경로")
+
+    replay = subparsers.add_parser("replay", help="기존 로그 파일을 원래 간격으로 재생")
+    replay.add_argument("source", help="재생할 로그 파일")
+    replay.add_argument("--target", default=None, help="기록할 파일 (기본: LOG_FILE)")
+    replay.add_argument("--speed", default="1", help="배속 (1, 10x, max)")
+    replay.add_argument("--max-gap", type=float, default=None, help="원본 공백 구간 최대 길이 (초)")
+    replay.add_argument("--loop", action="store_true", help="끝까지 재생한 뒤 처음부터 반복")
+
+    args = parser.parse_args()
+
+    if args.command == "analyze-top":
+        if args.concurrency is None:
+            from backend.config import LLM_MAX_CONCURRENCY
+            args.concurrency = LLM_MAX_CONCURRENCY
+        run_analyze_top(args)
+    elif args.command == "analyze-incidents":
+        run_analyze_incidents(args)
+    elif args.command == "ingest":
+        run_ingest(args)
+    elif args.command == "collector":
+        if args.port is None:
+            from backend.config import COLLECTOR_PORT
+            args.port = COLLECTOR_PORT
+        run_ingest(args)
+    elif args.command == "agent":
+        run_agent(args)
+    elif args.command == "load":
+        run_load(args)
+    elif args.command == "replay":
+        run_replay(args)
+    else:
+        parser.print_help()
 
 
 if __name__ == "__main__":
@@ -1,2 +1,8 @@
 pip install -r requirements.txt
+
+# 로그 수집 데몬 (Streamlit과 별도 프로세스, 종료 시 함께 정리)
+python main.py ingest --generate &
+INGEST_PID=$!
+trap 'kill -TERM $INGEST_PID 2>/dev/null; wait $INGEST_PID' EXIT
+
 python -m streamlit run frontend/app.py --server.port 8000 --server.address 0.0.0.0
\ No newline at end of file